@@ -1,4 +1,7 @@
 from myAws.sqs import SQS
-from myAws.secrets_manager import SecretsManager
+from myAws.secrets_manager import SecretsManager, SecretCache, secret_cache
 from myAws.dynamodb import DynamoDB
-from myAws.s3 import S3
\ No newline at end of file
+from myAws.item_cache import ItemCache, item_cache
+from myAws.dynamodb_async import AsyncDynamoDB, async_dynamodb
+from myAws.s3 import S3, S3ObjectCache, s3_cache
+from myAws.bootstrap import SecretStore, LazySecret, LazyValue, secret_store
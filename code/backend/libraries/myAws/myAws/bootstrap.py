@@ -0,0 +1,151 @@
+from myExceptions import boot as bootExceptions
+from .secrets_manager import SecretCache, secret_cache
+from typing import Any, Callable, Iterable, Optional
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class SecretStore:
+    """
+    Process-wide cache of the secrets the configuration depends on.
+
+    Config classes declare their secrets with LazySecret, which registers
+    them here. The service lifespan then fetches all of them concurrently
+    with resolve_all() before serving requests; a secret read before that
+    (e.g. by a script) is fetched on first access instead. Tests and
+    benchmarks call inject() so that nothing touches AWS.
+
+    Fetches go through a SecretCache, which reuses one Secrets Manager
+    client instead of building a session per secret.
+    """
+
+    def __init__(self, cache: SecretCache = secret_cache):
+        """
+        Args:
+            cache (SecretCache): Fetches the secrets (default: the process-wide secret_cache)
+        """
+        self.cache = cache
+        self._registered: set[str] = set()
+        self._values: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, secret_name: str) -> None:
+        self._registered.add(secret_name)
+
+    def inject(self, values: dict[str, Any]) -> None:
+        """
+        Set secret values directly, without fetching them.
+
+        Args:
+            values (dict): Secret name -> value
+        """
+        with self._lock:
+            self._values.update(values)
+
+    def clear(self) -> None:
+        """
+        Forget every resolved or injected value (registrations are kept).
+        """
+        with self._lock:
+            self._values.clear()
+
+    def get(self, secret_name: str) -> Any:
+        """
+        Return a secret, fetching it now if it was neither resolved nor injected.
+
+        Raises:
+            SecretsManagerServiceError: If the secret cannot be fetched
+        """
+        try:
+            return self._values[secret_name]
+        except KeyError:
+            pass
+        logger.warning(f"Secret {secret_name} fetched on first access, resolve it at startup instead")
+        value = self.cache.get(secret_name)
+        with self._lock:
+            return self._values.setdefault(secret_name, value)
+
+    async def resolve_all(self, secret_names: Optional[Iterable[str]] = None, max_concurrency: int = 8) -> None:
+        """
+        Fetch every registered secret not resolved yet, concurrently.
+
+        Args:
+            secret_names (Iterable[str] | None): The secrets to fetch (default: all registered)
+            max_concurrency (int): Maximum number of requests in flight
+
+        Raises:
+            SecretsManagerServiceError: If any secret cannot be fetched
+        """
+        pending = sorted(set(secret_names or self._registered) - self._values.keys())
+        if not pending:
+            return
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(secret_name: str) -> None:
+            async with semaphore:
+                value = await asyncio.to_thread(self.cache.get, secret_name)
+            with self._lock:
+                self._values.setdefault(secret_name, value)
+
+        await asyncio.gather(*(fetch(secret_name) for secret_name in pending))
+        logger.info(f"Resolved {len(pending)} secrets")
+
+
+secret_store = SecretStore()
+
+
+class LazySecret:
+    """
+    Class attribute resolved from the secret store on access.
+
+        class Config:
+            JWT_SECRET_KEY = LazySecret("JWT_SECRET_KEY")
+
+    Assigning the attribute on the class (Config.JWT_SECRET_KEY = "...")
+    replaces the descriptor, as with any class attribute.
+    """
+
+    def __init__(self, secret_name: Optional[str], parse: Optional[Callable[[Any], Any]] = None, store: SecretStore = secret_store):
+        """
+        Args:
+            secret_name (str | None): The name or ARN of the secret
+            parse (callable | None): Converts the raw secret, e.g. json.loads
+            store (SecretStore): The store the secret is registered in and read from
+        """
+        self.secret_name = secret_name
+        self.parse = parse
+        self.store = store
+        self._raw = self._parsed = None
+        if secret_name:
+            store.register(secret_name)
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.attribute = f"{owner.__name__}.{name}"
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if not self.secret_name:
+            raise bootExceptions.ConfigurationError(f"No secret name configured for {self.attribute}")
+        raw = self.store.get(self.secret_name)
+        if self.parse is None:
+            return raw
+        if raw is not self._raw:
+            self._raw, self._parsed = raw, self.parse(raw)
+        return self._parsed
+
+
+class LazyValue:
+    """
+    Class attribute computed from other configuration on each access,
+    e.g. a URL built from lazily resolved credentials.
+
+        DATABASE_URL = LazyValue(lambda config: f"mysql://{config.DATABASE_USER}@...")
+    """
+
+    def __init__(self, compute: Callable[[type], Any]):
+        self.compute = compute
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        return self.compute(owner)
@@ -1,7 +1,47 @@
 import os
+import tempfile
 from myExceptions import boot as bootExceptions
 
 
 class Config:
     AWS_REGION = os.getenv('AWS_REGION')
     if not AWS_REGION: raise bootExceptions.ConfigurationError('Error in aws package: AWS_REGION not set')
+
+    # Request-time secret lookups (SecretCache)
+    SECRET_CACHE_TTL_SECONDS = float(os.getenv('SECRET_CACHE_TTL_SECONDS', 300))
+    SECRET_CACHE_REFRESH_AHEAD_SECONDS = float(os.getenv('SECRET_CACHE_REFRESH_AHEAD_SECONDS', 60))
+    SECRET_CACHE_MAX_STALE_SECONDS = float(os.getenv('SECRET_CACHE_MAX_STALE_SECONDS', 3600))
+    # While fetches fail, the stale value is served without retrying for a
+    # backoff that starts here and doubles per failure up to the max
+    SECRET_CACHE_RETRY_BASE_SECONDS = float(os.getenv('SECRET_CACHE_RETRY_BASE_SECONDS', 1))
+    SECRET_CACHE_RETRY_MAX_SECONDS = float(os.getenv('SECRET_CACHE_RETRY_MAX_SECONDS', 60))
+
+    # DynamoDB endpoint override, e.g. http://localhost:8000 for DynamoDB Local
+    DYNAMODB_ENDPOINT_URL = os.getenv('DYNAMODB_ENDPOINT_URL')
+
+    # DynamoDB read-through item cache: "table=seconds,..." lists the tables
+    # whose items are cached and for how long; other tables are not cached
+    DYNAMODB_ITEM_CACHE_TTLS = {
+        table.strip(): float(seconds)
+        for table, _, seconds in (entry.partition('=') for entry in os.getenv('DYNAMODB_ITEM_CACHE_TTLS', '').split(','))
+        if table.strip() and seconds
+    }
+    DYNAMODB_ITEM_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv('DYNAMODB_ITEM_CACHE_NEGATIVE_TTL_SECONDS', 30))
+    DYNAMODB_ITEM_CACHE_MAX_ENTRIES = int(os.getenv('DYNAMODB_ITEM_CACHE_MAX_ENTRIES', 10000))
+
+    # DynamoDB batch operations: chunks sent in parallel, attempts per chunk
+    # while DynamoDB returns unprocessed keys/items, and their backoff
+    DYNAMODB_BATCH_MAX_WORKERS = int(os.getenv('DYNAMODB_BATCH_MAX_WORKERS', 8))
+    DYNAMODB_BATCH_MAX_ATTEMPTS = int(os.getenv('DYNAMODB_BATCH_MAX_ATTEMPTS', 8))
+    DYNAMODB_BATCH_BACKOFF_BASE_SECONDS = float(os.getenv('DYNAMODB_BATCH_BACKOFF_BASE_SECONDS', 0.05))
+    DYNAMODB_BATCH_BACKOFF_MAX_SECONDS = float(os.getenv('DYNAMODB_BATCH_BACKOFF_MAX_SECONDS', 2))
+
+    # AsyncDynamoDB: requests in flight (pool threads) and calls per operation kept for the latency percentiles
+    DYNAMODB_ASYNC_MAX_WORKERS = int(os.getenv('DYNAMODB_ASYNC_MAX_WORKERS', 16))
+    DYNAMODB_ASYNC_LATENCY_WINDOW = int(os.getenv('DYNAMODB_ASYNC_LATENCY_WINDOW', 1024))
+
+    # S3 object cache: local directory, size budget of the cached objects,
+    # and age after which an object is revalidated against its ETag
+    S3_CACHE_DIR = os.getenv('S3_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'myaws-s3-cache'))
+    S3_CACHE_MAX_BYTES = int(os.getenv('S3_CACHE_MAX_BYTES', 1024 ** 3))
+    S3_CACHE_REVALIDATE_AFTER_SECONDS = float(os.getenv('S3_CACHE_REVALIDATE_AFTER_SECONDS', 60))
@@ -1,16 +1,61 @@
 import boto3
 from myExceptions import aws as awsExceptions
 from .config import Config
+from .item_cache import ItemCache, item_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, Optional
 import logging
+import queue
+import random
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Per-request limits of BatchGetItem and BatchWriteItem
+BATCH_GET_LIMIT = 100
+BATCH_WRITE_LIMIT = 25
+
+
 class DynamoDB:
-    @staticmethod
-    def get_table(table_name: str):
+    # boto3 resources are not thread safe: each thread keeps its own
+    # resource and table handles, created on first use and then reused
+    _local = threading.local()
+    _generation = 0
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+    _sleep: Callable[[float], None] = staticmethod(time.sleep)
+    # Read-through cache of get_item, for the tables configured in it
+    item_cache: ItemCache = item_cache
+
+    @classmethod
+    def resource(cls):
+        """
+        Returns the DynamoDB resource of the calling thread.
+        """
+        local = cls._local
+        if getattr(local, 'generation', None) != cls._generation:
+            options = {'endpoint_url': Config.DYNAMODB_ENDPOINT_URL} if Config.DYNAMODB_ENDPOINT_URL else {}
+            local.resource = boto3.resource('dynamodb', region_name=Config.AWS_REGION, **options)
+            local.tables = {}
+            local.generation = cls._generation
+        return local.resource
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Drops the cached resources and table handles of every thread, e.g.
+        after changing credentials (or between tests).
+        """
+        cls._generation += 1
+
+    @classmethod
+    def get_table(cls, table_name: str):
         """
         Retrieves a DynamoDB table object based on the provided table name.
 
+        The table handle is cached, so repeated calls do not build a new resource.
+
         Args:
             table_name (str): The name of the DynamoDB table.
 
@@ -21,10 +66,13 @@ class DynamoDB:
             DynamoDBServiceError: If there is an error retrieving the table or if the credentials are not available.
         """
         try:
-            # Create a DynamoDB resource
-            dynamodb = boto3.resource('dynamodb', region_name=Config.AWS_REGION)    
-            # Specify the table you want to interact with
-            table = dynamodb.Table(table_name)
+            # Create (once per thread) the DynamoDB resource
+            dynamodb = cls.resource()
+            tables = cls._local.tables
+            table = tables.get(table_name)
+            if table is None:
+                # Specify the table you want to interact with
+                table = tables[table_name] = dynamodb.Table(table_name)
             return table
         except Exception as e:
             error_message = f'Error in aws.dynamodb: Error retrieving table: {table_name}. {str(e)}'
@@ -59,15 +107,22 @@ class DynamoDB:
             error_message = f'Error in aws.dynamodb: Error putting item: {item} into table: {table_name}. {str(e)}'
             logger.error(f"DynamoDBServiceError | Message: {error_message} | Status Code: 502 | Error Code: dynamodb_service_error")
             raise awsExceptions.DynamoDBServiceError(error_message) from e
+        finally:
+            # Write-through invalidation, also when the outcome of the put is unknown
+            cls.item_cache.invalidate_item(table_name, item)
                 
     @classmethod
-    def get_item(cls, key: dict, table_name: str) -> dict:
+    def get_item(cls, key: dict, table_name: str, cached: bool = True) -> dict:
         """
         Retrieves an item from the specified DynamoDB table based on the provided key.
 
+        Reads of tables configured in the item cache are served from it
+        while the cached copy is fresh (see ItemCache).
+
         Args:
             key (dict): The key used to retrieve the item.
             table_name (str): The name of the DynamoDB table.
+            cached (bool): Whether the item cache may be used; False forces a read.
 
         Returns:
             dict: The retrieved item, or None if the item does not exist.
@@ -77,8 +132,9 @@ class DynamoDB:
         """
         try:
             table = cls.get_table(table_name)
-            response = table.get_item(Key=key)
-            return response.get('Item', None)
+            if not cached:
+                cls.item_cache.invalidate(table_name, key)
+            return cls.item_cache.get(table_name, key, lambda: table.get_item(Key=key).get('Item', None))
         except awsExceptions.DynamoDBServiceError as e:
             # Re-raise with additional context
             error_message = f'Error in aws.dynamodb: Error getting item with key: {key} from table: {table_name}. {str(e)}'
@@ -89,3 +145,312 @@ class DynamoDB:
             error_message = f'Error in aws.dynamodb: Error getting item with key: {key} from table: {table_name}. {str(e)}'
             logger.error(f"DynamoDBServiceError | Message: {error_message} | Status Code: 502 | Error Code: dynamodb_service_error")
             raise awsExceptions.DynamoDBServiceError(error_message) from e
+
+    # ------------------------------------------------------------------
+    # Batch operations
+    # ------------------------------------------------------------------
+    @classmethod
+    def _map_chunks(cls, function: Callable, chunks: list) -> list:
+        """
+        Runs function over the chunks, in parallel on the batch executor when there are several.
+        """
+        if len(chunks) <= 1:
+            return [function(chunk) for chunk in chunks]
+        if cls._executor is None:
+            with cls._executor_lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(max_workers=Config.DYNAMODB_BATCH_MAX_WORKERS, thread_name_prefix='dynamodb-batch')
+        return list(cls._executor.map(function, chunks))
+
+    @classmethod
+    def _backoff(cls, attempt: int) -> None:
+        delay = min(Config.DYNAMODB_BATCH_BACKOFF_MAX_SECONDS, Config.DYNAMODB_BATCH_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+        cls._sleep(random.uniform(0, delay))
+
+    @classmethod
+    def _batch_get_chunk(cls, table_name: str, keys: list[dict], options: dict) -> list[dict]:
+        items = []
+        request = {table_name: {'Keys': keys, **options}}
+        for attempt in range(1, Config.DYNAMODB_BATCH_MAX_ATTEMPTS + 1):
+            response = cls.resource().batch_get_item(RequestItems=request)
+            items.extend(response.get('Responses', {}).get(table_name, []))
+            request = response.get('UnprocessedKeys') or {}
+            if not request:
+                return items
+            # Throttled: DynamoDB returned part of the keys unprocessed
+            cls._backoff(attempt)
+        raise awsExceptions.DynamoDBServiceError(
+            f'{len(request[table_name]["Keys"])} keys still unprocessed after {Config.DYNAMODB_BATCH_MAX_ATTEMPTS} attempts'
+        )
+
+    @classmethod
+    def batch_get(cls, keys: list[dict], table_name: str, projection: Optional[str] = None, consistent_read: bool = False) -> list[dict]:
+        """
+        Retrieves many items by key, with as few requests as possible.
+
+        Keys are deduplicated and split into chunks of 100 (the BatchGetItem
+        limit), which are sent in parallel; unprocessed keys are retried
+        with exponential backoff.
+
+        Args:
+            keys (list[dict]): The keys of the items.
+            table_name (str): The name of the DynamoDB table.
+            projection (str | None): ProjectionExpression limiting the attributes returned.
+            consistent_read (bool): Whether to use strongly consistent reads.
+
+        Returns:
+            list[dict]: The items found, in no particular order (missing keys are skipped).
+
+        Raises:
+            DynamoDBServiceError: If a request fails or keys stay unprocessed.
+        """
+        unique = list({tuple(sorted(key.items())): key for key in keys}.values())
+        options = {'ConsistentRead': consistent_read}
+        if projection:
+            options['ProjectionExpression'] = projection
+        chunks = [unique[i:i + BATCH_GET_LIMIT] for i in range(0, len(unique), BATCH_GET_LIMIT)]
+        try:
+            results = cls._map_chunks(lambda chunk: cls._batch_get_chunk(table_name, chunk, options), chunks)
+            return [item for items in results for item in items]
+        except Exception as e:
+            error_message = f'Error in aws.dynamodb: Error batch getting {len(unique)} keys from table: {table_name}. {str(e)}'
+            logger.error(f"DynamoDBServiceError | Message: {error_message} | Status Code: 502 | Error Code: dynamodb_service_error")
+            raise awsExceptions.DynamoDBServiceError(error_message) from e
+
+    @classmethod
+    def _batch_write_chunk(cls, table_name: str, requests: list[dict]) -> None:
+        request = {table_name: requests}
+        for attempt in range(1, Config.DYNAMODB_BATCH_MAX_ATTEMPTS + 1):
+            response = cls.resource().batch_write_item(RequestItems=request)
+            request = response.get('UnprocessedItems') or {}
+            if not request:
+                return
+            cls._backoff(attempt)
+        raise awsExceptions.DynamoDBServiceError(
+            f'{len(request[table_name])} items still unprocessed after {Config.DYNAMODB_BATCH_MAX_ATTEMPTS} attempts'
+        )
+
+    @classmethod
+    def batch_write(cls, table_name: str, items: list[dict] = (), delete_keys: list[dict] = ()) -> None:
+        """
+        Puts and deletes many items, with as few requests as possible.
+
+        Requests are split into chunks of 25 (the BatchWriteItem limit),
+        which are sent in parallel; unprocessed items are retried with
+        exponential backoff. Writes are not atomic: on failure some chunks
+        may have been written.
+
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            items (list[dict]): Items to put.
+            delete_keys (list[dict]): Keys of the items to delete.
+
+        Raises:
+            DynamoDBServiceError: If a request fails or items stay unprocessed.
+        """
+        requests = [{'PutRequest': {'Item': item}} for item in items]
+        requests += [{'DeleteRequest': {'Key': key}} for key in delete_keys]
+        chunks = [requests[i:i + BATCH_WRITE_LIMIT] for i in range(0, len(requests), BATCH_WRITE_LIMIT)]
+        try:
+            cls._map_chunks(lambda chunk: cls._batch_write_chunk(table_name, chunk), chunks)
+        except Exception as e:
+            error_message = f'Error in aws.dynamodb: Error batch writing {len(requests)} requests into table: {table_name}. {str(e)}'
+            logger.error(f"DynamoDBServiceError | Message: {error_message} | Status Code: 502 | Error Code: dynamodb_service_error")
+            raise awsExceptions.DynamoDBServiceError(error_message) from e
+        finally:
+            # Even a failed batch may have written some chunks
+            for written in (*items, *delete_keys):
+                cls.item_cache.invalidate_item(table_name, written)
+
+    # ------------------------------------------------------------------
+    # Query and scan
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _read_params(projection: Optional[str], filter_expression: Any, page_size: Optional[int], extra: dict) -> dict:
+        params = dict(extra)
+        if projection:
+            params['ProjectionExpression'] = projection
+        if filter_expression is not None:
+            params['FilterExpression'] = filter_expression
+        if page_size:
+            params['Limit'] = page_size
+        return params
+
+    @staticmethod
+    def _pages(operation: Callable[..., dict], params: dict) -> Iterator[list[dict]]:
+        """
+        Yields the items of each page, requesting the next page only when asked for it.
+        """
+        params = dict(params)
+        while True:
+            response = operation(**params)
+            yield response.get('Items', [])
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return
+            params['ExclusiveStartKey'] = last_key
+
+    @classmethod
+    def _items(cls, action: str, table_name: str, method: str, params: dict, limit: Optional[int]) -> Iterator[dict]:
+        returned = 0
+        try:
+            table = cls.get_table(table_name)
+            for page in cls._pages(getattr(table, method), params):
+                for item in page:
+                    yield item
+                    returned += 1
+                    if limit is not None and returned >= limit:
+                        return
+        except Exception as e:
+            error_message = f'Error in aws.dynamodb: Error {action} table: {table_name}. {str(e)}'
+            logger.error(f"DynamoDBServiceError | Message: {error_message} | Status Code: 502 | Error Code: dynamodb_service_error")
+            raise awsExceptions.DynamoDBServiceError(error_message) from e
+
+    @classmethod
+    def query(
+        cls,
+        table_name: str,
+        key_condition: Any,
+        projection: Optional[str] = None,
+        index_name: Optional[str] = None,
+        filter_expression: Any = None,
+        page_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        scan_forward: bool = True,
+        consistent_read: bool = False,
+        **kwargs: Any
+    ) -> Iterator[dict]:
+        """
+        Streams the items matching a key condition, one page at a time.
+
+        Pages are requested lazily as the iterator is consumed, following
+        LastEvaluatedKey, so memory use does not depend on the result size.
+
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            key_condition: KeyConditionExpression, e.g. Key('client_id').eq(42).
+            projection (str | None): ProjectionExpression; only these attributes are read and returned.
+            index_name (str | None): Secondary index to query.
+            filter_expression: FilterExpression applied after the read (it does not reduce read units).
+            page_size (int | None): Items evaluated per request (Limit).
+            limit (int | None): Stop after this many items.
+            scan_forward (bool): Ascending sort key order.
+            consistent_read (bool): Whether to use strongly consistent reads.
+            **kwargs: Other Query parameters, e.g. ExpressionAttributeNames.
+
+        Yields:
+            dict: The matching items.
+
+        Raises:
+            DynamoDBServiceError: If a request fails.
+        """
+        params = cls._read_params(projection, filter_expression, page_size, kwargs)
+        params.update(KeyConditionExpression=key_condition, ScanIndexForward=scan_forward, ConsistentRead=consistent_read)
+        if index_name:
+            params['IndexName'] = index_name
+        return cls._items('querying', table_name, 'query', params, limit)
+
+    @classmethod
+    def scan(
+        cls,
+        table_name: str,
+        projection: Optional[str] = None,
+        filter_expression: Any = None,
+        page_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        **kwargs: Any
+    ) -> Iterator[dict]:
+        """
+        Streams every item of a table, one page at a time.
+
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            projection (str | None): ProjectionExpression; only these attributes are read and returned.
+            filter_expression: FilterExpression applied after the read (it does not reduce read units).
+            page_size (int | None): Items evaluated per request (Limit).
+            limit (int | None): Stop after this many items.
+            **kwargs: Other Scan parameters, e.g. IndexName or ExpressionAttributeNames.
+
+        Yields:
+            dict: The items.
+
+        Raises:
+            DynamoDBServiceError: If a request fails.
+        """
+        params = cls._read_params(projection, filter_expression, page_size, kwargs)
+        return cls._items('scanning', table_name, 'scan', params, limit)
+
+    @classmethod
+    def parallel_scan(
+        cls,
+        table_name: str,
+        segments: int = 4,
+        projection: Optional[str] = None,
+        filter_expression: Any = None,
+        page_size: Optional[int] = None,
+        max_buffered_pages: Optional[int] = None,
+        **kwargs: Any
+    ) -> Iterator[dict]:
+        """
+        Streams every item of a table, scanning N segments in parallel.
+
+        Each segment is scanned by its own thread; pages are merged into one
+        stream in arrival order, so items come in no particular order. A
+        bounded buffer makes the threads wait for a slow consumer, and
+        closing the iterator early stops them.
+
+        Args:
+            table_name (str): The name of the DynamoDB table.
+            segments (int): Number of segments (TotalSegments) scanned at once.
+            projection (str | None): ProjectionExpression; only these attributes are read and returned.
+            filter_expression: FilterExpression applied after the read.
+            page_size (int | None): Items evaluated per request (Limit).
+            max_buffered_pages (int | None): Pages read ahead of the consumer (default: 2 per segment).
+            **kwargs: Other Scan parameters.
+
+        Yields:
+            dict: The items.
+
+        Raises:
+            DynamoDBServiceError: If a segment fails.
+        """
+        params = cls._read_params(projection, filter_expression, page_size, kwargs)
+        pages: queue.Queue = queue.Queue(maxsize=max_buffered_pages or 2 * segments)
+        stop = threading.Event()
+        done = object()
+
+        def put(value: Any) -> None:
+            while not stop.is_set():
+                try:
+                    pages.put(value, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def scan_segment(segment: int) -> None:
+            try:
+                table = cls.get_table(table_name)
+                for page in cls._pages(table.scan, {**params, 'Segment': segment, 'TotalSegments': segments}):
+                    if stop.is_set():
+                        return
+                    put(page)
+                put(done)
+            except Exception as e:
+                put(e)
+
+        for segment in range(segments):
+            threading.Thread(target=scan_segment, args=(segment,), name=f'dynamodb-scan-{segment}', daemon=True).start()
+        try:
+            finished = 0
+            while finished < segments:
+                page = pages.get()
+                if page is done:
+                    finished += 1
+                elif isinstance(page, Exception):
+                    error_message = f'Error in aws.dynamodb: Error scanning table: {table_name}. {str(page)}'
+                    logger.error(f"DynamoDBServiceError | Message: {error_message} | Status Code: 502 | Error Code: dynamodb_service_error")
+                    raise awsExceptions.DynamoDBServiceError(error_message) from page
+                else:
+                    yield from page
+        finally:
+            stop.set()
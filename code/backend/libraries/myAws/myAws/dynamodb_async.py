@@ -0,0 +1,241 @@
+from myExceptions import aws as awsExceptions
+from .config import Config
+from .dynamodb import DynamoDB
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Optional
+import asyncio
+import functools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class OperationLatency:
+    """
+    Call count, error count and latency percentiles of one operation,
+    over its most recent calls.
+    """
+
+    def __init__(self, window: int):
+        self.calls = 0
+        self.errors = 0
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float, failed: bool) -> None:
+        self.calls += 1
+        self.errors += failed
+        self._samples.append(seconds)
+
+    def snapshot(self) -> dict:
+        samples = sorted(self._samples)
+
+        def percentile(fraction: float) -> float:
+            return samples[min(len(samples) - 1, int(fraction * len(samples)))] * 1000 if samples else 0.0
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean_ms": sum(samples) / len(samples) * 1000 if samples else 0.0,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": samples[-1] * 1000 if samples else 0.0,
+        }
+
+
+class AsyncDynamoDB:
+    """
+    Async counterpart of DynamoDB, for use inside FastAPI handlers.
+
+    boto3 is blocking: called from an endpoint it stalls the event loop for
+    the whole round trip. Every operation here runs the DynamoDB method of
+    the same name on a dedicated, bounded thread pool shared by the process,
+    and the loop only awaits it. Each pool thread keeps its own boto3
+    resource (see DynamoDB.resource), so the pool is the connection pool.
+    Cache hits of get_item are answered on the loop, without a thread hop.
+
+    Latency is recorded per operation, including the time queued for a
+    thread, and reported by stats().
+    """
+
+    def __init__(
+        self,
+        max_workers: int = Config.DYNAMODB_ASYNC_MAX_WORKERS,
+        latency_window: int = Config.DYNAMODB_ASYNC_LATENCY_WINDOW,
+        dynamodb: type[DynamoDB] = DynamoDB
+    ):
+        """
+        Args:
+            max_workers (int): Maximum number of requests in flight
+            latency_window (int): Calls per operation kept for the percentiles
+            dynamodb (type[DynamoDB]): The synchronous implementation to run
+        """
+        self.max_workers = max_workers
+        self.latency_window = latency_window
+        self.dynamodb = dynamodb
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._latency: dict[str, OperationLatency] = {}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dynamodb")
+        return self._executor
+
+    def _record(self, operation: str, seconds: float, failed: bool) -> None:
+        with self._lock:
+            latency = self._latency.get(operation)
+            if latency is None:
+                latency = self._latency[operation] = OperationLatency(self.latency_window)
+            latency.record(seconds, failed)
+
+    async def _run(self, operation: str, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await loop.run_in_executor(self.executor, functools.partial(function, *args, **kwargs))
+            failed = False
+            return result
+        finally:
+            self._record(operation, time.perf_counter() - started, failed)
+
+    async def get_item(self, key: dict, table_name: str, cached: bool = True) -> Optional[dict]:
+        """
+        Retrieves an item by key (see DynamoDB.get_item).
+
+        Returns:
+            dict | None: The item, or None if it does not exist.
+
+        Raises:
+            DynamoDBServiceError: If an error occurs while retrieving the item.
+        """
+        if cached:
+            hit, item = self.dynamodb.item_cache.peek(table_name, key)
+            if hit:
+                return item
+        return await self._run("get_item", self.dynamodb.get_item, key, table_name, cached)
+
+    async def put_item(self, item: dict, table_name: str) -> None:
+        """
+        Puts an item into a table (see DynamoDB.put_item).
+
+        Raises:
+            DynamoDBServiceError: If an error occurs while putting the item.
+        """
+        await self._run("put_item", self.dynamodb.put_item, item, table_name)
+
+    async def batch_get(self, keys: list[dict], table_name: str, projection: Optional[str] = None, consistent_read: bool = False) -> list[dict]:
+        """
+        Retrieves many items by key (see DynamoDB.batch_get).
+
+        Raises:
+            DynamoDBServiceError: If a request fails or keys stay unprocessed.
+        """
+        return await self._run("batch_get", self.dynamodb.batch_get, keys, table_name, projection, consistent_read)
+
+    async def batch_write(self, table_name: str, items: list[dict] = (), delete_keys: list[dict] = ()) -> None:
+        """
+        Puts and deletes many items (see DynamoDB.batch_write).
+
+        Raises:
+            DynamoDBServiceError: If a request fails or items stay unprocessed.
+        """
+        await self._run("batch_write", self.dynamodb.batch_write, table_name, items, delete_keys)
+
+    async def _items(self, operation: str, table_name: str, params: dict, limit: Optional[int]) -> AsyncIterator[dict]:
+        def fetch(page_params: dict) -> dict:
+            return getattr(self.dynamodb.get_table(table_name), operation)(**page_params)
+
+        returned = 0
+        params = dict(params)
+        while True:
+            try:
+                response = await self._run(operation, fetch, params)
+            except Exception as e:
+                action = "querying" if operation == "query" else "scanning"
+                error_message = f'Error in aws.dynamodb: Error {action} table: {table_name}. {str(e)}'
+                logger.error(f"DynamoDBServiceError | Message: {error_message} | Status Code: 502 | Error Code: dynamodb_service_error")
+                raise awsExceptions.DynamoDBServiceError(error_message) from e
+            for item in response.get('Items', []):
+                yield item
+                returned += 1
+                if limit is not None and returned >= limit:
+                    return
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return
+            params['ExclusiveStartKey'] = last_key
+
+    def query(
+        self,
+        table_name: str,
+        key_condition: Any,
+        projection: Optional[str] = None,
+        index_name: Optional[str] = None,
+        filter_expression: Any = None,
+        page_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        scan_forward: bool = True,
+        consistent_read: bool = False,
+        **kwargs: Any
+    ) -> AsyncIterator[dict]:
+        """
+        Streams the items matching a key condition (see DynamoDB.query).
+
+            async for order in async_dynamodb.query('orders', Key('client_id').eq(42)):
+                ...
+
+        Each page is fetched on the pool when the previous one is consumed.
+
+        Raises:
+            DynamoDBServiceError: If a request fails.
+        """
+        params = self.dynamodb._read_params(projection, filter_expression, page_size, kwargs)
+        params.update(KeyConditionExpression=key_condition, ScanIndexForward=scan_forward, ConsistentRead=consistent_read)
+        if index_name:
+            params['IndexName'] = index_name
+        return self._items("query", table_name, params, limit)
+
+    def scan(
+        self,
+        table_name: str,
+        projection: Optional[str] = None,
+        filter_expression: Any = None,
+        page_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[dict]:
+        """
+        Streams every item of a table (see DynamoDB.scan).
+
+        Raises:
+            DynamoDBServiceError: If a request fails.
+        """
+        params = self.dynamodb._read_params(projection, filter_expression, page_size, kwargs)
+        return self._items("scan", table_name, params, limit)
+
+    def shutdown(self) -> None:
+        """
+        Stop the pool (it is recreated on next use).
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        """
+        Return the call count, error count and latency percentiles of each operation.
+        """
+        with self._lock:
+            return {operation: latency.snapshot() for operation, latency in self._latency.items()}
+
+
+async_dynamodb = AsyncDynamoDB()
@@ -0,0 +1,177 @@
+from .config import Config
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+import copy
+import threading
+import time
+
+_MISSING = object()
+
+
+class ItemCache:
+    """
+    Per-process read-through cache of DynamoDB point reads.
+
+    Only tables configured with a TTL are cached, so that items that are
+    read constantly and rarely change (configuration, sessions) skip the
+    round trip while everything else keeps reading through. Items that do
+    not exist are cached too, for the negative TTL. Writes made through
+    DynamoDB.put_item / batch_write invalidate the items they touch; writes
+    made by other processes show up when the entry expires.
+    """
+
+    def __init__(
+        self,
+        table_ttls: Optional[dict[str, float]] = None,
+        negative_ttl_seconds: float = Config.DYNAMODB_ITEM_CACHE_NEGATIVE_TTL_SECONDS,
+        max_entries: int = Config.DYNAMODB_ITEM_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            table_ttls (dict | None): Table name -> seconds its items are cached
+            negative_ttl_seconds (float): Seconds a missing item is cached (capped by the table TTL)
+            max_entries (int): Entries kept before the least recently used are evicted
+            clock (callable): Monotonic time source
+        """
+        self.table_ttls = dict(Config.DYNAMODB_ITEM_CACHE_TTLS if table_ttls is None else table_ttls)
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[tuple, tuple[float, Optional[dict]]] = OrderedDict()
+        # Key attribute names of each table, learnt from the keys it is read with
+        self._key_attributes: dict[str, tuple[str, ...]] = {}
+        # Bumped by every invalidation: a read that started before one does not store its result
+        self._version = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "negative_hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def configure(self, table_name: str, ttl_seconds: Optional[float]) -> None:
+        """
+        Cache the items of a table for ttl_seconds, or stop caching them (None).
+        """
+        with self._lock:
+            if ttl_seconds:
+                self.table_ttls[table_name] = ttl_seconds
+            else:
+                self.table_ttls.pop(table_name, None)
+                self._drop_table(table_name)
+
+    def enabled(self, table_name: str) -> bool:
+        return table_name in self.table_ttls
+
+    @staticmethod
+    def _cache_key(table_name: str, key: dict) -> tuple[str, Hashable]:
+        return table_name, tuple(sorted(key.items()))
+
+    def peek(self, table_name: str, key: dict) -> tuple[bool, Optional[dict]]:
+        """
+        Return the cached item with the given key, without loading it.
+
+        Returns:
+            tuple[bool, dict | None]: Whether a fresh entry was found, and a copy of its item
+        """
+        if table_name not in self.table_ttls:
+            return False, None
+        cache_key = self._cache_key(table_name, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None or self._clock() >= entry[0]:
+                return False, None
+            self._entries.move_to_end(cache_key)
+            self._stats["hits" if entry[1] is not None else "negative_hits"] += 1
+            return True, copy.deepcopy(entry[1])
+
+    def get(self, table_name: str, key: dict, load: Callable[[], Optional[dict]]) -> Optional[dict]:
+        """
+        Return the item with the given key, calling load() on a miss.
+
+        Args:
+            table_name (str): The name of the DynamoDB table
+            key (dict): The key of the item
+            load (callable): Reads the item from DynamoDB (None if it does not exist)
+
+        Returns:
+            dict | None: A copy of the item, so callers can modify it freely
+        """
+        ttl_seconds = self.table_ttls.get(table_name)
+        if ttl_seconds is None:
+            return load()
+        cache_key = self._cache_key(table_name, key)
+        with self._lock:
+            self._key_attributes.setdefault(table_name, tuple(sorted(key)))
+            entry = self._entries.get(cache_key)
+            if entry is not None and self._clock() < entry[0]:
+                self._entries.move_to_end(cache_key)
+                self._stats["hits" if entry[1] is not None else "negative_hits"] += 1
+                return copy.deepcopy(entry[1])
+            self._stats["misses"] += 1
+            version = self._version
+
+        item = load()
+        if item is None:
+            ttl_seconds = min(ttl_seconds, self.negative_ttl_seconds)
+        with self._lock:
+            if version == self._version:
+                self._entries[cache_key] = (self._clock() + ttl_seconds, copy.deepcopy(item))
+                self._entries.move_to_end(cache_key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        return item
+
+    def invalidate(self, table_name: str, key: dict) -> None:
+        """
+        Drop the cached item with the given key.
+        """
+        with self._lock:
+            self._version += 1
+            if self._entries.pop(self._cache_key(table_name, key), _MISSING) is not _MISSING:
+                self._stats["invalidations"] += 1
+
+    def invalidate_item(self, table_name: str, item: dict) -> None:
+        """
+        Drop the cached copy of an item that is being written.
+
+        The key attributes are those the table has been read with; if the
+        table has not been read yet there is nothing cached to drop.
+        """
+        if table_name not in self.table_ttls:
+            return
+        key_attributes = self._key_attributes.get(table_name)
+        if key_attributes is None or not all(attribute in item for attribute in key_attributes):
+            with self._lock:
+                self._version += 1
+                self._drop_table(table_name)
+            return
+        self.invalidate(table_name, {attribute: item[attribute] for attribute in key_attributes})
+
+    def _drop_table(self, table_name: str) -> None:
+        for cache_key in [cache_key for cache_key in self._entries if cache_key[0] == table_name]:
+            del self._entries[cache_key]
+            self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        """
+        Drop every cached item.
+        """
+        with self._lock:
+            self._version += 1
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss counters and the hit rate (negative hits included).
+        """
+        with self._lock:
+            hits = self._stats["hits"] + self._stats["negative_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+
+item_cache = ItemCache()
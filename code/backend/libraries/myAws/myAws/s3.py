@@ -1,8 +1,22 @@
 import os
 import boto3
+from botocore.exceptions import ClientError
 from myExceptions import aws as awsExceptions
 from myExceptions import validation as validationExceptions
 from .config import Config
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Optional
+import hashlib
+import json
+import logging
+import shutil
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 
 class S3:
@@ -32,6 +46,7 @@ class S3:
         try:
             client = cls.get_s3_client()
             client.upload_file(file_path, bucket_name, object_name)
+            s3_cache.invalidate(bucket_name, object_name)
 
             print(f'File {file_path} uploaded to bucket {bucket_name} as {object_name}.')
         except Exception as e:
@@ -56,6 +71,7 @@ class S3:
         try:
             client = cls.get_s3_client()
             client.upload_fileobj(file_obj, bucket_name, object_name)
+            s3_cache.invalidate(bucket_name, object_name)
             print(f'File object uploaded to bucket {bucket_name} as {object_name}.')
         except Exception as e:
             raise awsExceptions.S3ServiceError(f"Error in aws.s3: Error uploading file object to bucket: {bucket_name}" + str(e))
@@ -78,13 +94,14 @@ class S3:
         try:
             client = cls.get_s3_client()
             client.delete_object(Bucket=bucket_name, Key=object_name)
+            s3_cache.invalidate(bucket_name, object_name)
             print(f'Object {object_name} deleted from bucket {bucket_name}.')
         except Exception as e:
             raise awsExceptions.S3ServiceError(f"Error in aws.s3: Error deleting object {object_name} from bucket: {bucket_name}" + str(e))
 
 
     @classmethod
-    def download_file(cls, bucket_name: str, object_name: str, file_path: str) -> None:
+    def download_file(cls, bucket_name: str, object_name: str, file_path: str, cached: bool = False) -> None:
         """
         Downloads a file from an S3 bucket to a local file path.
 
@@ -92,6 +109,7 @@ class S3:
             bucket_name (str): The name of the S3 bucket.
             object_name (str): The name of the object/file in the S3 bucket.
             file_path (str): The local file path where the downloaded file will be saved.
+            cached (bool): Copy the object from the local object cache (s3_cache), downloading it only when missing or changed.
 
         Raises:
             S3Exception: If an error occurs during the download process.
@@ -102,6 +120,9 @@ class S3:
         # check if file is not already downloaded
         if os.path.exists(file_path): 
             raise validationExceptions.FileAlreadyExistsError(f"File {file_path} already exists.")
+        if cached:
+            s3_cache.copy_to(bucket_name, object_name, file_path)
+            return
         try:
             client = cls.get_s3_client()
             client.download_file(bucket_name, object_name, file_path)
@@ -124,3 +145,240 @@ class S3:
 
         """
         return f"https://{bucket_name}.s3.{Config.AWS_REGION}.amazonaws.com/{object_name}"
+
+
+@dataclass
+class _CachedObject:
+    path: str
+    etag: str
+    size: int
+    validated_at: float
+
+
+class S3ObjectCache:
+    """
+    Read-through cache of S3 objects on local disk.
+
+    Objects are stored under directory, one file per object plus a small
+    metadata file holding its ETag, so the cache survives restarts. A cached
+    object is revalidated with a conditional GET (If-None-Match) once it is
+    older than revalidate_after_seconds: an unchanged object costs a 304
+    and no transfer, a changed one is downloaded in the same request.
+    Concurrent requests for the same object share one download. Once the
+    files exceed max_bytes the least recently used are deleted.
+
+    Objects are handed out as open files (or copies): an open file stays
+    readable even if the object is evicted meanwhile.
+    """
+
+    def __init__(
+        self,
+        directory: str = Config.S3_CACHE_DIR,
+        max_bytes: int = Config.S3_CACHE_MAX_BYTES,
+        revalidate_after_seconds: float = Config.S3_CACHE_REVALIDATE_AFTER_SECONDS,
+        client: Any = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            directory (str): Where the objects are stored (created on first use)
+            max_bytes (int): Size budget of the stored objects
+            revalidate_after_seconds (float): Age after which an object is checked against S3 again
+            client: boto3 S3 client (default: one created on first use)
+            clock (callable): Time source
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.revalidate_after_seconds = revalidate_after_seconds
+        self._client = client
+        self._clock = clock
+        self._entries: Optional[OrderedDict[tuple[str, str], _CachedObject]] = None
+        self._bytes = 0
+        self._inflight: dict[tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "revalidations": 0, "downloads": 0, "shared": 0, "evictions": 0}
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            self._client = S3.get_s3_client()
+        return self._client
+
+    def _base_path(self, bucket_name: str, object_name: str) -> str:
+        digest = hashlib.sha256(f"{bucket_name}/{object_name}".encode()).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    def _load_index(self) -> None:
+        """
+        Rebuild the index from the metadata files, least recently used first.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".meta"):
+                continue
+            meta_path = os.path.join(self.directory, name)
+            try:
+                with open(meta_path, encoding="utf-8") as file:
+                    meta = json.load(file)
+                path = meta_path[:-len(".meta")]
+                stat = os.stat(path)
+            except (OSError, ValueError):
+                continue
+            found.append((stat.st_mtime, (meta["bucket"], meta["key"]), _CachedObject(path, meta["etag"], stat.st_size, 0.0)))
+        self._entries = OrderedDict((cache_key, entry) for _, cache_key, entry in sorted(found, key=lambda found_entry: found_entry[0]))
+        self._bytes = sum(entry.size for entry in self._entries.values())
+
+    def _remove_files(self, entry: _CachedObject) -> None:
+        for path in (entry.path, entry.path + ".meta"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self._remove_files(entry)
+            self._stats["evictions"] += 1
+
+    def _fetch(self, bucket_name: str, object_name: str, cached: Optional[_CachedObject]) -> BinaryIO:
+        """
+        Download the object, or confirm the cached copy with a 304, index
+        the result and open it.
+        """
+        cache_key = (bucket_name, object_name)
+        options = {"IfNoneMatch": cached.etag} if cached else {}
+        try:
+            response = self.client.get_object(Bucket=bucket_name, Key=object_name, **options)
+        except ClientError as e:
+            if not (cached and e.response.get("ResponseMetadata", {}).get("HTTPStatusCode") == 304):
+                raise
+            with self._lock:
+                if self._entries.get(cache_key) is cached:
+                    cached.validated_at = self._clock()
+                    self._entries.move_to_end(cache_key)
+                    self._stats["revalidations"] += 1
+                    return open(cached.path, "rb")
+            # Evicted meanwhile: download it again
+            return self._fetch(bucket_name, object_name, None)
+
+        path = self._base_path(bucket_name, object_name)
+        with tempfile.NamedTemporaryFile(dir=self.directory, prefix=".download-", delete=False) as file:
+            try:
+                shutil.copyfileobj(response["Body"], file, 1024 * 1024)
+            except BaseException:
+                os.remove(file.name)
+                raise
+            size = file.tell()
+        with self._lock:
+            previous = self._entries.pop(cache_key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            os.replace(file.name, path)
+            with open(path + ".meta", "w", encoding="utf-8") as meta:
+                json.dump({"bucket": bucket_name, "key": object_name, "etag": response["ETag"]}, meta)
+            self._entries[cache_key] = _CachedObject(path, response["ETag"], size, self._clock())
+            self._bytes += size
+            self._stats["downloads"] += 1
+            handle = open(path, "rb")
+            self._evict()
+            return handle
+
+    def open(self, bucket_name: str, object_name: str) -> BinaryIO:
+        """
+        Open the object for reading, fetching it first if it is missing or stale.
+
+        Args:
+            bucket_name (str): The name of the S3 bucket.
+            object_name (str): The name of the object in the bucket.
+
+        Returns:
+            BinaryIO: The object, opened in binary mode; the caller closes it.
+
+        Raises:
+            S3ServiceError: If the object cannot be fetched.
+        """
+        cache_key = (bucket_name, object_name)
+        while True:
+            with self._lock:
+                if self._entries is None:
+                    self._load_index()
+                cached = self._entries.get(cache_key)
+                if cached is not None and self._clock() - cached.validated_at < self.revalidate_after_seconds:
+                    self._entries.move_to_end(cache_key)
+                    self._stats["hits"] += 1
+                    return open(cached.path, "rb")
+                inflight = self._inflight.get(cache_key)
+                if inflight is None:
+                    inflight = self._inflight[cache_key] = Future()
+                    leader = True
+                else:
+                    self._stats["shared"] += 1
+                    leader = False
+
+            if not leader:
+                # Another thread is fetching the object: wait for it, then read its result
+                inflight.result()
+                with self._lock:
+                    cached = self._entries.get(cache_key)
+                    if cached is not None:
+                        self._entries.move_to_end(cache_key)
+                        return open(cached.path, "rb")
+                continue
+
+            try:
+                return self._fetch(bucket_name, object_name, cached)
+            except Exception as e:
+                error = awsExceptions.S3ServiceError(f"Error in aws.s3: Error fetching object: {object_name} from bucket: {bucket_name}. {str(e)}")
+                logger.error(f"S3ServiceError | Message: {error} | Status Code: 502 | Error Code: s3_service_error")
+                inflight.set_exception(error)
+                raise error from e
+            finally:
+                with self._lock:
+                    self._inflight.pop(cache_key, None)
+                if not inflight.done():
+                    inflight.set_result(None)
+
+    def read(self, bucket_name: str, object_name: str) -> bytes:
+        """
+        Return the content of the object (see open).
+        """
+        with self.open(bucket_name, object_name) as file:
+            return file.read()
+
+    def copy_to(self, bucket_name: str, object_name: str, file_path: str) -> None:
+        """
+        Copy the object to file_path (see open).
+        """
+        with self.open(bucket_name, object_name) as source, open(file_path, "wb") as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+
+    def invalidate(self, bucket_name: str, object_name: str) -> None:
+        """
+        Delete the cached copy of an object, e.g. after overwriting or deleting it.
+        """
+        with self._lock:
+            if self._entries is None:
+                return
+            entry = self._entries.pop((bucket_name, object_name), None)
+            if entry is not None:
+                self._bytes -= entry.size
+                self._remove_files(entry)
+
+    def stats(self) -> dict:
+        """
+        Return hit/download counters, the hit rate and the bytes stored.
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["revalidations"] + self._stats["downloads"]
+            return {
+                **self._stats,
+                "entries": len(self._entries or ()),
+                "bytes": self._bytes,
+                "hit_rate": (self._stats["hits"] + self._stats["revalidations"]) / lookups if lookups else 0.0,
+            }
+
+
+s3_cache = S3ObjectCache()
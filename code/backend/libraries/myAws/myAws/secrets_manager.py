@@ -1,15 +1,23 @@
 import boto3
 from myExceptions import aws as awsExceptions
 from .config import Config
+from typing import Any, Callable, Optional
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
 
 class SecretsManager:
     @staticmethod
-    def get_secret(secret_name: str) -> str:
+    def get_secret(secret_name: str, client: Any = None) -> str:
         """
         Retrieves the value of a secret from AWS Secrets Manager.
 
         Args:
             secret_name (str): The name or ARN of the secret.
+            client: A Secrets Manager client to reuse (default: a new session and client per call).
 
         Returns:
             str | dict: The secret value, either as a string or a dictionary.
@@ -18,9 +26,10 @@ class SecretsManager:
             SecretsManagerException: If there is an error retrieving the secret.
         """
         try:
-            session = boto3.Session(region_name=Config.AWS_REGION)
-            # Assume the role
-            client = session.client(service_name='secretsmanager')
+            if client is None:
+                session = boto3.Session(region_name=Config.AWS_REGION)
+                # Assume the role
+                client = session.client(service_name='secretsmanager')
             # Retrieve the secret value
             get_secret_value_response = client.get_secret_value(
                 SecretId=secret_name
@@ -36,4 +45,219 @@ class SecretsManager:
 
         except Exception as e:
             raise awsExceptions.SecretsManagerServiceError(f'Error in aws.secrets_manager: Error retrieving secret: {secret_name} ' + str(e))
-        
\ No newline at end of file
+
+
+class _SecretEntry:
+    """
+    A cached secret: its value, its own TTL and, while fetches fail, when
+    the next attempt is allowed.
+    """
+
+    __slots__ = ("value", "ttl", "expires_at", "retry_at", "failures")
+
+    def __init__(self, value: Any, ttl: float, expires_at: float):
+        self.value = value
+        self.ttl = ttl
+        self.expires_at = expires_at
+        self.retry_at = 0.0
+        self.failures = 0
+
+
+class SecretCache:
+    """
+    TTL cache in front of Secrets Manager for secrets read at request time.
+
+    Every lookup through SecretsManager.get_secret builds a session and a
+    client and makes a network call (50-200 ms). The cache keeps one
+    long-lived client and serves secrets from memory:
+
+    - a fresh entry is returned as is;
+    - an entry within refresh_ahead_seconds of expiring (at most half its
+      TTL) is returned as is while a background thread fetches the new
+      value, so callers never wait on a rotation;
+    - an expired entry is fetched synchronously, one caller per secret
+      while the others wait for its result;
+    - if that fetch fails the stale value keeps being served for up to
+      max_stale_seconds, and the next fetch is only attempted after a
+      backoff that doubles with each failure.
+    """
+
+    # Refresh-ahead never starts earlier than this fraction of the TTL, so
+    # short-lived secrets are not refreshed on every hit
+    REFRESH_AHEAD_MAX_FRACTION = 0.5
+
+    def __init__(
+        self,
+        ttl_seconds: float = Config.SECRET_CACHE_TTL_SECONDS,
+        refresh_ahead_seconds: float = Config.SECRET_CACHE_REFRESH_AHEAD_SECONDS,
+        max_stale_seconds: float = Config.SECRET_CACHE_MAX_STALE_SECONDS,
+        client: Any = None,
+        clock: Callable[[], float] = time.monotonic,
+        retry_base_seconds: float = Config.SECRET_CACHE_RETRY_BASE_SECONDS,
+        retry_max_seconds: float = Config.SECRET_CACHE_RETRY_MAX_SECONDS
+    ):
+        """
+        Args:
+            ttl_seconds (float): Default lifetime of an entry
+            refresh_ahead_seconds (float): How long before expiry a background refresh starts
+            max_stale_seconds (float): How long past expiry a value is served while fetches fail
+            client: Secrets Manager client to use (default: created on first fetch)
+            clock (callable): Monotonic time source
+            retry_base_seconds (float): Wait before retrying after the first failed fetch
+            retry_max_seconds (float): Longest wait between retries
+        """
+        self.ttl_seconds = ttl_seconds
+        self.refresh_ahead_seconds = refresh_ahead_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._client = client
+        self._clock = clock
+        self._entries: dict[str, _SecretEntry] = {}
+        self._refreshing: set[str] = set()
+        # secret name -> lock held by the caller fetching it
+        self._fetching: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "refreshes": 0, "errors": 0, "stale_served": 0}
+        self._fetch_seconds_total = 0.0
+        self._fetch_seconds_max = 0.0
+        self._fetches = 0
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    session = boto3.Session(region_name=Config.AWS_REGION)
+                    self._client = session.client(service_name='secretsmanager')
+        return self._client
+
+    def _fetch(self, secret_name: str, ttl: float) -> Any:
+        started = self._clock()
+        try:
+            value = SecretsManager.get_secret(secret_name, client=self.client)
+        finally:
+            elapsed = self._clock() - started
+            with self._lock:
+                self._fetches += 1
+                self._fetch_seconds_total += elapsed
+                self._fetch_seconds_max = max(self._fetch_seconds_max, elapsed)
+        with self._lock:
+            self._entries[secret_name] = _SecretEntry(value, ttl, self._clock() + ttl)
+        return value
+
+    def _refresh(self, secret_name: str, ttl: float) -> None:
+        try:
+            self._fetch(secret_name, ttl)
+            with self._lock:
+                self._stats["refreshes"] += 1
+        except awsExceptions.SecretsManagerServiceError as e:
+            # The current value stays until it expires
+            with self._lock:
+                self._stats["errors"] += 1
+            logger.warning(f"Background refresh of secret {secret_name} failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(secret_name)
+
+    def _serve(self, secret_name: str, entry: Optional[_SecretEntry], now: float) -> tuple[bool, Any]:
+        """
+        Look up an entry under self._lock: (True, value) when it can be
+        served without a fetch, starting a background refresh if it is
+        close to expiring.
+        """
+        if entry is None:
+            return False, None
+        if now < entry.expires_at:
+            self._stats["hits"] += 1
+            refresh_ahead = min(self.refresh_ahead_seconds, entry.ttl * self.REFRESH_AHEAD_MAX_FRACTION)
+            if now >= entry.expires_at - refresh_ahead and secret_name not in self._refreshing:
+                self._refreshing.add(secret_name)
+                threading.Thread(
+                    target=self._refresh, args=(secret_name, entry.ttl),
+                    name=f"secret-refresh-{secret_name}", daemon=True
+                ).start()
+            return True, entry.value
+        if now < entry.retry_at and now < entry.expires_at + self.max_stale_seconds:
+            # Backing off after a failed fetch
+            self._stats["stale_served"] += 1
+            return True, entry.value
+        return False, None
+
+    def get(self, secret_name: str, ttl_seconds: Optional[float] = None) -> Any:
+        """
+        Return a secret, from memory when possible.
+
+        Args:
+            secret_name (str): The name or ARN of the secret
+            ttl_seconds (float | None): Lifetime of this secret (default: the
+                TTL it was last fetched with, else the cache TTL)
+
+        Returns:
+            str | bytes: The secret value
+
+        Raises:
+            SecretsManagerServiceError: If the secret cannot be fetched and
+                there is no value recent enough to fall back on
+        """
+        with self._lock:
+            served, value = self._serve(secret_name, self._entries.get(secret_name), self._clock())
+            if served:
+                return value
+            self._stats["misses"] += 1
+            fetching = self._fetching.setdefault(secret_name, threading.Lock())
+
+        with fetching:
+            now = self._clock()
+            with self._lock:
+                entry = self._entries.get(secret_name)
+                # Another caller fetched it (or failed and set a backoff)
+                # while this one waited
+                if entry is not None and (now < entry.expires_at or now < entry.retry_at):
+                    if now < entry.expires_at + self.max_stale_seconds:
+                        return entry.value
+            if ttl_seconds is None:
+                ttl_seconds = entry.ttl if entry is not None else self.ttl_seconds
+
+            try:
+                return self._fetch(secret_name, ttl_seconds)
+            except awsExceptions.SecretsManagerServiceError:
+                with self._lock:
+                    self._stats["errors"] += 1
+                    if entry is not None and now < entry.expires_at + self.max_stale_seconds:
+                        entry.failures += 1
+                        entry.retry_at = now + min(
+                            self.retry_base_seconds * 2 ** (entry.failures - 1), self.retry_max_seconds
+                        )
+                        self._stats["stale_served"] += 1
+                        logger.warning(f"Serving stale value of secret {secret_name} after a failed fetch")
+                        return entry.value
+                raise
+
+    def invalidate(self, secret_name: Optional[str] = None) -> None:
+        """
+        Drop one secret (e.g. after rotating it), or every secret.
+        """
+        with self._lock:
+            if secret_name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(secret_name, None)
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss counters, the hit rate and the fetch latency.
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                "fetches": self._fetches,
+                "fetch_seconds_avg": self._fetch_seconds_total / self._fetches if self._fetches else 0.0,
+                "fetch_seconds_max": self._fetch_seconds_max,
+            }
+
+
+secret_cache = SecretCache()
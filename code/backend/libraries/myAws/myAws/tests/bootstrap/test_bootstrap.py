@@ -0,0 +1,106 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from myAws.bootstrap import SecretStore, LazySecret, LazyValue
+from myAws.secrets_manager import SecretCache, secret_cache
+from myExceptions import boot as bootExceptions
+
+
+@pytest.fixture
+def store():
+    return SecretStore()
+
+
+@pytest.fixture
+def mock_get_secret():
+    with patch.object(secret_cache, 'get') as mock_get_secret:
+        mock_get_secret.side_effect = lambda secret_name: f"value-of-{secret_name}"
+        yield mock_get_secret
+
+
+def make_config(store):
+    class Config:
+        JWT_SECRET_KEY = LazySecret("JWT_SECRET_KEY", store=store)
+        CREDENTIALS = LazySecret("DB_CREDENTIALS", parse=json.loads, store=store)
+        USER = LazyValue(lambda config: config.CREDENTIALS["username"])
+        MISSING = LazySecret(None, store=store)
+    return Config
+
+
+def test_declaring_secrets_does_not_fetch_them(store, mock_get_secret):
+    make_config(store)
+    mock_get_secret.assert_not_called()
+
+
+def test_injected_values_are_used(store, mock_get_secret):
+    Config = make_config(store)
+    store.inject({"JWT_SECRET_KEY": "injected", "DB_CREDENTIALS": '{"username": "zartex"}'})
+
+    assert Config.JWT_SECRET_KEY == "injected"
+    assert Config.USER == "zartex"
+    mock_get_secret.assert_not_called()
+
+
+def test_unresolved_secret_is_fetched_once_on_access(store, mock_get_secret):
+    Config = make_config(store)
+    assert Config.JWT_SECRET_KEY == "value-of-JWT_SECRET_KEY"
+    assert Config.JWT_SECRET_KEY == "value-of-JWT_SECRET_KEY"
+    mock_get_secret.assert_called_once_with("JWT_SECRET_KEY")
+
+
+def test_missing_secret_name(store):
+    Config = make_config(store)
+    with pytest.raises(bootExceptions.ConfigurationError):
+        Config.MISSING
+
+
+def test_resolve_all_fetches_registered_secrets_concurrently(store, mock_get_secret):
+    make_config(store)
+    store.inject({"DB_CREDENTIALS": "{}"})
+    in_flight, peak = 0, 0
+    lock = threading.Lock()
+
+    def slow_get_secret(secret_name):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return f"value-of-{secret_name}"
+    mock_get_secret.side_effect = slow_get_secret
+
+    for index in range(4):
+        store.register(f"SECRET_{index}")
+    asyncio.run(store.resolve_all())
+
+    # Injected secrets are not fetched
+    assert sorted(call.args[0] for call in mock_get_secret.call_args_list) == [
+        "JWT_SECRET_KEY", "SECRET_0", "SECRET_1", "SECRET_2", "SECRET_3"
+    ]
+    assert peak > 1
+    assert store.get("SECRET_2") == "value-of-SECRET_2"
+
+
+def test_clear_forgets_values(store, mock_get_secret):
+    Config = make_config(store)
+    store.inject({"JWT_SECRET_KEY": "injected"})
+    store.clear()
+    assert Config.JWT_SECRET_KEY == "value-of-JWT_SECRET_KEY"
+
+
+def test_fetches_share_the_cache_client():
+    client = MagicMock()
+    client.get_secret_value.side_effect = lambda SecretId: {'SecretString': f"value-of-{SecretId}"}
+    store = SecretStore(cache=SecretCache(client=client))
+    store.register("A")
+    store.register("B")
+
+    asyncio.run(store.resolve_all())
+
+    assert store.get("A") == "value-of-A"
+    assert client.get_secret_value.call_count == 2
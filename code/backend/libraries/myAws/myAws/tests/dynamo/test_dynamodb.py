@@ -4,6 +4,15 @@ from myAws.dynamodb import DynamoDB
 from myExceptions import aws as awsExceptions
 
 
+@pytest.fixture(autouse=True)
+def reset_cached_resources():
+    """
+    DynamoDB caches its resource and table handles; start every test without them.
+    """
+    DynamoDB.reset()
+    yield
+    DynamoDB.reset()
+
 # Fixtures for mocking boto3 resource and Config.AWS_REGION
 @pytest.fixture
 def mock_boto3_resource():
@@ -240,3 +249,219 @@ def test_get_item_invalid_key(mock_boto3_resource, mock_config_aws_region):
     mock_dynamodb_resource.Table.assert_called_once_with(table_name)
     mock_table.get_item.assert_called_once_with(Key=invalid_key)
     assert f"Error in aws.dynamodb: Error getting item with key: {invalid_key} from table: {table_name}. ValidationException: Key has null attribute" in str(exc_info.value)
+
+# Test Cases for the cached resource
+
+def test_resource_and_table_are_reused(mock_boto3_resource, mock_config_aws_region):
+    """
+    Test that repeated operations reuse one resource and table handle.
+    """
+    mock_dynamodb_resource = mock_boto3_resource.return_value
+    mock_table = mock_dynamodb_resource.Table.return_value
+    mock_table.get_item.return_value = {}
+
+    DynamoDB.put_item({'id': '1'}, 'test-table')
+    DynamoDB.get_item({'id': '1'}, 'test-table')
+    DynamoDB.get_item({'id': '1'}, 'test-table')
+
+    mock_boto3_resource.assert_called_once_with('dynamodb', region_name='mx-central-1')
+    mock_dynamodb_resource.Table.assert_called_once_with('test-table')
+
+# Test Cases for DynamoDB.batch_get
+
+@pytest.fixture
+def no_backoff():
+    with patch.object(DynamoDB, '_sleep') as mock_sleep:
+        yield mock_sleep
+
+def test_batch_get_chunks_and_deduplicates(mock_boto3_resource, mock_config_aws_region, no_backoff):
+    """
+    Test that batch_get splits keys into chunks of 100 and drops duplicates.
+    """
+    mock_dynamodb_resource = mock_boto3_resource.return_value
+    mock_dynamodb_resource.batch_get_item.side_effect = lambda RequestItems: {
+        'Responses': {'test-table': [dict(key, found=True) for key in RequestItems['test-table']['Keys']]}
+    }
+    keys = [{'id': str(i)} for i in range(250)] + [{'id': '0'}]
+
+    items = DynamoDB.batch_get(keys, 'test-table', projection='id')
+
+    assert sorted(item['id'] for item in items) == sorted(str(i) for i in range(250))
+    sizes = sorted(len(call.kwargs['RequestItems']['test-table']['Keys']) for call in mock_dynamodb_resource.batch_get_item.call_args_list)
+    assert sizes == [50, 100, 100]
+    request = mock_dynamodb_resource.batch_get_item.call_args.kwargs['RequestItems']['test-table']
+    assert request['ProjectionExpression'] == 'id' and request['ConsistentRead'] is False
+
+def test_batch_get_retries_unprocessed_keys(mock_boto3_resource, mock_config_aws_region, no_backoff):
+    """
+    Test that unprocessed keys are requested again after a backoff.
+    """
+    mock_dynamodb_resource = mock_boto3_resource.return_value
+    mock_dynamodb_resource.batch_get_item.side_effect = [
+        {'Responses': {'test-table': [{'id': '1'}]}, 'UnprocessedKeys': {'test-table': {'Keys': [{'id': '2'}]}}},
+        {'Responses': {'test-table': [{'id': '2'}]}, 'UnprocessedKeys': {}},
+    ]
+
+    items = DynamoDB.batch_get([{'id': '1'}, {'id': '2'}], 'test-table')
+
+    assert items == [{'id': '1'}, {'id': '2'}]
+    assert mock_dynamodb_resource.batch_get_item.call_args.kwargs['RequestItems'] == {'test-table': {'Keys': [{'id': '2'}]}}
+    no_backoff.assert_called_once()
+
+def test_batch_get_gives_up_after_max_attempts(mock_boto3_resource, mock_config_aws_region, no_backoff):
+    """
+    Test that batch_get raises DynamoDBServiceError when keys stay unprocessed.
+    """
+    mock_dynamodb_resource = mock_boto3_resource.return_value
+    mock_dynamodb_resource.batch_get_item.return_value = {
+        'Responses': {}, 'UnprocessedKeys': {'test-table': {'Keys': [{'id': '1'}]}}
+    }
+
+    with patch('myAws.dynamodb.Config.DYNAMODB_BATCH_MAX_ATTEMPTS', 3):
+        with pytest.raises(awsExceptions.DynamoDBServiceError) as exc_info:
+            DynamoDB.batch_get([{'id': '1'}], 'test-table')
+
+    assert mock_dynamodb_resource.batch_get_item.call_count == 3
+    assert "Error in aws.dynamodb: Error batch getting 1 keys from table: test-table" in str(exc_info.value)
+
+# Test Cases for DynamoDB.batch_write
+
+def test_batch_write_chunks_puts_and_deletes(mock_boto3_resource, mock_config_aws_region, no_backoff):
+    """
+    Test that batch_write sends puts and deletes in chunks of 25.
+    """
+    mock_dynamodb_resource = mock_boto3_resource.return_value
+    mock_dynamodb_resource.batch_write_item.return_value = {'UnprocessedItems': {}}
+
+    DynamoDB.batch_write('test-table', items=[{'id': str(i)} for i in range(40)], delete_keys=[{'id': 'x'}])
+
+    requests = [call.kwargs['RequestItems']['test-table'] for call in mock_dynamodb_resource.batch_write_item.call_args_list]
+    assert sorted(len(chunk) for chunk in requests) == [16, 25]
+    assert {'DeleteRequest': {'Key': {'id': 'x'}}} in [request for chunk in requests for request in chunk]
+
+def test_batch_write_retries_unprocessed_items(mock_boto3_resource, mock_config_aws_region, no_backoff):
+    """
+    Test that unprocessed items are written again after a backoff.
+    """
+    mock_dynamodb_resource = mock_boto3_resource.return_value
+    unprocessed = {'test-table': [{'PutRequest': {'Item': {'id': '2'}}}]}
+    mock_dynamodb_resource.batch_write_item.side_effect = [{'UnprocessedItems': unprocessed}, {'UnprocessedItems': {}}]
+
+    DynamoDB.batch_write('test-table', items=[{'id': '1'}, {'id': '2'}])
+
+    assert mock_dynamodb_resource.batch_write_item.call_args.kwargs['RequestItems'] == unprocessed
+    no_backoff.assert_called_once()
+
+def test_batch_write_exception(mock_boto3_resource, mock_config_aws_region, no_backoff):
+    """
+    Test that batch_write raises DynamoDBServiceError when a request fails.
+    """
+    mock_boto3_resource.return_value.batch_write_item.side_effect = Exception("Throughput exceeded")
+
+    with pytest.raises(awsExceptions.DynamoDBServiceError) as exc_info:
+        DynamoDB.batch_write('test-table', items=[{'id': '1'}])
+    assert "Error batch writing 1 requests into table: test-table. Throughput exceeded" in str(exc_info.value)
+
+# Test Cases for DynamoDB.query, DynamoDB.scan and DynamoDB.parallel_scan
+
+class PagedTable:
+    """
+    Stand-in for a DynamoDB table that paginates like the service: Limit
+    items per page, LastEvaluatedKey / ExclusiveStartKey, and Segment /
+    TotalSegments splitting the items between parallel scanners.
+    """
+
+    def __init__(self, items):
+        self.items = items
+        self.requests = []
+
+    def _page(self, items, Limit=None, ExclusiveStartKey=None, **params):
+        self.requests.append(dict(params, Limit=Limit, ExclusiveStartKey=ExclusiveStartKey))
+        start = 0 if ExclusiveStartKey is None else ExclusiveStartKey['id'] + 1
+        remaining = [item for item in items if item['id'] >= start]
+        page = remaining[:Limit] if Limit else remaining
+        response = {'Items': page}
+        if Limit and len(remaining) > Limit:
+            response['LastEvaluatedKey'] = {'id': page[-1]['id']}
+        return response
+
+    def query(self, **params):
+        return self._page(self.items, **params)
+
+    def scan(self, Segment=None, TotalSegments=None, **params):
+        items = self.items
+        if TotalSegments:
+            items = [item for item in items if item['id'] % TotalSegments == Segment]
+        return self._page(items, Segment=Segment, TotalSegments=TotalSegments, **params)
+
+
+@pytest.fixture
+def paged_table(mock_boto3_resource, mock_config_aws_region):
+    table = PagedTable([{'id': i, 'name': f'item-{i}'} for i in range(25)])
+    mock_boto3_resource.return_value.Table.return_value = table
+    return table
+
+def test_query_follows_last_evaluated_key_lazily(paged_table):
+    """
+    Test that query requests a page only when the previous one is consumed.
+    """
+    items = DynamoDB.query('test-table', key_condition='client_id = :id', projection='id, #n', page_size=10)
+    assert paged_table.requests == []
+
+    first = [next(items) for _ in range(10)]
+    assert [item['id'] for item in first] == list(range(10))
+    assert len(paged_table.requests) == 1
+
+    rest = list(items)
+    assert [item['id'] for item in rest] == list(range(10, 25))
+    assert [request['ExclusiveStartKey'] for request in paged_table.requests] == [None, {'id': 9}, {'id': 19}]
+    assert paged_table.requests[0]['KeyConditionExpression'] == 'client_id = :id'
+    assert paged_table.requests[0]['ProjectionExpression'] == 'id, #n'
+
+def test_query_limit_stops_reading(paged_table):
+    """
+    Test that query stops requesting pages once limit items are returned.
+    """
+    items = list(DynamoDB.query('test-table', key_condition='client_id = :id', page_size=10, limit=12))
+
+    assert len(items) == 12
+    assert len(paged_table.requests) == 2
+
+def test_scan_streams_every_page(paged_table):
+    """
+    Test that scan returns every item across pages.
+    """
+    items = list(DynamoDB.scan('test-table', page_size=7))
+
+    assert [item['id'] for item in items] == list(range(25))
+    assert len(paged_table.requests) == 4
+
+def test_scan_exception(mock_boto3_resource, mock_config_aws_region):
+    """
+    Test that scan raises DynamoDBServiceError when a page request fails.
+    """
+    mock_boto3_resource.return_value.Table.return_value.scan.side_effect = Exception("Throttled")
+
+    with pytest.raises(awsExceptions.DynamoDBServiceError) as exc_info:
+        list(DynamoDB.scan('test-table'))
+    assert 'Error scanning table: test-table. Throttled' in str(exc_info.value)
+
+def test_parallel_scan_merges_segments(paged_table):
+    """
+    Test that parallel_scan returns each item once, reading every segment.
+    """
+    items = list(DynamoDB.parallel_scan('test-table', segments=3, page_size=4))
+
+    assert sorted(item['id'] for item in items) == list(range(25))
+    assert {request['Segment'] for request in paged_table.requests} == {0, 1, 2}
+    assert {request['TotalSegments'] for request in paged_table.requests} == {3}
+
+def test_parallel_scan_propagates_segment_errors(mock_boto3_resource, mock_config_aws_region):
+    """
+    Test that a failing segment surfaces as DynamoDBServiceError.
+    """
+    mock_boto3_resource.return_value.Table.return_value.scan.side_effect = Exception("Segment failed")
+
+    with pytest.raises(awsExceptions.DynamoDBServiceError) as exc_info:
+        list(DynamoDB.parallel_scan('test-table', segments=2))
+    assert 'Segment failed' in str(exc_info.value)
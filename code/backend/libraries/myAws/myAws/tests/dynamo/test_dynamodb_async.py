@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import pytest
+from unittest.mock import patch, MagicMock
+from myAws.dynamodb import DynamoDB
+from myAws.dynamodb_async import AsyncDynamoDB
+from myAws.item_cache import ItemCache
+from myExceptions import aws as awsExceptions
+
+
+@pytest.fixture
+def table():
+    table = MagicMock()
+    with patch('myAws.dynamodb.boto3.resource') as mock_resource, \
+            patch.object(DynamoDB, 'item_cache', ItemCache(table_ttls={'settings': 60})):
+        mock_resource.return_value.Table.return_value = table
+        DynamoDB.reset()
+        yield table
+    DynamoDB.reset()
+
+@pytest.fixture
+def client():
+    client = AsyncDynamoDB(max_workers=4, latency_window=16)
+    yield client
+    client.shutdown()
+
+# Test Cases for AsyncDynamoDB
+
+def test_get_item_runs_off_the_event_loop(table, client):
+    """
+    Test that get_item calls boto3 on a pool thread, not on the loop thread.
+    """
+    threads = []
+
+    def get_item(Key):
+        threads.append(threading.current_thread().name)
+        return {'Item': {'id': Key['id']}}
+    table.get_item.side_effect = get_item
+
+    async def main():
+        return await client.get_item({'id': 'a'}, 'orders'), threading.current_thread().name
+
+    item, loop_thread = asyncio.run(main())
+
+    assert item == {'id': 'a'}
+    assert threads[0].startswith('dynamodb') and threads[0] != loop_thread
+
+def test_get_item_cache_hit_skips_the_pool(table, client):
+    """
+    Test that a cached item is returned without another request.
+    """
+    table.get_item.return_value = {'Item': {'id': 'a'}}
+
+    async def main():
+        await client.get_item({'id': 'a'}, 'settings')
+        return await client.get_item({'id': 'a'}, 'settings')
+
+    assert asyncio.run(main()) == {'id': 'a'}
+    assert table.get_item.call_count == 1
+    assert client.stats()['get_item']['calls'] == 1
+
+def test_put_and_batch_operations(table, client):
+    """
+    Test that put_item, batch_get and batch_write reach boto3.
+    """
+    resource = DynamoDB.resource()
+    resource.batch_get_item.return_value = {'Responses': {'orders': [{'id': 'a'}]}}
+    resource.batch_write_item.return_value = {}
+
+    async def main():
+        await client.put_item({'id': 'a'}, 'orders')
+        items = await client.batch_get([{'id': 'a'}], 'orders')
+        await client.batch_write('orders', items=[{'id': 'b'}])
+        return items
+
+    assert asyncio.run(main()) == [{'id': 'a'}]
+    table.put_item.assert_called_once_with(Item={'id': 'a'})
+    assert set(client.stats()) == {'put_item', 'batch_get', 'batch_write'}
+
+def test_query_follows_pages(table, client):
+    """
+    Test that query yields the items of every page, one request per page.
+    """
+    table.query.side_effect = [
+        {'Items': [{'id': 1}, {'id': 2}], 'LastEvaluatedKey': {'id': 2}},
+        {'Items': [{'id': 3}]},
+    ]
+
+    async def main():
+        return [item async for item in client.query('orders', key_condition='client_id = :id', page_size=2)]
+
+    assert asyncio.run(main()) == [{'id': 1}, {'id': 2}, {'id': 3}]
+    assert table.query.call_args_list[1].kwargs['ExclusiveStartKey'] == {'id': 2}
+    assert client.stats()['query']['calls'] == 2
+
+def test_errors_are_recorded_and_raised(table, client):
+    """
+    Test that a failing operation raises DynamoDBServiceError and counts as an error.
+    """
+    table.scan.side_effect = Exception("Throttled")
+
+    async def main():
+        return [item async for item in client.scan('orders')]
+
+    with pytest.raises(awsExceptions.DynamoDBServiceError) as exc_info:
+        asyncio.run(main())
+    assert 'Error scanning table: orders. Throttled' in str(exc_info.value)
+    assert client.stats()['scan']['errors'] == 1
+    assert client.stats()['scan']['p99_ms'] >= 0
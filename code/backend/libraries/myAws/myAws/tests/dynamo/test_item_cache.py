@@ -0,0 +1,152 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from myAws.dynamodb import DynamoDB
+from myAws.item_cache import ItemCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def cache(clock):
+    return ItemCache(table_ttls={'settings': 60}, negative_ttl_seconds=5, max_entries=3, clock=clock)
+
+def loader(item):
+    load = MagicMock(return_value=item)
+    return load
+
+# Test Cases for ItemCache
+
+def test_hit_within_ttl_and_reload_after(cache, clock):
+    """
+    Test that an item is loaded once per TTL.
+    """
+    load = loader({'id': 'a', 'value': 1})
+
+    assert cache.get('settings', {'id': 'a'}, load) == {'id': 'a', 'value': 1}
+    assert cache.get('settings', {'id': 'a'}, load) == {'id': 'a', 'value': 1}
+    assert load.call_count == 1
+
+    clock.now += 61
+    cache.get('settings', {'id': 'a'}, load)
+    assert load.call_count == 2
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
+
+def test_unconfigured_table_reads_through(cache):
+    """
+    Test that tables without a TTL are never cached.
+    """
+    load = loader({'id': 'a'})
+
+    cache.get('orders', {'id': 'a'}, load)
+    cache.get('orders', {'id': 'a'}, load)
+
+    assert load.call_count == 2
+    assert cache.stats()['size'] == 0
+
+def test_negative_caching_uses_negative_ttl(cache, clock):
+    """
+    Test that a missing item is cached for the negative TTL only.
+    """
+    load = loader(None)
+
+    assert cache.get('settings', {'id': 'missing'}, load) is None
+    assert cache.get('settings', {'id': 'missing'}, load) is None
+    assert load.call_count == 1
+    assert cache.stats()['negative_hits'] == 1
+
+    clock.now += 6
+    cache.get('settings', {'id': 'missing'}, load)
+    assert load.call_count == 2
+
+def test_returns_copies(cache):
+    """
+    Test that modifying a returned item does not modify the cached one.
+    """
+    cache.get('settings', {'id': 'a'}, loader({'id': 'a', 'tags': ['x']}))['tags'].append('y')
+
+    assert cache.get('settings', {'id': 'a'}, loader(None)) == {'id': 'a', 'tags': ['x']}
+
+def test_lru_eviction(cache):
+    """
+    Test that the least recently used entry is evicted beyond max_entries.
+    """
+    for name in ('a', 'b', 'c'):
+        cache.get('settings', {'id': name}, loader({'id': name}))
+    cache.get('settings', {'id': 'a'}, loader(None))
+    cache.get('settings', {'id': 'd'}, loader({'id': 'd'}))
+
+    load = loader({'id': 'b'})
+    cache.get('settings', {'id': 'b'}, load)
+    assert load.call_count == 1
+    assert cache.stats()['evictions'] == 2
+
+def test_invalidate_item_uses_learnt_key_attributes(cache):
+    """
+    Test that writing an item drops its cached copy, whatever its other attributes.
+    """
+    cache.get('settings', {'id': 'a'}, loader({'id': 'a', 'value': 1}))
+    cache.invalidate_item('settings', {'id': 'a', 'value': 2})
+
+    load = loader({'id': 'a', 'value': 2})
+    assert cache.get('settings', {'id': 'a'}, load) == {'id': 'a', 'value': 2}
+    assert load.call_count == 1
+
+def test_read_racing_a_write_is_not_stored(cache):
+    """
+    Test that a read started before an invalidation does not cache its stale result.
+    """
+    def stale_load():
+        cache.invalidate_item('settings', {'id': 'a', 'value': 2})
+        return {'id': 'a', 'value': 1}
+
+    cache.get('settings', {'id': 'b'}, loader({'id': 'b'}))
+    cache.get('settings', {'id': 'a'}, stale_load)
+
+    load = loader({'id': 'a', 'value': 2})
+    assert cache.get('settings', {'id': 'a'}, load) == {'id': 'a', 'value': 2}
+    assert load.call_count == 1
+
+# Test Cases for the cache in DynamoDB.get_item and DynamoDB.put_item
+
+@pytest.fixture
+def cached_table(cache):
+    table = MagicMock()
+    table.get_item.return_value = {'Item': {'id': 'a', 'value': 1}}
+    with patch('myAws.dynamodb.boto3.resource') as mock_resource, patch.object(DynamoDB, 'item_cache', cache):
+        mock_resource.return_value.Table.return_value = table
+        DynamoDB.reset()
+        yield table
+    DynamoDB.reset()
+
+def test_get_item_is_read_through(cached_table):
+    """
+    Test that get_item reads a cached table once, and again after put_item.
+    """
+    assert DynamoDB.get_item({'id': 'a'}, 'settings') == {'id': 'a', 'value': 1}
+    assert DynamoDB.get_item({'id': 'a'}, 'settings') == {'id': 'a', 'value': 1}
+    assert cached_table.get_item.call_count == 1
+
+    DynamoDB.put_item({'id': 'a', 'value': 2}, 'settings')
+    cached_table.get_item.return_value = {'Item': {'id': 'a', 'value': 2}}
+    assert DynamoDB.get_item({'id': 'a'}, 'settings') == {'id': 'a', 'value': 2}
+    assert cached_table.get_item.call_count == 2
+
+def test_get_item_cached_false_forces_a_read(cached_table):
+    """
+    Test that cached=False bypasses a fresh cached copy.
+    """
+    DynamoDB.get_item({'id': 'a'}, 'settings')
+    DynamoDB.get_item({'id': 'a'}, 'settings', cached=False)
+
+    assert cached_table.get_item.call_count == 2
@@ -0,0 +1,143 @@
+import io
+import threading
+import pytest
+from botocore.exceptions import ClientError
+from myAws.s3 import S3ObjectCache
+from myExceptions import aws as awsExceptions
+
+
+class FakeS3:
+    """
+    get_object of an in-memory bucket, honouring If-None-Match like S3.
+    """
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.calls = []
+        self.gate = None
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None):
+        self.calls.append((Key, IfNoneMatch))
+        if self.gate is not None:
+            self.gate.wait(5)
+        if Key not in self.objects:
+            raise ClientError({'Error': {'Code': 'NoSuchKey'}, 'ResponseMetadata': {'HTTPStatusCode': 404}}, 'GetObject')
+        body = self.objects[Key]
+        etag = f'"{hash(body)}"'
+        if IfNoneMatch == etag:
+            raise ClientError({'Error': {'Code': '304'}, 'ResponseMetadata': {'HTTPStatusCode': 304}}, 'GetObject')
+        return {'Body': io.BytesIO(body), 'ETag': etag}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def s3():
+    return FakeS3({'a.png': b'a' * 100, 'b.png': b'b' * 100, 'c.png': b'c' * 100})
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def cache(tmp_path, s3, clock):
+    return S3ObjectCache(directory=str(tmp_path), max_bytes=250, revalidate_after_seconds=60, client=s3, clock=clock)
+
+# Test Cases for S3ObjectCache
+
+def test_read_downloads_once(cache, s3):
+    """
+    Test that a fresh object is served from disk.
+    """
+    assert cache.read('bucket', 'a.png') == b'a' * 100
+    assert cache.read('bucket', 'a.png') == b'a' * 100
+
+    assert len(s3.calls) == 1
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['bytes'] == 100
+
+def test_stale_object_is_revalidated_with_etag(cache, s3, clock):
+    """
+    Test that an unchanged object costs a 304, and a changed one is downloaded again.
+    """
+    cache.read('bucket', 'a.png')
+    clock.now += 61
+    assert cache.read('bucket', 'a.png') == b'a' * 100
+    assert s3.calls[1][1] is not None
+    assert cache.stats()['revalidations'] == 1
+
+    s3.objects['a.png'] = b'new'
+    clock.now += 61
+    assert cache.read('bucket', 'a.png') == b'new'
+    assert cache.stats()['downloads'] == 2
+    assert cache.stats()['bytes'] == 3
+
+def test_lru_eviction_under_byte_budget(cache, s3, tmp_path):
+    """
+    Test that the least recently used objects are deleted beyond max_bytes.
+    """
+    cache.read('bucket', 'a.png')
+    cache.read('bucket', 'b.png')
+    cache.read('bucket', 'a.png')
+    cache.read('bucket', 'c.png')
+
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] == 200
+    assert len(list(tmp_path.glob('*.meta'))) == 2
+    cache.read('bucket', 'b.png')
+    assert [call[0] for call in s3.calls] == ['a.png', 'b.png', 'c.png', 'b.png']
+
+def test_index_survives_restart(cache, s3, tmp_path, clock):
+    """
+    Test that a new cache over the same directory reuses the stored objects after revalidating them.
+    """
+    cache.read('bucket', 'a.png')
+
+    restarted = S3ObjectCache(directory=str(tmp_path), max_bytes=250, revalidate_after_seconds=60, client=s3, clock=clock)
+    assert restarted.read('bucket', 'a.png') == b'a' * 100
+    assert restarted.stats()['revalidations'] == 1
+    assert restarted.stats()['downloads'] == 0
+
+def test_concurrent_requests_share_one_download(cache, s3):
+    """
+    Test that threads asking for the same object wait for a single download.
+    """
+    s3.gate = threading.Event()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.read('bucket', 'a.png'))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while cache.stats()['shared'] < 4:
+        pass
+    s3.gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [b'a' * 100] * 5
+    assert len(s3.calls) == 1
+
+def test_copy_to(cache, tmp_path):
+    """
+    Test that copy_to writes the object to the target path.
+    """
+    target = tmp_path / 'out'
+    target.mkdir()
+    cache.copy_to('bucket', 'b.png', str(target / 'b.png'))
+
+    assert (target / 'b.png').read_bytes() == b'b' * 100
+
+def test_missing_object_raises(cache):
+    """
+    Test that a failed download raises S3ServiceError and caches nothing.
+    """
+    with pytest.raises(awsExceptions.S3ServiceError) as exc_info:
+        cache.read('bucket', 'missing.png')
+
+    assert 'Error fetching object: missing.png' in str(exc_info.value)
+    assert cache.stats()['entries'] == 0
@@ -0,0 +1,178 @@
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from myAws.secrets_manager import SecretCache
+from myExceptions import aws as awsExceptions
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.get_secret_value.side_effect = lambda SecretId: {'SecretString': f"{SecretId}-v{client.get_secret_value.call_count}"}
+    return client
+
+
+@pytest.fixture
+def cache(client, clock):
+    return SecretCache(ttl_seconds=300, refresh_ahead_seconds=60, max_stale_seconds=600, client=client, clock=clock)
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.005)
+
+
+def test_fresh_entry_is_served_from_memory(cache, client):
+    assert cache.get('db') == 'db-v1'
+    assert cache.get('db') == 'db-v1'
+
+    client.get_secret_value.assert_called_once_with(SecretId='db')
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['fetches']) == (1, 1, 1)
+    assert stats['hit_rate'] == 0.5
+
+
+def test_client_is_created_once_and_reused():
+    with patch('myAws.secrets_manager.boto3.Session') as mock_session:
+        mock_client = mock_session.return_value.client.return_value
+        mock_client.get_secret_value.return_value = {'SecretString': 'value'}
+        cache = SecretCache(ttl_seconds=0)
+
+        cache.get('a')
+        cache.get('b')
+
+    mock_session.assert_called_once()
+    assert mock_client.get_secret_value.call_count == 2
+
+
+def test_entry_close_to_expiry_is_refreshed_in_background(cache, client, clock):
+    cache.get('db')
+    clock.now += 250
+
+    # Still served immediately, the new value arrives in the background
+    assert cache.get('db') == 'db-v1'
+    wait_for(lambda: cache.stats()['refreshes'] == 1)
+    assert cache.get('db') == 'db-v2'
+    assert client.get_secret_value.call_count == 2
+
+
+def test_expired_entry_is_fetched_again(cache, client, clock):
+    cache.get('db')
+    clock.now += 301
+
+    assert cache.get('db') == 'db-v2'
+    assert cache.stats()['misses'] == 2
+
+
+def test_stale_value_is_served_when_fetch_fails(cache, client, clock):
+    cache.get('db')
+    clock.now += 301
+    client.get_secret_value.side_effect = Exception("throttled")
+
+    assert cache.get('db') == 'db-v1'
+    assert cache.stats()['stale_served'] == 1
+
+    # Past max_stale_seconds the error propagates
+    clock.now += 600
+    with pytest.raises(awsExceptions.SecretsManagerServiceError):
+        cache.get('db')
+
+
+def test_failed_fetch_backs_off_before_retrying(client, clock):
+    cache = SecretCache(ttl_seconds=300, max_stale_seconds=600, client=client, clock=clock,
+                        retry_base_seconds=1, retry_max_seconds=3)
+    cache.get('db')
+    clock.now += 301
+    client.get_secret_value.side_effect = Exception("throttled")
+
+    assert cache.get('db') == 'db-v1'
+    assert client.get_secret_value.call_count == 2
+    # Within the backoff the stale value is served without a network call
+    clock.now += 0.5
+    assert cache.get('db') == 'db-v1'
+    assert client.get_secret_value.call_count == 2
+
+    # The backoff doubles with each failure, up to the max
+    for wait in (1, 2, 3, 3):
+        clock.now += wait
+        assert cache.get('db') == 'db-v1'
+        clock.now += wait - 0.1
+        assert cache.get('db') == 'db-v1'
+    assert client.get_secret_value.call_count == 6
+    assert cache.stats()['stale_served'] == 10
+
+    client.get_secret_value.side_effect = lambda SecretId: {'SecretString': 'db-new'}
+    clock.now += 3
+    assert cache.get('db') == 'db-new'
+    clock.now += 10
+    assert cache.get('db') == 'db-new'
+    assert client.get_secret_value.call_count == 7
+
+
+def test_concurrent_misses_fetch_once(cache, client):
+    release = threading.Event()
+
+    def slow(SecretId):
+        release.wait(2)
+        return {'SecretString': 'value'}
+
+    client.get_secret_value.side_effect = slow
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('db'))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    wait_for(lambda: cache.stats()['misses'] == 5)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['value'] * 5
+    assert client.get_secret_value.call_count == 1
+
+
+def test_refresh_ahead_is_capped_to_a_fraction_of_the_ttl(cache, client, clock):
+    # refresh_ahead_seconds (60) exceeds this TTL: refresh starts at half of it
+    cache.get('short', ttl_seconds=10)
+    clock.now += 4
+    cache.get('short')
+    assert cache.stats()['refreshes'] == 0
+
+    clock.now += 2
+    cache.get('short')
+    wait_for(lambda: cache.stats()['refreshes'] == 1)
+    assert client.get_secret_value.call_count == 2
+
+
+def test_failure_without_previous_value_raises(cache, client):
+    client.get_secret_value.side_effect = Exception("not found")
+    with pytest.raises(awsExceptions.SecretsManagerServiceError):
+        cache.get('missing')
+    assert cache.stats()['errors'] == 1
+
+
+def test_per_secret_ttl_and_invalidate(cache, client, clock):
+    cache.get('short', ttl_seconds=10)
+    clock.now += 11
+    assert cache.get('short') == 'short-v2'
+    # The TTL stays with the secret without being passed again
+    clock.now += 11
+    assert cache.get('short') == 'short-v3'
+
+    cache.invalidate('short')
+    assert cache.get('short') == 'short-v4'
@@ -1 +1,2 @@
-from .auth import validate_is_authenticated, validate_is_admin
\ No newline at end of file
+from .auth import validate_is_authenticated, validate_is_admin, get_current_client, issue_token, revoke_tokens, token_claims
+from .principals import Principal, PrincipalStore, principal_store
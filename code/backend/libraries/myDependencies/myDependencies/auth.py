@@ -1,28 +1,80 @@
 from fastapi import HTTPException, Header, Depends
 from myEncryption import Encryption
-from myOrm import Client
-from sqlalchemy import select
+from myOrm import Client, client_by_id
 from jwt.exceptions import InvalidTokenError
 from sqlalchemy.ext.asyncio import AsyncSession
 from myOrm import get_db_session
+from .principals import Principal, principal_store
 
 
-async def validate_is_authenticated(
-        db_session: AsyncSession = Depends(get_db_session),
-        token: str = Header(...), 
-    ) -> Client:
+def token_claims(client: Client) -> dict:
+    """
+    Build the access token claims of a client.
+    """
+    return {"user_id": client.id, "is_admin": bool(client.is_admin), "ver": client.token_version or 0}
+
+
+def issue_token(client: Client) -> str:
+    """
+    Generate an access token for a client.
+    """
+    return Encryption.generate_token(token_claims(client))
+
+
+async def revoke_tokens(db_session: AsyncSession, client: Client) -> None:
+    """
+    Invalidate every token issued to a client, e.g. after an admin demotion
+    or a password change.
+
+    Bumps and commits the client's token version. This process stops
+    accepting the old tokens at once, other processes when their cached
+    principal expires (Config.PRINCIPAL_CACHE_TTL_SECONDS).
+    """
+    client.token_version = (client.token_version or 0) + 1
+    db_session.add(client)
+    await db_session.commit()
+    principal_store.invalidate(client.id)
+
+
+async def validate_is_authenticated(token: str = Header(...)) -> Principal:
+    """
+    Authenticate the request from its token claims.
+
+    The token version is checked against the principal store, which only
+    reads the database on a cache miss.
+
+    Raises:
+        HTTPException: 401 if the token is invalid, revoked or belongs to a deleted client
+    """
     try:
         payload = Encryption.verify_token(token)
-        result = await db_session.execute(select(Client).where(Client.id == payload["user_id"]))
-        user = result.scalar_one_or_none()
+        # Tokens issued before versioning carry no "ver": they count as version 0
+        user_id, version = int(payload["user_id"]), int(payload.get("ver", 0))
+    except (InvalidTokenError, KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=401, detail="Invalid token")
 
-        if not user: raise HTTPException(status_code=401, detail="Invalid token")
-        
-        return user
-    except InvalidTokenError:
+    principal = await principal_store.get(user_id)
+    if principal is None or principal.token_version != version:
         raise HTTPException(status_code=401, detail="Invalid token")
-    
-async def validate_is_admin(user: Client = Depends(validate_is_authenticated)):
+    return principal
+
+async def validate_is_admin(user: Principal = Depends(validate_is_authenticated)) -> Principal:
     if not user.is_admin:
         raise HTTPException(status_code=403, detail="You are not authorized to access this resource")
     return user
+
+async def get_current_client(
+        db_session: AsyncSession = Depends(get_db_session),
+        user: Principal = Depends(validate_is_authenticated),
+    ) -> Client:
+    """
+    Load the full row of the authenticated client, for the endpoints that
+    read or change it.
+
+    Raises:
+        HTTPException: 401 if the client no longer exists
+    """
+    client = await client_by_id.one_or_none(db_session, user.id)
+    if not client:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return client
@@ -0,0 +1,8 @@
+import os
+
+
+class Config:
+    # How long a process trusts its cached copy of a client's admin flag and
+    # token version; bounds how late a revocation is seen by other workers
+    PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv('PRINCIPAL_CACHE_TTL_SECONDS', 30))
+    PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv('PRINCIPAL_CACHE_MAX_ENTRIES', 100_000))
@@ -0,0 +1,104 @@
+from .config import Config
+from collections import OrderedDict
+from dataclasses import dataclass
+from myOrm.database import sessionmanager
+from myOrm.statements import client_by_id
+from typing import Awaitable, Callable, Optional
+import time
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated client, as far as authorization needs to know it.
+    """
+    id: int
+    is_admin: bool
+    token_version: int
+
+
+async def load_principal(client_id: int) -> Optional[Principal]:
+    """
+    Read the principal of a client from the database.
+
+    Returns:
+        Principal | None: None if the client does not exist
+    """
+    async with sessionmanager.session() as db_session:
+        client = await client_by_id.one_or_none(db_session, client_id)
+    if client is None:
+        return None
+    return Principal(id=client.id, is_admin=bool(client.is_admin), token_version=client.token_version or 0)
+
+
+class PrincipalStore:
+    """
+    Per-process TTL cache of principals, keyed by client id.
+
+    Tokens carry the client id, admin flag and token version; a token is
+    accepted when its version matches the stored one. Within the TTL that
+    comparison is made in memory, so authenticated requests do not touch
+    the database. Clients that do not exist are cached too (as None), so a
+    deleted account cannot be used to hammer the database.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = Config.PRINCIPAL_CACHE_TTL_SECONDS,
+        max_entries: int = Config.PRINCIPAL_CACHE_MAX_ENTRIES,
+        loader: Callable[[int], Awaitable[Optional[Principal]]] = load_principal,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._loader = loader
+        self._clock = clock
+        self._entries: OrderedDict[int, tuple[float, Optional[Principal]]] = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    async def get(self, client_id: int) -> Optional[Principal]:
+        """
+        Return the principal of a client, loading it on a miss.
+
+        Returns:
+            Principal | None: None if the client does not exist
+        """
+        entry = self._entries.get(client_id)
+        if entry is not None and self._clock() < entry[0]:
+            self._entries.move_to_end(client_id)
+            self._stats["hits"] += 1
+            return entry[1]
+
+        self._stats["misses"] += 1
+        principal = await self._loader(client_id)
+        self._entries[client_id] = (self._clock() + self.ttl_seconds, principal)
+        self._entries.move_to_end(client_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+        return principal
+
+    def invalidate(self, client_id: Optional[int] = None) -> None:
+        """
+        Drop the cached principal of a client (or of every client), so that
+        the next request of this process reads it again.
+        """
+        if client_id is None:
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+        elif self._entries.pop(client_id, None) is not None:
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss counters and the hit rate.
+        """
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+        }
+
+
+principal_store = PrincipalStore()
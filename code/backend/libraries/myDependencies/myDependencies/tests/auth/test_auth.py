@@ -1,7 +1,8 @@
 import pytest
 from fastapi import HTTPException
 from unittest.mock import AsyncMock, patch, MagicMock
-from myDependencies.auth import validate_is_authenticated, validate_is_admin
+from myDependencies.auth import validate_is_authenticated, validate_is_admin, revoke_tokens, token_claims
+from myDependencies.principals import Principal, PrincipalStore
 from myOrm import Client
 from jwt.exceptions import InvalidTokenError
 
@@ -20,65 +21,117 @@ def mock_client():
     client.is_admin = False
     return client
 
+@pytest.fixture
+def principals():
+    """Principals the store loads instead of reading the database"""
+    return {1: Principal(id=1, is_admin=False, token_version=0)}
+
+@pytest.fixture
+def mock_store(principals):
+    loader = AsyncMock(side_effect=lambda client_id: principals.get(client_id))
+    store = PrincipalStore(ttl_seconds=30, loader=loader)
+    with patch('myDependencies.auth.principal_store', store):
+        yield store
+
 @pytest.mark.asyncio
-async def test_validate_is_authenticated_success(mock_db_session, mock_client):
+async def test_validate_is_authenticated_success(mock_store):
     # Arrange
     valid_token = "valid_token"
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = mock_client
-    mock_db_session.execute.return_value = mock_result
-    
-    async def mock_db_gen():
-        yield mock_db_session
 
     with patch('myDependencies.auth.Encryption.verify_token') as mock_verify:
-        mock_verify.return_value = {"user_id": 1}
-        
+        mock_verify.return_value = {"user_id": 1, "is_admin": False, "ver": 0}
+
         # Act
-        result = await validate_is_authenticated(token=valid_token, db_async_gen=mock_db_gen())
-        
+        result = await validate_is_authenticated(token=valid_token)
+        await validate_is_authenticated(token=valid_token)
+
         # Assert
-        assert result == mock_client
-        mock_verify.assert_called_once_with(valid_token)
-        mock_db_session.execute.assert_called_once()
+        assert result == Principal(id=1, is_admin=False, token_version=0)
+        mock_verify.assert_called_with(valid_token)
+        # The second request is served from the store
+        mock_store._loader.assert_awaited_once_with(1)
 
 @pytest.mark.asyncio
-async def test_validate_is_authenticated_invalid_token(mock_db_session):
+async def test_validate_is_authenticated_invalid_token(mock_store):
     # Arrange
     invalid_token = "invalid_token"
-    
-    async def mock_db_gen():
-        yield mock_db_session
 
     with patch('myDependencies.auth.Encryption.verify_token') as mock_verify:
         mock_verify.side_effect = InvalidTokenError()
-        
+
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
-            await validate_is_authenticated(token=invalid_token, db_async_gen=mock_db_gen())
+            await validate_is_authenticated(token=invalid_token)
         assert exc_info.value.status_code == 401
         assert exc_info.value.detail == "Invalid token"
 
 @pytest.mark.asyncio
-async def test_validate_is_authenticated_user_not_found(mock_db_session):
+async def test_validate_is_authenticated_missing_claims(mock_store):
+    with patch('myDependencies.auth.Encryption.verify_token') as mock_verify:
+        mock_verify.return_value = {"is_admin": False, "ver": 0}
+
+        with pytest.raises(HTTPException) as exc_info:
+            await validate_is_authenticated(token="broken_token")
+        assert exc_info.value.status_code == 401
+        mock_store._loader.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_validate_is_authenticated_unversioned_token(mock_store, principals):
+    with patch('myDependencies.auth.Encryption.verify_token') as mock_verify:
+        # Issued before token versions: valid until the client's tokens are revoked
+        mock_verify.return_value = {"user_id": 1}
+        assert await validate_is_authenticated(token="legacy_token") == principals[1]
+
+        principals[1] = Principal(id=1, is_admin=False, token_version=1)
+        mock_store.invalidate(1)
+        with pytest.raises(HTTPException) as exc_info:
+            await validate_is_authenticated(token="legacy_token")
+        assert exc_info.value.status_code == 401
+
+@pytest.mark.asyncio
+async def test_validate_is_authenticated_user_not_found(mock_store):
     # Arrange
     valid_token = "valid_token"
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = None
-    mock_db_session.execute.return_value = mock_result
-    
-    async def mock_db_gen():
-        yield mock_db_session
 
     with patch('myDependencies.auth.Encryption.verify_token') as mock_verify:
-        mock_verify.return_value = {"user_id": 1}
-        
+        mock_verify.return_value = {"user_id": 2, "is_admin": False, "ver": 0}
+
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
-            await validate_is_authenticated(token=valid_token, db_async_gen=mock_db_gen())
+            await validate_is_authenticated(token=valid_token)
         assert exc_info.value.status_code == 401
         assert exc_info.value.detail == "Invalid token"
 
+@pytest.mark.asyncio
+async def test_validate_is_authenticated_revoked_token(mock_store, principals):
+    with patch('myDependencies.auth.Encryption.verify_token') as mock_verify:
+        mock_verify.return_value = {"user_id": 1, "is_admin": True, "ver": 0}
+        await validate_is_authenticated(token="token")
+
+        # The client was demoted: its token version was bumped
+        principals[1] = Principal(id=1, is_admin=False, token_version=1)
+        mock_store.invalidate(1)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await validate_is_authenticated(token="token")
+        assert exc_info.value.status_code == 401
+
+@pytest.mark.asyncio
+async def test_revoke_tokens_bumps_version(mock_store, mock_db_session, mock_client):
+    mock_client.token_version = 3
+    mock_db_session.add = MagicMock()
+    await mock_store.get(mock_client.id)
+
+    await revoke_tokens(mock_db_session, mock_client)
+
+    assert mock_client.token_version == 4
+    mock_db_session.commit.assert_awaited_once()
+    assert mock_store.stats()["size"] == 0
+
+def test_token_claims(mock_client):
+    mock_client.token_version = 2
+    assert token_claims(mock_client) == {"user_id": 1, "is_admin": False, "ver": 2}
+
 @pytest.mark.asyncio
 async def test_validate_is_admin_success(mock_client):
     # Arrange
@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import AsyncMock
+from myDependencies.principals import Principal, PrincipalStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def loader():
+    return AsyncMock(side_effect=lambda client_id: Principal(id=client_id, is_admin=False, token_version=0) if client_id < 100 else None)
+
+
+@pytest.fixture
+def store(loader, clock):
+    return PrincipalStore(ttl_seconds=30, max_entries=2, loader=loader, clock=clock)
+
+
+@pytest.mark.asyncio
+async def test_principal_is_loaded_once_within_ttl(store, loader, clock):
+    first = await store.get(1)
+    clock.now += 29
+    assert await store.get(1) is first
+    loader.assert_awaited_once_with(1)
+
+    clock.now += 2
+    await store.get(1)
+    assert loader.await_count == 2
+    assert store.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_client_is_cached(store, loader):
+    assert await store.get(100) is None
+    assert await store.get(100) is None
+    loader.assert_awaited_once_with(100)
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted(store, loader):
+    await store.get(1)
+    await store.get(2)
+    await store.get(1)
+    await store.get(3)
+
+    await store.get(1)
+    assert loader.await_count == 3
+    await store.get(2)
+    assert loader.await_count == 4
+    assert store.stats()["evictions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate(store, loader):
+    await store.get(1)
+    await store.get(2)
+    store.invalidate(1)
+    await store.get(1)
+    assert loader.await_count == 3
+
+    store.invalidate()
+    assert store.stats()["size"] == 0
@@ -1,4 +1,7 @@
 from .config import Config
+from .token_cache import TokenCache, token_cache
+from .hashing import PasswordHasher, password_hasher
+from typing import Optional
 import bcrypt
 import jwt
 
@@ -6,11 +9,53 @@ import jwt
 class Encryption:
     @staticmethod
     def hash_password(password: str) -> str:
-        return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=Config.BCRYPT_ROUNDS)).decode()
 
     @staticmethod
     def verify_password(password: str, hashed_password: str) -> bool:
         return bcrypt.checkpw(password.encode(), hashed_password.encode())
+
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """
+        Hash a password on the password hasher pool, without blocking the event loop
+        """
+        return await password_hasher.run(Encryption.hash_password, password)
+
+    @staticmethod
+    async def verify_password_async(password: str, hashed_password: str) -> bool:
+        """
+        Check a password on the password hasher pool, without blocking the event loop
+        """
+        return await password_hasher.run(Encryption.verify_password, password, hashed_password)
+
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """
+        Whether a stored hash was made with other parameters than the
+        configured policy (bcrypt $2b$ with Config.BCRYPT_ROUNDS)
+        """
+        try:
+            _, ident, rounds, _ = hashed_password.split("$", 3)
+            return ident != "2b" or int(rounds) != Config.BCRYPT_ROUNDS
+        except ValueError:
+            return True
+
+    @staticmethod
+    async def verify_and_rehash_async(password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        """
+        Check a password and, if it matches a hash made with an outdated
+        policy, hash it again with the current one.
+
+        Returns:
+            tuple[bool, str | None]: Whether the password matches, and the
+                new hash to store, or None if the stored one is current
+        """
+        if not await Encryption.verify_password_async(password, hashed_password):
+            return False, None
+        if not Encryption.needs_rehash(hashed_password):
+            return True, None
+        return True, await Encryption.hash_password_async(password)
     
     @staticmethod
     def generate_token(data: dict) -> str:
@@ -23,9 +68,16 @@ class Encryption:
     def verify_token(token: str) -> dict:
         """
         Verify the token and return the decoded payload
-        
+
+        Tokens verified before are served from token_cache until they expire.
+
         Raises:
             jwt.exceptions.InvalidTokenError: If the token is invalid
         """
-        return jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=[Config.JWT_ALGORITHM])
+        secret = Config.JWT_SECRET_KEY
+        claims = token_cache.get(token, secret)
+        if claims is None:
+            claims = jwt.decode(token, secret, algorithms=[Config.JWT_ALGORITHM])
+            token_cache.put(token, secret, claims)
+        return claims
 
@@ -0,0 +1,81 @@
+"""
+Benchmark the bcrypt cost factor on this host.
+
+Run it on the hardware that serves logins, under its usual load:
+
+    python -m myEncryption.calibrate [--target-ms 250] [--min-rounds 10] [--max-rounds 16]
+
+and set BCRYPT_ROUNDS to the recommended cost. Each extra round doubles the
+time of a hash; hashes stored with another cost keep working and are
+upgraded (or downgraded) on the next login of their owner.
+"""
+from .config import Config
+from typing import Callable, Optional
+import argparse
+import bcrypt
+import statistics
+import time
+
+
+def time_rounds(rounds: int, samples: int = 3, clock: Callable[[], float] = time.perf_counter) -> float:
+    """
+    Measure one bcrypt hash at a cost factor.
+
+    Args:
+        rounds (int): The cost factor (log2 of the iterations)
+        samples (int): Number of hashes to time
+
+    Returns:
+        float: The median time of a hash, in milliseconds
+    """
+    salt = bcrypt.gensalt(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        started = clock()
+        bcrypt.hashpw(b"calibration-password", salt)
+        timings.append((clock() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, min_rounds: int = 10, max_rounds: int = 16, samples: int = 3,
+              measure: Callable[[int, int], float] = time_rounds) -> dict:
+    """
+    Find the highest cost factor whose hash time stays within the target.
+
+    Costs are measured from min_rounds upwards and the search stops at the
+    first one over the target, since each round doubles the time.
+
+    Args:
+        target_ms (float): Acceptable time of one hash, in milliseconds
+        min_rounds (int): Lowest cost factor to consider
+        max_rounds (int): Highest cost factor to consider
+        samples (int): Hashes timed per cost factor
+
+    Returns:
+        dict: The median time per cost factor ("timings") and the
+            recommended cost ("rounds", min_rounds if even that is too slow)
+    """
+    timings: dict[int, float] = {}
+    recommended: Optional[int] = None
+    for rounds in range(min_rounds, max_rounds + 1):
+        timings[rounds] = measure(rounds, samples)
+        if timings[rounds] > target_ms:
+            break
+        recommended = rounds
+    return {"timings": timings, "rounds": recommended if recommended is not None else min_rounds}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the bcrypt cost factor against a latency target")
+    parser.add_argument("--target-ms", type=float, default=250, help="Acceptable time of one hash")
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=3, help="Hashes timed per cost factor")
+    args = parser.parse_args()
+
+    result = calibrate(args.target_ms, args.min_rounds, args.max_rounds, args.samples)
+    for rounds, ms in result["timings"].items():
+        marker = "*" if rounds == result["rounds"] else " "
+        current = " (current)" if rounds == Config.BCRYPT_ROUNDS else ""
+        print(f"{marker} rounds={rounds:<3} {ms:9.1f} ms{current}")
+    print(f"\nRecommended: BCRYPT_ROUNDS={result['rounds']} (target {args.target_ms:g} ms per hash)")
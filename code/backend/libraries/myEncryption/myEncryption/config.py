@@ -1,6 +1,16 @@
-from myAws import SecretsManager
+from myAws import LazySecret
+import os
 
 
 class Config:
-    JWT_SECRET_KEY = SecretsManager.get_secret("JWT_SECRET_KEY")
+    # Resolved at startup by secret_store.resolve_all() (see myAws.bootstrap)
+    JWT_SECRET_KEY = LazySecret("JWT_SECRET_KEY")
     JWT_ALGORITHM = "HS256"
+    # Verified-token cache; tokens without an exp claim are re-verified after the max TTL
+    TOKEN_CACHE_MAX_ENTRIES = int(os.getenv('TOKEN_CACHE_MAX_ENTRIES', 10_000))
+    TOKEN_CACHE_MAX_TTL_SECONDS = float(os.getenv('TOKEN_CACHE_MAX_TTL_SECONDS', 300))
+    # bcrypt cost factor of new hashes; stored hashes with another cost are
+    # rehashed on login. Pick it with: python -m myEncryption.calibrate
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+    # Concurrent bcrypt operations of Encryption.hash_password_async/verify_password_async
+    PASSWORD_HASH_MAX_WORKERS = int(os.getenv('PASSWORD_HASH_MAX_WORKERS', os.cpu_count() or 2))
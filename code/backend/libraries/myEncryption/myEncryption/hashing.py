@@ -0,0 +1,96 @@
+from .config import Config
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+import asyncio
+import threading
+import time
+
+
+class PasswordHasher:
+    """
+    Runs password hashing off the event loop, on a dedicated bounded thread pool.
+
+    A bcrypt hash or check takes tens to hundreds of milliseconds of CPU;
+    run inline in an async endpoint it blocks every other request of the
+    process. bcrypt releases the GIL while hashing, so the pool runs up to
+    max_workers operations in parallel and queues the rest. The pool is
+    separate from the loop's default executor so that a burst of logins
+    cannot starve other to_thread() work, and its size caps how many cores
+    hashing can take.
+    """
+
+    def __init__(self, max_workers: int = Config.PASSWORD_HASH_MAX_WORKERS):
+        """
+        Args:
+            max_workers (int): Maximum number of concurrent hash operations
+        """
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._operations = 0
+        self._queue_seconds_total = 0.0
+        self._queue_seconds_max = 0.0
+        self._hash_seconds_total = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    def _timed(self, submitted: float, function: Callable[..., Any], *args: Any) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            waited = started - submitted
+            self._queue_seconds_total += waited
+            self._queue_seconds_max = max(self._queue_seconds_max, waited)
+        try:
+            return function(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._operations += 1
+                self._hash_seconds_total += time.perf_counter() - started
+
+    async def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a CPU-bound function on the pool and await its result.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._queued += 1
+        return await loop.run_in_executor(self.executor, self._timed, time.perf_counter(), function, *args)
+
+    def shutdown(self) -> None:
+        """
+        Stop the pool (it is recreated on next use).
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        """
+        Return the current queue depth and the queue and hashing times.
+        """
+        with self._lock:
+            operations = self._operations
+            return {
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "running": self._running,
+                "operations": operations,
+                "queue_seconds_avg": self._queue_seconds_total / operations if operations else 0.0,
+                "queue_seconds_max": self._queue_seconds_max,
+                "hash_seconds_avg": self._hash_seconds_total / operations if operations else 0.0,
+            }
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,10 @@
+import pytest
+from myAws import secret_store
+
+
+@pytest.fixture(scope="session", autouse=True)
+def inject_secrets():
+    """Provide the JWT secret without fetching it from AWS"""
+    secret_store.inject({"JWT_SECRET_KEY": "test_secret_key"})
+    yield
+    secret_store.clear()
@@ -0,0 +1,60 @@
+import pytest
+from unittest.mock import patch
+from myEncryption import Config, Encryption
+from myEncryption.calibrate import calibrate, time_rounds
+
+
+@pytest.fixture
+def low_rounds():
+    with patch.object(Config, 'BCRYPT_ROUNDS', 4):
+        yield
+
+
+def test_hash_uses_configured_rounds(low_rounds):
+    assert Encryption.hash_password("secret").startswith("$2b$04$")
+
+
+def test_needs_rehash(low_rounds):
+    stored = Encryption.hash_password("secret")
+    assert not Encryption.needs_rehash(stored)
+    with patch.object(Config, 'BCRYPT_ROUNDS', 5):
+        assert Encryption.needs_rehash(stored)
+    assert Encryption.needs_rehash("$2a$04$" + "x" * 53)
+    assert Encryption.needs_rehash("not-a-bcrypt-hash")
+
+
+@pytest.mark.asyncio
+async def test_verify_and_rehash(low_rounds):
+    stored = Encryption.hash_password("secret")
+
+    assert await Encryption.verify_and_rehash_async("secret", stored) == (True, None)
+    assert await Encryption.verify_and_rehash_async("wrong", stored) == (False, None)
+
+    with patch.object(Config, 'BCRYPT_ROUNDS', 5):
+        verified, new_hash = await Encryption.verify_and_rehash_async("secret", stored)
+    assert verified
+    assert new_hash.startswith("$2b$05$")
+    assert Encryption.verify_password("secret", new_hash)
+
+
+def test_calibrate_picks_highest_cost_within_target():
+    # Each round doubles the time: 10 -> 50 ms, 11 -> 100 ms, 12 -> 200 ms, ...
+    measured = []
+
+    def measure(rounds, samples):
+        measured.append(rounds)
+        return 50 * 2 ** (rounds - 10)
+
+    result = calibrate(target_ms=250, min_rounds=10, max_rounds=16, measure=measure)
+    assert result["rounds"] == 12
+    # Stops at the first cost over the target
+    assert measured == [10, 11, 12, 13]
+
+
+def test_calibrate_falls_back_to_min_rounds():
+    result = calibrate(target_ms=1, min_rounds=10, max_rounds=12, measure=lambda rounds, samples: 50.0)
+    assert result["rounds"] == 10
+
+
+def test_time_rounds():
+    assert time_rounds(4, samples=1) > 0
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import time
+import pytest
+from myEncryption import Encryption, PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify():
+    hashed = await Encryption.hash_password_async("test_password123")
+    assert hashed.startswith('$2b$')
+    assert await Encryption.verify_password_async("test_password123", hashed)
+    assert not await Encryption.verify_password_async("wrong_password", hashed)
+
+
+@pytest.mark.asyncio
+async def test_event_loop_is_not_blocked():
+    hasher = PasswordHasher(max_workers=1)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(ticker())
+    await hasher.run(time.sleep, 0.1)
+    task.cancel()
+    hasher.shutdown()
+    assert ticks > 5
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_and_queue_time_measured():
+    hasher = PasswordHasher(max_workers=2)
+    running = peak = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    await asyncio.gather(*(hasher.run(work) for _ in range(6)))
+    stats = hasher.stats()
+    hasher.shutdown()
+
+    assert peak == 2
+    assert stats["operations"] == 6
+    assert (stats["queued"], stats["running"]) == (0, 0)
+    # The last two operations waited for two rounds of work
+    assert stats["queue_seconds_max"] >= 0.09
@@ -0,0 +1,86 @@
+import pytest
+import jwt
+from unittest.mock import patch
+from myEncryption import Encryption, TokenCache, token_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return TokenCache(max_entries=2, max_ttl_seconds=300, clock=clock)
+
+
+def test_verified_token_is_served_from_cache():
+    token_cache.clear()
+    token = Encryption.generate_token({"user_id": 1})
+    first = Encryption.verify_token(token)
+
+    with patch('myEncryption.jwt.decode') as mock_decode:
+        assert Encryption.verify_token(token) == first
+        mock_decode.assert_not_called()
+    assert token_cache.stats()["hits"] >= 1
+
+
+def test_invalid_token_is_not_cached():
+    token_cache.clear()
+    for _ in range(2):
+        with pytest.raises(jwt.exceptions.InvalidTokenError):
+            Encryption.verify_token("invalid_token")
+    assert token_cache.stats()["size"] == 0
+
+
+def test_entry_expires_with_token(cache, clock):
+    cache.put("token", "secret", {"user_id": 1, "exp": clock.now + 10})
+    assert cache.get("token", "secret") == {"user_id": 1, "exp": clock.now + 10}
+
+    clock.now += 10
+    assert cache.get("token", "secret") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_entry_without_exp_is_capped_at_max_ttl(cache, clock):
+    cache.put("token", "secret", {"user_id": 1})
+    clock.now += 299
+    assert cache.get("token", "secret") is not None
+    clock.now += 1
+    assert cache.get("token", "secret") is None
+
+
+def test_least_recently_used_token_is_evicted(cache):
+    cache.get("a", "secret")
+    cache.put("a", "secret", {"user_id": 1})
+    cache.put("b", "secret", {"user_id": 2})
+    cache.get("a", "secret")
+    cache.put("c", "secret", {"user_id": 3})
+
+    assert cache.get("b", "secret") is None
+    assert cache.get("a", "secret") == {"user_id": 1}
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+
+
+def test_secret_change_drops_entries(cache):
+    cache.get("a", "old")
+    cache.put("a", "old", {"user_id": 1})
+    assert cache.get("a", "new") is None
+    assert cache.get("a", "old") is None
+
+
+def test_returned_claims_are_copies(cache):
+    cache.get("a", "secret")
+    cache.put("a", "secret", {"user_id": 1})
+    cache.get("a", "secret")["user_id"] = 2
+    assert cache.get("a", "secret") == {"user_id": 1}
@@ -0,0 +1,104 @@
+from .config import Config
+from collections import OrderedDict
+from typing import Callable, Optional
+import hashlib
+import threading
+import time
+
+
+class TokenCache:
+    """
+    Bounded LRU of verified tokens and their decoded claims.
+
+    A client sends the same token on every request, and each jwt.decode
+    recomputes the signature. Entries are keyed by the SHA-256 digest of the
+    token (the token itself is not kept) and live until the token's exp
+    claim, capped at max_ttl_seconds. Entries are dropped when the signing
+    secret changes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = Config.TOKEN_CACHE_MAX_ENTRIES,
+        max_ttl_seconds: float = Config.TOKEN_CACHE_MAX_TTL_SECONDS,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            max_entries (int): Maximum number of cached tokens
+            max_ttl_seconds (float): Longest time a token is trusted without verifying it again
+            clock (callable): Wall-clock time source, comparable with exp claims
+        """
+        self.max_entries = max_entries
+        self.max_ttl_seconds = max_ttl_seconds
+        self._clock = clock
+        self._secret = None
+        # token digest -> (expires_at, claims)
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def _bind(self, secret: str) -> None:
+        # Called with the lock held
+        if secret != self._secret:
+            self._entries.clear()
+            self._secret = secret
+
+    def get(self, token: str, secret: str) -> Optional[dict]:
+        """
+        Return the claims of a token verified with this secret, or None.
+        """
+        key = self._key(token)
+        with self._lock:
+            self._bind(secret)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if self._clock() >= entry[0]:
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return dict(entry[1])
+
+    def put(self, token: str, secret: str, claims: dict) -> None:
+        """
+        Remember the claims of a token that was just verified with this secret.
+        """
+        expires_at = self._clock() + self.max_ttl_seconds
+        if isinstance(claims.get("exp"), (int, float)):
+            expires_at = min(expires_at, claims["exp"])
+        key = self._key(token)
+        with self._lock:
+            self._bind(secret)
+            self._entries[key] = (expires_at, dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss/eviction counters and the hit rate.
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+            }
+
+
+token_cache = TokenCache()
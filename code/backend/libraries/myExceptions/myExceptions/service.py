@@ -16,4 +16,8 @@ class ExternalServiceError(ServiceError):
 
 class ConfigurationError(ServiceError):
     """Raised when there are issues with service configuration."""
-    pass 
\ No newline at end of file
+    pass
+
+class InsufficientStockError(BusinessLogicError):
+    """Raised when stock movements would take a product below zero."""
+    pass
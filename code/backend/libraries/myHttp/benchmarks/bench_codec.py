@@ -0,0 +1,80 @@
+"""
+Micro-benchmark of JSON vs MessagePack for service-to-service payloads.
+
+Builds a page of products and a batch of sale items shaped like the API
+responses (after FastAPI's jsonable_encoder, so dates are strings), and
+reports per payload:
+  - encode and decode time: json as rendered by JSONResponse vs myHttp.codec
+  - size, raw and gzipped
+
+Usage (from libraries/myHttp):
+    python benchmarks/bench_codec.py [--rows 1000] [--iterations 200]
+"""
+from myHttp.codec import MSGPACK, decode, encode
+import argparse
+import gzip
+import json
+import random
+import time
+
+
+def products(rows: int) -> list[dict]:
+    return [
+        {
+            "id": index, "name": f"Product {index}", "price": round(random.uniform(100, 5000), 2),
+            "product_type": random.choice(["shirt", "pants", "dress"]), "current_quantity": random.randint(0, 500),
+            "for_baby": random.random() < 0.2, "size": random.choice(["S", "M", "L"]), "color": "blue",
+            "line": "basic", "created_at": "2025-05-21T10:00:00", "updated_at": "2025-05-21T10:00:00",
+            "images": [{"id": index * 10 + image, "url": f"https://cdn.example.com/images/{index}/{image}.webp"} for image in range(3)],
+        }
+        for index in range(rows)
+    ]
+
+
+def sale_items(rows: int) -> list[dict]:
+    return [
+        {
+            "sale_id": index // 3, "sale_item_id": index, "client_id": random.randint(1, 10_000),
+            "product_id": random.randint(1, 5_000), "quantity": random.randint(1, 5),
+            "unit_price": round(random.uniform(100, 5000), 2), "total_price": round(random.uniform(100, 25000), 2),
+            "payment_status": "completed", "created_at": "2025-05-21T10:00:00",
+        }
+        for index in range(rows)
+    ]
+
+
+def json_render(data) -> bytes:
+    # What fastapi.responses.JSONResponse.render does
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def timed(function, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations * 1e3
+
+
+def main(rows: int, iterations: int) -> None:
+    print(f"{'payload':<12} {'format':<8} {'encode ms':>10} {'decode ms':>10} {'bytes':>10} {'gzip bytes':>11}")
+    for name, data in (("products", products(rows)), ("sale items", sale_items(rows))):
+        as_json = json_render(data)
+        as_msgpack = encode(data, MSGPACK)
+        assert decode(as_msgpack, MSGPACK) == json.loads(as_json)
+        for format, body, encoder, decoder in (
+            ("json", as_json, lambda: json_render(data), lambda: json.loads(as_json)),
+            ("msgpack", as_msgpack, lambda: encode(data, MSGPACK), lambda: decode(as_msgpack, MSGPACK)),
+        ):
+            print(
+                f"{name:<12} {format:<8} {timed(encoder, iterations):10.3f} {timed(decoder, iterations):10.3f} "
+                f"{len(body):10,} {len(gzip.compress(body)):11,}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    random.seed(0)
+    main(args.rows, args.iterations)
@@ -1,44 +1,37 @@
-import aiohttp
-import requests
-from aiohttp import ClientResponse
-from requests import Response
+from .client import HttpClient, HttpResponse, http_client
+from .resilience import CircuitBreaker, CircuitOpenError, DeadlineExceededError, RetryPolicy
+from .fanout import FanoutRequest, FanoutResult, fan_out
+from .codec import JSON, MSGPACK, accepts_msgpack, decode, encode
+from .negotiation import NegotiatedResponse, NegotiationMiddleware
 
 
-def post(url, json, headers=None) -> Response:
-    return requests.post(url, json=json, headers=headers)
+def post(url, json, headers=None) -> HttpResponse:
+    return http_client.request_sync("POST", url, json=json, headers=headers)
 
 
-async def a_post(url, json, headers=None) -> ClientResponse:
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json=json, headers=headers) as response:
-            return response
+async def a_post(url, json, headers=None) -> HttpResponse:
+    return await http_client.call("POST", url, json=json, headers=headers)
 
 
-def get(url, headers=None) -> Response:
-    return requests.get(url, headers=headers)
+def get(url, headers=None) -> HttpResponse:
+    return http_client.request_sync("GET", url, headers=headers)
 
 
-async def a_get(url, headers=None) -> ClientResponse:
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers) as response:
-            return response
+async def a_get(url, headers=None) -> HttpResponse:
+    return await http_client.call("GET", url, headers=headers)
 
 
-def delete(url, headers=None) -> Response:
-    return requests.delete(url, headers=headers)
+def delete(url, headers=None) -> HttpResponse:
+    return http_client.request_sync("DELETE", url, headers=headers)
 
 
-async def a_delete(url, headers=None) -> ClientResponse:
-    async with aiohttp.ClientSession() as session:
-        async with session.delete(url, headers=headers) as response:
-            return response
+async def a_delete(url, headers=None) -> HttpResponse:
+    return await http_client.call("DELETE", url, headers=headers)
 
 
-def put(url, json, headers=None) -> Response:
-    return requests.put(url, json=json, headers=headers)
+def put(url, json, headers=None) -> HttpResponse:
+    return http_client.request_sync("PUT", url, json=json, headers=headers)
 
 
-async def a_put(url, json, headers=None) -> ClientResponse:
-    async with aiohttp.ClientSession() as session:
-        async with session.put(url, json=json, headers=headers) as response:
-            return response
+async def a_put(url, json, headers=None) -> HttpResponse:
+    return await http_client.call("PUT", url, json=json, headers=headers)
@@ -0,0 +1,405 @@
+from .codec import JSON, MSGPACK, decode, encode
+from .config import Config
+from .resilience import CircuitBreaker, CircuitOpenError, DeadlineExceededError, IDEMPOTENT_METHODS, LatencyWindow, RetryPolicy
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from requests.adapters import HTTPAdapter
+from typing import Any, AsyncIterator, Mapping, Optional
+from yarl import URL
+import aiohttp
+import asyncio
+import json as jsonlib
+import requests
+import threading
+
+
+@dataclass
+class HttpResponse:
+    """
+    A response whose body has been read, so it outlives its connection.
+    """
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+    url: str
+    elapsed_seconds: float = field(default=0.0)
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    @property
+    def text(self) -> str:
+        return self.body.decode()
+
+    def json(self) -> Any:
+        return jsonlib.loads(self.body)
+
+    def data(self) -> Any:
+        """
+        Decode the body according to its Content-Type (JSON or MessagePack).
+        """
+        content_type = next((value for name, value in self.headers.items() if name.lower() == "content-type"), JSON)
+        return decode(self.body, content_type)
+
+
+class HttpClient:
+    """
+    Per-process HTTP client with pooled, keep-alive connections.
+
+    The async side shares one aiohttp.ClientSession (connection pool, DNS
+    cache) for the lifetime of the event loop it was created on; the sync
+    side keeps one requests.Session per thread. Both return HttpResponse,
+    with the body already read.
+
+    Bind the client to the app lifespan so connections are closed on shutdown:
+
+        async with http_client.lifespan():
+            yield
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: float = Config.HTTP_TIMEOUT_SECONDS,
+        connect_timeout_seconds: float = Config.HTTP_CONNECT_TIMEOUT_SECONDS,
+        limit: int = Config.HTTP_POOL_LIMIT,
+        limit_per_host: int = Config.HTTP_POOL_LIMIT_PER_HOST,
+        dns_cache_ttl_seconds: int = Config.HTTP_DNS_CACHE_TTL_SECONDS,
+        keepalive_timeout_seconds: float = Config.HTTP_KEEPALIVE_TIMEOUT_SECONDS,
+        retry_policy: Optional[RetryPolicy] = None,
+        breaker_factory: type[CircuitBreaker] = CircuitBreaker,
+        hedge_percentile: float = 0.95
+    ):
+        """
+        Args:
+            timeout_seconds (float): Default total time of a request
+            connect_timeout_seconds (float): Time to open a connection
+            limit (int): Maximum open connections of the process
+            limit_per_host (int): Maximum open connections to one host
+            dns_cache_ttl_seconds (int): How long resolved addresses are reused
+            keepalive_timeout_seconds (float): How long idle connections are kept
+            retry_policy (RetryPolicy | None): Retries of call() (default: RetryPolicy())
+            breaker_factory (callable): Builds the circuit breaker of each host
+            hedge_percentile (float): Latency after which call(hedge=True) sends a second request
+        """
+        self.timeout_seconds = timeout_seconds
+        self.connect_timeout_seconds = connect_timeout_seconds
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl_seconds = dns_cache_ttl_seconds
+        self.keepalive_timeout_seconds = keepalive_timeout_seconds
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._local = threading.local()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.hedge_percentile = hedge_percentile
+        self._breakers: dict[str, CircuitBreaker] = defaultdict(breaker_factory)
+        self._latencies: dict[str, LatencyWindow] = defaultdict(LatencyWindow)
+        self._stats = {
+            "calls": 0, "attempts": 0, "retries": 0, "failures": 0, "hedges": 0,
+            "hedge_wins": 0, "deadline_exceeded": 0, "short_circuited": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Async
+    # ------------------------------------------------------------------
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        The shared session, created on first use in the running loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl_seconds,
+                keepalive_timeout=self.keepalive_timeout_seconds,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds, connect=self.connect_timeout_seconds),
+            )
+            self._loop = loop
+        return self._session
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        json: Any = None,
+        headers: Optional[Mapping[str, str]] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        data: Any = None,
+        timeout_seconds: Optional[float] = None,
+        msgpack: bool = False
+    ) -> HttpResponse:
+        """
+        Send a request on a pooled connection and read the whole response.
+
+        Args:
+            method (str): HTTP method
+            url (str): Absolute URL
+            json: Body to send as JSON
+            headers (Mapping | None): Request headers
+            params (Mapping | None): Query string parameters
+            data: Raw body to send instead of json
+            timeout_seconds (float | None): Total time allowed (default: the client timeout)
+            msgpack (bool): Send the json body as MessagePack and ask for a
+                MessagePack response (read it with HttpResponse.data())
+
+        Returns:
+            HttpResponse: The response, whatever its status
+
+        Raises:
+            aiohttp.ClientError: If the request cannot be sent or the response read
+            asyncio.TimeoutError: If the request takes longer than the timeout
+        """
+        timeout = None
+        if timeout_seconds is not None:
+            timeout = aiohttp.ClientTimeout(total=timeout_seconds, connect=min(timeout_seconds, self.connect_timeout_seconds))
+        if msgpack:
+            headers = {**(headers or {}), "Accept": f"{MSGPACK}, {JSON};q=0.5"}
+            if json is not None:
+                data, json = encode(json, MSGPACK), None
+                headers["Content-Type"] = MSGPACK
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        async with self.session.request(method, url, json=json, headers=headers, params=params, data=data, timeout=timeout) as response:
+            body = await response.read()
+            elapsed = loop.time() - started
+            self._latencies[response.url.host].record(elapsed)
+            return HttpResponse(
+                status=response.status,
+                headers=dict(response.headers),
+                body=body,
+                url=str(response.url),
+                elapsed_seconds=elapsed,
+            )
+
+    async def _hedged(self, method: str, url: str, host: str, remaining: float, **kwargs: Any) -> HttpResponse:
+        """
+        Send a request and, if it has not answered after the host's p95
+        latency, a second identical one; return the first response.
+        """
+        window = self._latencies[host]
+        delay = window.percentile(self.hedge_percentile) if len(window) >= Config.HTTP_HEDGE_MIN_SAMPLES else None
+        tasks = [asyncio.ensure_future(self.request(method, url, timeout_seconds=remaining, **kwargs))]
+        try:
+            first = tasks[0]
+            if delay is None or delay >= remaining:
+                return await first
+
+            done, _ = await asyncio.wait({first}, timeout=delay)
+            if done:
+                return first.result()
+            self._stats["hedges"] += 1
+            second = asyncio.ensure_future(self.request(method, url, timeout_seconds=remaining - delay, **kwargs))
+            tasks.append(second)
+            pending = {first, second}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self._stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Also when the caller is cancelled (e.g. by fan_out): no request outlives the call
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Mark the error of a losing request as retrieved
+                    task.exception()
+
+    async def call(
+        self,
+        method: str,
+        url: str,
+        deadline_seconds: Optional[float] = None,
+        retry: bool = True,
+        hedge: bool = False,
+        **kwargs: Any
+    ) -> HttpResponse:
+        """
+        Send a request with a deadline, retries, optional hedging and the
+        circuit breaker of its host.
+
+        Only idempotent methods are retried, on connection errors, timeouts
+        and the statuses of the retry policy, with exponential backoff; the
+        deadline bounds the whole call, retries and backoff included. Each
+        attempt of a retryable call times out after its share of the
+        deadline (deadline / max attempts), the last one after what is left.
+        Hedging also applies to idempotent methods only.
+
+        Args:
+            method (str): HTTP method
+            url (str): Absolute URL
+            deadline_seconds (float | None): Total time allowed (default: the client timeout)
+            retry (bool): Whether to retry transient failures
+            hedge (bool): Whether to send a second request when the first is slower than the host's p95
+            **kwargs: Passed on to request()
+
+        Returns:
+            HttpResponse: The last response (possibly a retryable error status once retries are exhausted)
+
+        Raises:
+            CircuitOpenError: If the circuit of the host is open
+            DeadlineExceededError: If the deadline passed before a response arrived
+            aiohttp.ClientError: If the last attempt failed to connect
+        """
+        loop = asyncio.get_running_loop()
+        budget = deadline_seconds or self.timeout_seconds
+        deadline = loop.time() + budget
+        host = URL(url).host
+        breaker = self._breakers[host]
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempts = self.retry_policy.max_attempts if retry and idempotent else 1
+        self._stats["calls"] += 1
+        attempt = 0
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                self._stats["deadline_exceeded"] += 1
+                raise DeadlineExceededError(f"Error in myHttp: {method} {url} exceeded its deadline after {attempt} attempts")
+            if not breaker.allow():
+                self._stats["short_circuited"] += 1
+                raise CircuitOpenError(f"Error in myHttp: circuit open for {host}")
+
+            attempt += 1
+            self._stats["attempts"] += 1
+            # Each attempt gets its share of the deadline, so a hung response
+            # leaves time for a retry; the last one gets whatever is left
+            timeout = remaining if attempt >= attempts else min(remaining, budget / attempts)
+            response, error = None, None
+            try:
+                if hedge and idempotent:
+                    response = await self._hedged(method, url, host, timeout, **kwargs)
+                else:
+                    response = await self.request(method, url, timeout_seconds=timeout, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+            except BaseException:
+                # Cancelled (e.g. by fan_out) or not a transport error: no outcome
+                # to record, but a half-open probe must not stay reserved forever
+                breaker.release()
+                raise
+
+            if response is not None and response.status not in self.retry_policy.retry_statuses:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+            self._stats["failures"] += 1
+
+            backoff = self.retry_policy.backoff(attempt)
+            if not retry or not self.retry_policy.can_retry(method, attempt) or loop.time() + backoff >= deadline:
+                if response is not None:
+                    return response
+                if isinstance(error, asyncio.TimeoutError):
+                    self._stats["deadline_exceeded"] += 1
+                    raise DeadlineExceededError(f"Error in myHttp: {method} {url} exceeded its deadline after {attempt} attempts") from error
+                raise error
+            self._stats["retries"] += 1
+            await asyncio.sleep(backoff)
+
+    def stats(self) -> dict:
+        """
+        Return the call counters and the circuit state of every host.
+        """
+        return {
+            **self._stats,
+            "circuits": {
+                host: {"state": breaker.state, "failures": breaker.failures, **breaker.stats}
+                for host, breaker in self._breakers.items()
+            },
+        }
+
+    async def get(self, url: str, **kwargs: Any) -> HttpResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> HttpResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> HttpResponse:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> HttpResponse:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def close(self) -> None:
+        """
+        Close the pooled connections of the async session.
+        """
+        session, self._session, self._loop = self._session, None, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    @asynccontextmanager
+    async def lifespan(self) -> AsyncIterator["HttpClient"]:
+        """
+        Keep the client open for the lifetime of an app.
+        """
+        try:
+            yield self
+        finally:
+            await self.close()
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+    @property
+    def sync_session(self) -> requests.Session:
+        """
+        The requests session of the calling thread.
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.limit, pool_maxsize=self.limit_per_host)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def request_sync(
+        self,
+        method: str,
+        url: str,
+        json: Any = None,
+        headers: Optional[Mapping[str, str]] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        data: Any = None,
+        timeout_seconds: Optional[float] = None,
+        msgpack: bool = False
+    ) -> HttpResponse:
+        """
+        Blocking counterpart of request(), for scripts and worker threads.
+
+        Raises:
+            requests.RequestException: If the request cannot be sent or times out
+        """
+        if msgpack:
+            headers = {**(headers or {}), "Accept": f"{MSGPACK}, {JSON};q=0.5"}
+            if json is not None:
+                data, json = encode(json, MSGPACK), None
+                headers["Content-Type"] = MSGPACK
+        timeout = timeout_seconds or self.timeout_seconds
+        response = self.sync_session.request(
+            method, url, json=json, headers=headers, params=params, data=data,
+            timeout=(min(timeout, self.connect_timeout_seconds), timeout),
+        )
+        return HttpResponse(
+            status=response.status_code,
+            headers=dict(response.headers),
+            body=response.content,
+            url=response.url,
+            elapsed_seconds=response.elapsed.total_seconds(),
+        )
+
+
+http_client = HttpClient()
@@ -0,0 +1,24 @@
+import os
+
+
+class Config:
+    # Pooled clients (see myHttp.client)
+    HTTP_TIMEOUT_SECONDS = float(os.getenv('HTTP_TIMEOUT_SECONDS', 10))
+    HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv('HTTP_CONNECT_TIMEOUT_SECONDS', 3))
+    HTTP_POOL_LIMIT = int(os.getenv('HTTP_POOL_LIMIT', 100))
+    HTTP_POOL_LIMIT_PER_HOST = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', 20))
+    HTTP_DNS_CACHE_TTL_SECONDS = int(os.getenv('HTTP_DNS_CACHE_TTL_SECONDS', 300))
+    HTTP_KEEPALIVE_TIMEOUT_SECONDS = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT_SECONDS', 30))
+
+    # Retries of idempotent requests (see myHttp.resilience)
+    HTTP_RETRY_MAX_ATTEMPTS = int(os.getenv('HTTP_RETRY_MAX_ATTEMPTS', 3))
+    HTTP_RETRY_BACKOFF_BASE_SECONDS = float(os.getenv('HTTP_RETRY_BACKOFF_BASE_SECONDS', 0.05))
+    HTTP_RETRY_BACKOFF_MAX_SECONDS = float(os.getenv('HTTP_RETRY_BACKOFF_MAX_SECONDS', 1))
+    # Per-host circuit breaker: consecutive failures to open it, seconds before a probe
+    HTTP_BREAKER_FAILURE_THRESHOLD = int(os.getenv('HTTP_BREAKER_FAILURE_THRESHOLD', 5))
+    HTTP_BREAKER_RESET_SECONDS = float(os.getenv('HTTP_BREAKER_RESET_SECONDS', 30))
+    # Hedged requests: latencies kept per host, and needed before hedging starts
+    HTTP_LATENCY_WINDOW = int(os.getenv('HTTP_LATENCY_WINDOW', 200))
+    HTTP_HEDGE_MIN_SAMPLES = int(os.getenv('HTTP_HEDGE_MIN_SAMPLES', 20))
+    # fan_out(): requests in flight at once
+    HTTP_FANOUT_MAX_CONCURRENCY = int(os.getenv('HTTP_FANOUT_MAX_CONCURRENCY', 10))
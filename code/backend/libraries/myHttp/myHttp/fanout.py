@@ -0,0 +1,118 @@
+from .client import HttpClient, HttpResponse, http_client
+from .config import Config
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Mapping, Optional, Sequence
+import asyncio
+
+
+@dataclass
+class FanoutRequest:
+    """
+    One request of a fan-out. Identified in the results by its key
+    (default: its position).
+    """
+    url: str
+    method: str = "GET"
+    key: Optional[Hashable] = None
+    json: Any = None
+    headers: Optional[Mapping[str, str]] = None
+    params: Optional[Mapping[str, Any]] = None
+    kwargs: dict = field(default_factory=dict)
+
+
+@dataclass
+class FanoutResult:
+    """
+    The outcome of one request: a response, an error, or neither if the
+    request was cancelled (enough responses had arrived, or the fan-out
+    deadline passed).
+    """
+    key: Hashable
+    response: Optional[HttpResponse] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.response is not None and self.response.ok
+
+    @property
+    def cancelled(self) -> bool:
+        return self.response is None and self.error is None
+
+
+async def fan_out(
+    requests: Sequence[FanoutRequest],
+    max_concurrency: int = Config.HTTP_FANOUT_MAX_CONCURRENCY,
+    timeout_seconds: Optional[float] = None,
+    deadline_seconds: Optional[float] = None,
+    required: Optional[int] = None,
+    client: HttpClient = http_client
+) -> dict[Hashable, FanoutResult]:
+    """
+    Send many requests concurrently and collect their results.
+
+    A failed request does not fail the others: its result carries the
+    error. Each request goes through client.call(), so it gets the
+    client's retries and circuit breaker.
+
+        results = await fan_out([
+            FanoutRequest(f"{PRODUCTS}/{product_id}", key="product"),
+            FanoutRequest(f"{ASSETS}/images", key="images", params={"product_id": product_id}),
+            FanoutRequest(f"{REVIEWS}/{product_id}", key="reviews"),
+        ], timeout_seconds=0.5)
+
+    Args:
+        requests (Sequence[FanoutRequest]): The requests to send
+        max_concurrency (int): Maximum number of requests in flight
+        timeout_seconds (float | None): Deadline of each request (default: the client timeout)
+        deadline_seconds (float | None): Deadline of the whole fan-out;
+            requests still running then are cancelled
+        required (int | None): Stop once this many requests succeeded and
+            cancel the rest (default: wait for all of them)
+        client (HttpClient): The client to send the requests with
+
+    Returns:
+        dict: Key -> FanoutResult, in the order of the requests
+
+    Raises:
+        ValueError: If two requests have the same key (nothing is sent)
+    """
+    results: dict[Hashable, FanoutResult] = {}
+    sends = []
+    for index, request in enumerate(requests):
+        key = request.key if request.key is not None else index
+        if key in results:
+            raise ValueError(f"Error in myHttp: duplicate fan-out key {key!r}")
+        results[key] = FanoutResult(key)
+        sends.append((results[key], request))
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def send(result: FanoutResult, request: FanoutRequest) -> FanoutResult:
+        async with semaphore:
+            try:
+                result.response = await client.call(
+                    request.method, request.url, deadline_seconds=timeout_seconds,
+                    json=request.json, headers=request.headers, params=request.params, **request.kwargs
+                )
+            except Exception as e:
+                result.error = e
+        return result
+
+    pending = {asyncio.ensure_future(send(result, request)) for result, request in sends}
+    loop = asyncio.get_running_loop()
+    deadline = None if deadline_seconds is None else loop.time() + deadline_seconds
+    succeeded = 0
+    try:
+        while pending and (required is None or succeeded < required):
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            succeeded += sum(task.result().ok for task in done)
+    finally:
+        # Stragglers: their results stay empty (cancelled)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    return results
@@ -0,0 +1,55 @@
+from .codec import MSGPACK, accepts_msgpack, encode
+from contextvars import ContextVar
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Any
+
+_accept_msgpack: ContextVar[bool] = ContextVar("accept_msgpack", default=False)
+
+
+class NegotiationMiddleware:
+    """
+    Records whether the request accepts MessagePack, for NegotiatedResponse.
+
+    A response class cannot see the request it answers, so the Accept
+    header is passed through a context variable set for the request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = next((value.decode("latin-1") for name, value in scope["headers"] if name == b"accept"), None)
+        token = _accept_msgpack.set(accepts_msgpack(accept))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _accept_msgpack.reset(token)
+
+
+class NegotiatedResponse(JSONResponse):
+    """
+    JSON response that is sent as MessagePack to clients asking for it.
+
+    Use it as the app's default_response_class, with NegotiationMiddleware
+    installed:
+
+        app = FastAPI(default_response_class=NegotiatedResponse)
+        app.add_middleware(NegotiationMiddleware)
+    """
+
+    def __init__(self, content: Any, *args: Any, **kwargs: Any):
+        self.msgpack = _accept_msgpack.get()
+        super().__init__(content, *args, **kwargs)
+        if self.msgpack:
+            self.headers["content-type"] = MSGPACK
+        # Caches must not serve one encoding to a client asking for the other
+        self.headers.add_vary_header("Accept")
+
+    def render(self, content: Any) -> bytes:
+        if self.msgpack:
+            return encode(content, MSGPACK)
+        return super().render(content)
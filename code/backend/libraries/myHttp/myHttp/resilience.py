@@ -0,0 +1,140 @@
+from .config import Config
+from collections import deque
+from myExceptions.service import ExternalServiceError
+from typing import Callable, Optional
+import random
+import time
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class CircuitOpenError(ExternalServiceError):
+    """Raised when a call is refused because the circuit of its host is open."""
+    pass
+
+
+class DeadlineExceededError(ExternalServiceError):
+    """Raised when a call did not complete within its deadline, retries included."""
+    pass
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, for idempotent requests only.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = Config.HTTP_RETRY_MAX_ATTEMPTS,
+        backoff_base_seconds: float = Config.HTTP_RETRY_BACKOFF_BASE_SECONDS,
+        backoff_max_seconds: float = Config.HTTP_RETRY_BACKOFF_MAX_SECONDS,
+        retry_statuses: frozenset = frozenset({502, 503, 504}),
+        random_: Callable[[], float] = random.random
+    ):
+        """
+        Args:
+            max_attempts (int): Attempts per call, the first one included
+            backoff_base_seconds (float): Maximum delay before the first retry
+            backoff_max_seconds (float): Cap of the delay
+            retry_statuses (frozenset): Response statuses treated as transient failures
+        """
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.retry_statuses = retry_statuses
+        self._random = random_
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        return method.upper() in IDEMPOTENT_METHODS and attempt < self.max_attempts
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Delay before retry number `attempt` (1 for the first retry).
+        """
+        return self._random() * min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** (attempt - 1))
+
+
+class CircuitBreaker:
+    """
+    Refuses calls to a host after repeated failures, then probes it.
+
+    Closed: calls go through; failure_threshold consecutive failures open
+    the circuit. Open: calls fail at once with CircuitOpenError until
+    reset_seconds have passed. Half-open: a single probe call goes
+    through; its success closes the circuit, its failure opens it again.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = Config.HTTP_BREAKER_FAILURE_THRESHOLD,
+        reset_seconds: float = Config.HTTP_BREAKER_RESET_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self.stats = {"opened": 0, "rejected": 0}
+
+    def allow(self) -> bool:
+        """
+        Whether a call may be sent now. A True answer in the half-open state
+        reserves the probe, so it must be followed by record_success/failure,
+        or by release if the call ends without an outcome.
+        """
+        if self.state == self.OPEN and self._clock() - self.opened_at >= self.reset_seconds:
+            self.state = self.HALF_OPEN
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.stats["rejected"] += 1
+        return False
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.stats["opened"] += 1
+            self.state = self.OPEN
+            self.opened_at = self._clock()
+        self._probing = False
+
+    def release(self) -> None:
+        """
+        Give back the probe of a call that ended without an outcome (cancelled,
+        or failed before reaching the host), so the next call can probe.
+        """
+        self._probing = False
+
+
+class LatencyWindow:
+    """
+    The latest response times of a host, for hedging after its p95.
+    """
+
+    def __init__(self, size: int = Config.HTTP_LATENCY_WINDOW):
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[int(fraction * (len(ordered) - 1))]
@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+import myHttp
+from myHttp import HttpClient, http_client
+
+
+@pytest.mark.asyncio
+async def test_response_body_is_read(server):
+    response = await myHttp.a_post(str(server.make_url("/echo")), json={"a": 1})
+    assert response.ok
+    assert response.json()["method"] == "POST"
+    assert response.json()["body"] == '{"a": 1}'
+    await http_client.close()
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused(server):
+    client = HttpClient()
+    async with client.lifespan():
+        peers = {(await client.get(str(server.make_url("/echo")))).json()["peer"] for _ in range(5)}
+    # Every request went over the same keep-alive connection
+    assert len(peers) == 1
+    assert client._session is None
+
+
+@pytest.mark.asyncio
+async def test_per_host_limit(server):
+    client = HttpClient(limit_per_host=2)
+    async with client.lifespan():
+        responses = await asyncio.gather(*(client.get(str(server.make_url("/slow")), params={"seconds": "0.05"}) for _ in range(6)))
+    assert all(response.ok for response in responses)
+    assert server.in_flight["peak"] == 2
+
+
+@pytest.mark.asyncio
+async def test_timeout(server):
+    client = HttpClient()
+    async with client.lifespan():
+        with pytest.raises(asyncio.TimeoutError):
+            await client.get(str(server.make_url("/slow")), params={"seconds": "1"}, timeout_seconds=0.05)
+
+
+@pytest.mark.asyncio
+async def test_error_status_is_returned(server):
+    client = HttpClient()
+    async with client.lifespan():
+        response = await client.get(str(server.make_url("/status/503")))
+    assert response.status == 503
+    assert not response.ok
+    assert response.text == "status"
+
+
+def test_sync_requests_share_a_session(sync_server):
+    client = HttpClient()
+    first = client.request_sync("PUT", f"{sync_server}/echo", json={"a": 1})
+    second = client.request_sync("GET", f"{sync_server}/echo")
+
+    assert first.json()["method"] == "PUT"
+    assert first.json()["peer"] == second.json()["peer"]
@@ -0,0 +1,67 @@
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from myHttp import HttpClient, JSON, MSGPACK, NegotiatedResponse, NegotiationMiddleware, accepts_msgpack, decode, encode
+
+
+@pytest.fixture
+def app():
+    app = FastAPI(default_response_class=NegotiatedResponse)
+    app.add_middleware(NegotiationMiddleware)
+
+    @app.get("/products")
+    def products():
+        return [{"id": 1, "name": "Camisa", "price": Decimal("199.90"), "created_at": datetime(2025, 5, 21)}]
+
+    return app
+
+
+def test_roundtrip():
+    data = {"id": 1, "tags": ["a", "b"], "price": 1.5, "name": "Niño", "nested": {"ok": True, "none": None}}
+    for content_type in (JSON, MSGPACK, "application/x-msgpack; charset=utf-8"):
+        assert decode(encode(data, content_type), content_type) == data
+
+
+def test_dates_and_decimals_are_encoded_as_strings():
+    body = encode({"at": datetime(2025, 5, 21, 10), "price": Decimal("1.10")}, MSGPACK)
+    assert decode(body, MSGPACK) == {"at": "2025-05-21T10:00:00", "price": "1.10"}
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, False),
+    ("*/*", False),
+    ("text/html,application/xhtml+xml,*/*;q=0.8", False),
+    ("application/msgpack", True),
+    ("application/json;q=0.5, application/x-msgpack", True),
+    ("application/msgpack;q=0", False),
+])
+def test_accepts_msgpack(accept, expected):
+    assert accepts_msgpack(accept) is expected
+
+
+def test_browsers_get_json(app):
+    response = TestClient(app).get("/products", headers={"Accept": "text/html,*/*;q=0.8"})
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["vary"] == "Accept"
+    assert response.json()[0]["price"] == 199.9
+
+
+def test_services_get_msgpack(app):
+    response = TestClient(app).get("/products", headers={"Accept": MSGPACK})
+    assert response.headers["content-type"] == MSGPACK
+    assert decode(response.content, MSGPACK) == [
+        {"id": 1, "name": "Camisa", "price": 199.9, "created_at": "2025-05-21T00:00:00"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_client_sends_and_reads_msgpack(server):
+    client = HttpClient()
+    async with client.lifespan():
+        response = await client.request("POST", str(server.make_url("/negotiate")), json={"ids": [1, 2]}, msgpack=True)
+        plain = await client.request("POST", str(server.make_url("/negotiate")), json={"ids": [1, 2]})
+    assert response.headers["Content-Type"] == MSGPACK
+    assert response.data() == {"ids": [1, 2]}
+    assert plain.data() == plain.json() == {"ids": [1, 2]}
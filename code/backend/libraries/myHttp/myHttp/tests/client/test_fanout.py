@@ -0,0 +1,76 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from myHttp import FanoutRequest, HttpClient, RetryPolicy, fan_out
+
+
+@pytest_asyncio.fixture
+async def client():
+    client = HttpClient(retry_policy=RetryPolicy(max_attempts=1))
+    async with client.lifespan():
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_requests_run_concurrently_with_a_cap(server, client):
+    requests = [FanoutRequest(str(server.make_url("/slow")), params={"seconds": "0.05"}) for _ in range(6)]
+    started = asyncio.get_running_loop().time()
+    results = await fan_out(requests, max_concurrency=3, client=client)
+    elapsed = asyncio.get_running_loop().time() - started
+
+    assert list(results) == [0, 1, 2, 3, 4, 5]
+    assert all(result.ok for result in results.values())
+    assert server.in_flight["peak"] == 3
+    # Two waves of three, not six sequential requests
+    assert elapsed < 0.25
+
+
+@pytest.mark.asyncio
+async def test_partial_failures_are_reported(server, client):
+    results = await fan_out([
+        FanoutRequest(str(server.make_url("/echo")), key="echo"),
+        FanoutRequest(str(server.make_url("/status/404")), key="missing"),
+        FanoutRequest("http://127.0.0.1:1/unreachable", key="down"),
+        FanoutRequest(str(server.make_url("/slow")), key="slow", params={"seconds": "1"}),
+    ], timeout_seconds=0.1, client=client)
+
+    assert results["echo"].ok
+    assert results["missing"].response.status == 404 and not results["missing"].ok
+    assert results["down"].error is not None
+    assert results["slow"].error is not None
+
+
+@pytest.mark.asyncio
+async def test_stragglers_are_cancelled_once_enough_succeed(server, client):
+    results = await fan_out([
+        FanoutRequest(str(server.make_url("/echo")), key="a"),
+        FanoutRequest(str(server.make_url("/echo")), key="b"),
+        FanoutRequest(str(server.make_url("/slow")), key="straggler", params={"seconds": "1"}),
+    ], required=2, client=client)
+
+    assert results["a"].ok and results["b"].ok
+    assert results["straggler"].cancelled
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_remaining_requests(server, client):
+    started = asyncio.get_running_loop().time()
+    results = await fan_out([
+        FanoutRequest(str(server.make_url("/echo")), key="fast"),
+        FanoutRequest(str(server.make_url("/slow")), key="slow", params={"seconds": "1"}),
+    ], deadline_seconds=0.1, client=client)
+
+    assert asyncio.get_running_loop().time() - started < 0.5
+    assert results["fast"].ok
+    assert results["slow"].cancelled
+
+
+@pytest.mark.asyncio
+async def test_duplicate_keys_are_rejected(server, client):
+    url = str(server.make_url("/echo"))
+    with pytest.raises(ValueError):
+        await fan_out([FanoutRequest(url, key="x"), FanoutRequest(url, key="x"), FanoutRequest(url, key="y")], client=client)
+    # A key may not collide with the position of a request without one either
+    with pytest.raises(ValueError):
+        await fan_out([FanoutRequest(url), FanoutRequest(url, key=0)], client=client)
+    assert client.stats()["calls"] == 0
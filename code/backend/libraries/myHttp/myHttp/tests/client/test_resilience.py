@@ -0,0 +1,184 @@
+import asyncio
+import aiohttp
+import pytest
+from myHttp import CircuitBreaker, CircuitOpenError, DeadlineExceededError, HttpClient, RetryPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def no_jitter_policy(**kwargs):
+    return RetryPolicy(backoff_base_seconds=0.001, random_=lambda: 1.0, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_idempotent_call_is_retried(server):
+    client = HttpClient(retry_policy=no_jitter_policy(max_attempts=3))
+    async with client.lifespan():
+        response = await client.call("GET", str(server.make_url("/flaky/get")), params={"failures": "2"})
+    assert response.json() == {"attempt": 3}
+    stats = client.stats()
+    assert (stats["attempts"], stats["retries"], stats["failures"]) == (3, 2, 2)
+
+
+@pytest.mark.asyncio
+async def test_post_is_not_retried(server):
+    client = HttpClient(retry_policy=no_jitter_policy())
+    async with client.lifespan():
+        response = await client.call("POST", str(server.make_url("/flaky/post")), json={})
+    assert response.status == 503
+    assert server.hits["post"] == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_the_call(server):
+    client = HttpClient()
+    async with client.lifespan():
+        started = asyncio.get_running_loop().time()
+        with pytest.raises(DeadlineExceededError):
+            await client.call("GET", str(server.make_url("/slow")), params={"seconds": "1"}, deadline_seconds=0.1)
+        assert asyncio.get_running_loop().time() - started < 0.5
+    assert client.stats()["deadline_exceeded"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_wins_over_slow_one(server):
+    client = HttpClient()
+    host = server.make_url("/").host
+    # Teach the client that this host usually answers in 10 ms
+    for _ in range(20):
+        client._latencies[host].record(0.01)
+
+    calls = 0
+    original = client.request
+
+    async def request(method, url, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            # The first request hits a slow replica
+            return await original(method, url.replace("/echo", "/slow"), params={"seconds": "1"}, **kwargs)
+        return await original(method, url, **kwargs)
+
+    client.request = request
+    async with client.lifespan():
+        response = await client.call("GET", str(server.make_url("/echo")), hedge=True, deadline_seconds=2)
+    assert response.json()["method"] == "GET"
+    stats = client.stats()
+    assert (stats["hedges"], stats["hedge_wins"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_failures(server):
+    client = HttpClient(retry_policy=no_jitter_policy(max_attempts=1), breaker_factory=lambda: CircuitBreaker(failure_threshold=2))
+    async with client.lifespan():
+        url = str(server.make_url("/status/503"))
+        await client.call("GET", url)
+        await client.call("GET", url)
+        with pytest.raises(CircuitOpenError):
+            await client.call("GET", url)
+    stats = client.stats()
+    assert stats["short_circuited"] == 1
+    circuit = stats["circuits"][server.make_url("/").host]
+    assert (circuit["state"], circuit["opened"]) == ("open", 1)
+
+
+def test_breaker_half_open_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=clock)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now += 10
+    assert breaker.allow()
+    # Only one probe at a time
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_is_released(server):
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=clock)
+    client = HttpClient(retry_policy=no_jitter_policy(max_attempts=1), breaker_factory=lambda: breaker)
+    async with client.lifespan():
+        await client.call("GET", str(server.make_url("/status/503")))
+        clock.now += 10
+
+        # The probe is cancelled before the host answers
+        probe = asyncio.create_task(client.call("GET", str(server.make_url("/slow")), params={"seconds": "1"}))
+        await asyncio.sleep(0.05)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        response = await client.call("GET", str(server.make_url("/echo")))
+    assert response.status == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_hung_attempt_is_retried_within_the_deadline(server):
+    client = HttpClient(retry_policy=no_jitter_policy(max_attempts=2))
+    calls = 0
+    original = client.request
+
+    async def request(method, url, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            # The first replica never answers in time
+            return await original(method, str(server.make_url("/slow")), params={"seconds": "5"}, **kwargs)
+        return await original(method, url, **kwargs)
+
+    client.request = request
+    async with client.lifespan():
+        response = await client.call("GET", str(server.make_url("/echo")), deadline_seconds=1)
+    assert response.status == 200
+    assert client.stats()["retries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_hedged_call_cancels_its_request(server):
+    client = HttpClient()
+    host = server.make_url("/").host
+    for _ in range(20):
+        client._latencies[host].record(0.5)
+
+    async with client.lifespan():
+        # Cancelled while waiting to hedge, before the host's p95
+        call = asyncio.create_task(client.call("GET", str(server.make_url("/slow")), params={"seconds": "1"}, hedge=True))
+        await asyncio.sleep(0.1)
+        assert server.in_flight["now"] == 1
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        await asyncio.sleep(0.05)
+        assert server.in_flight["now"] == 0
+
+
+def test_backoff_is_exponential_and_capped():
+    policy = RetryPolicy(backoff_base_seconds=0.1, backoff_max_seconds=0.3, random_=lambda: 1.0)
+    assert [policy.backoff(attempt) for attempt in (1, 2, 3, 4)] == [0.1, 0.2, 0.3, 0.3]
+    assert policy.can_retry("GET", 1) and not policy.can_retry("POST", 1)
+
+
+@pytest.mark.asyncio
+async def test_connection_error_is_raised_after_retries():
+    client = HttpClient(retry_policy=no_jitter_policy(max_attempts=2))
+    async with client.lifespan():
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await client.call("GET", "http://127.0.0.1:1/unreachable")
+    assert client.stats()["attempts"] == 2
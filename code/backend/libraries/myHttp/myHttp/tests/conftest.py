@@ -0,0 +1,89 @@
+import asyncio
+import json
+import pytest
+import pytest_asyncio
+import threading
+from aiohttp import web
+from myHttp.codec import MSGPACK, accepts_msgpack, decode, encode
+from aiohttp.test_utils import TestServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+@pytest_asyncio.fixture
+async def server():
+    """Local async server; records the peak number of requests in flight"""
+    in_flight = {"now": 0, "peak": 0}
+    hits = {}
+
+    async def echo(request):
+        body = await request.read()
+        return web.json_response({"method": request.method, "body": body.decode(), "peer": request.transport.get_extra_info("peername")[1]})
+
+    async def slow(request):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        try:
+            await asyncio.sleep(float(request.query.get("seconds", 1)))
+        finally:
+            in_flight["now"] -= 1
+        return web.json_response({"slow": True})
+
+    async def flaky(request):
+        # Fails the first `failures` requests of each key with a 503
+        key = request.match_info["key"]
+        hits[key] = hits.get(key, 0) + 1
+        if hits[key] <= int(request.query.get("failures", 1)):
+            return web.Response(status=503)
+        return web.json_response({"attempt": hits[key]})
+
+    async def negotiate(request):
+        # Echoes the decoded body, in MessagePack if asked for
+        data = decode(await request.read(), request.headers.get("Content-Type"))
+        if accepts_msgpack(request.headers.get("Accept")):
+            return web.Response(body=encode(data, MSGPACK), content_type=MSGPACK)
+        return web.json_response(data)
+
+    async def status(request):
+        return web.Response(status=int(request.match_info["code"]), text="status")
+
+    app = web.Application()
+    app.router.add_route("*", "/echo", echo)
+    app.router.add_get("/slow", slow)
+    app.router.add_route("*", "/flaky/{key}", flaky)
+    app.router.add_post("/negotiate", negotiate)
+    app.router.add_get("/status/{code}", status)
+    test_server = TestServer(app)
+    await test_server.start_server()
+    test_server.in_flight = in_flight
+    test_server.hits = hits
+    yield test_server
+    await test_server.close()
+
+
+@pytest.fixture
+def sync_server():
+    """Local threaded server for the blocking client"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            payload = json.dumps({"method": self.command, "body": body.decode(), "peer": self.client_address[1]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = do_PUT = do_DELETE = _reply
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
@@ -0,0 +1,74 @@
+"""
+Micro-benchmark of the per-request Python overhead of by-id lookups.
+
+Compares, for the client lookup run by every authenticated request:
+  - fresh:    select(Client).where(Client.id == user_id) built per request (the previous code)
+  - lambda:   the same query as a lambda_stmt
+  - prebuilt: myOrm.statements.client_by_id, built once with a bound parameter
+
+Queries run against an in-memory SQLite database through a synchronous
+session, so the timings are dominated by SQLAlchemy's Python work
+(statement construction, cache key generation, compiled cache lookup,
+ORM loading) rather than by network or driver latency.
+
+Usage (from libraries/myOrm, with the usual environment loaded):
+    python benchmarks/bench_statements.py [--iterations 20000]
+"""
+from myOrm.models import Base, Client
+from myOrm.statements import client_by_id
+from sqlalchemy import create_engine, lambda_stmt, select
+from sqlalchemy.orm import Session
+import argparse
+import time
+
+
+def fresh(user_id):
+    return select(Client).where(Client.id == user_id), None
+
+
+def lambda_(user_id):
+    return lambda_stmt(lambda: select(Client).where(Client.id == user_id)), None
+
+
+def prebuilt(user_id):
+    return client_by_id.statement, {"id": user_id}
+
+
+def measure(session: Session, build, iterations: int) -> tuple[float, float]:
+    """
+    Returns:
+        tuple[float, float]: Microseconds per lookup, and per statement construction alone
+    """
+    for _ in range(iterations // 10):
+        session.execute(*build(1)).scalar_one_or_none()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        session.execute(*build(1)).scalar_one_or_none()
+    lookup = (time.perf_counter() - start) / iterations * 1e6
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        build(1)
+    construction = (time.perf_counter() - start) / iterations * 1e6
+    return lookup, construction
+
+
+def main(iterations: int) -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Client(id=1, email="bench@zartex.com", password_hash="x", first_name="Bench", last_name="Mark"))
+        session.commit()
+
+    print(f"{'variant':<10}{'lookup (us)':>14}{'build (us)':>14}")
+    for name, build in (("fresh", fresh), ("lambda", lambda_), ("prebuilt", prebuilt)):
+        with Session(engine) as session:
+            lookup, construction = measure(session, build, iterations)
+        print(f"{name:<10}{lookup:>14.1f}{construction:>14.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    main(parser.parse_args().iterations)
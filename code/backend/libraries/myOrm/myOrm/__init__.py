@@ -1,3 +1,5 @@
 from .config import Config
 from .database import get_db_session
-from .models import Product, Image, InventoryHistory, Client, Address, Afiliado, CartItem, Sale, SaleItem, Return, ReturnItem, Discount, Review
\ No newline at end of file
+from .models import Product, Image, InventoryHistory, Client, Address, Afiliado, CartItem, Sale, SaleItem, Return, ReturnItem, Discount, Review
+from .statements import KeyLookup, client_by_id, product_by_id, address_by_id_and_client
+from .ledger import StockMovement, apply_movements, sale_movements, return_movements
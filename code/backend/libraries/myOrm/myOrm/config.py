@@ -1,5 +1,5 @@
 import os
-from myAws import SecretsManager
+from myAws import LazySecret, LazyValue
 import json
 
 class Config:
@@ -8,10 +8,10 @@ class Config:
     DATABASE_NAME = os.getenv("DATABASE_NAME")
     DATABASE_PORT = os.getenv("DATABASE_PORT")
 
-    # Get db user and password from secret manager
-    DATABASE_CREDENTIALS = json.loads(SecretsManager.get_secret(os.getenv("DATABASE_CREDENTIALS_SECRET_NAME")))
-    DATABASE_USER = DATABASE_CREDENTIALS["username"]
-    DATABASE_PASSWORD = DATABASE_CREDENTIALS["password"]
+    # Get db user and password from secret manager, resolved at startup (see myAws.bootstrap)
+    DATABASE_CREDENTIALS = LazySecret(os.getenv("DATABASE_CREDENTIALS_SECRET_NAME"), parse=json.loads)
+    DATABASE_USER = LazyValue(lambda config: config.DATABASE_CREDENTIALS["username"])
+    DATABASE_PASSWORD = LazyValue(lambda config: config.DATABASE_CREDENTIALS["password"])
 
-    DATABASE_URL = f"mysql+aiomysql://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}"
+    DATABASE_URL = LazyValue(lambda config: f"mysql+aiomysql://{config.DATABASE_USER}:{config.DATABASE_PASSWORD}@{config.DATABASE_HOST}:{config.DATABASE_PORT}/{config.DATABASE_NAME}")
     ECHO_SQL = True
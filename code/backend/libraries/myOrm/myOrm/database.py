@@ -11,9 +11,15 @@ from sqlalchemy.ext.asyncio import (
 
 class DatabaseSessionManager:
     def __init__(self, engine_kwargs: dict[str, Any] = None):
-        if engine_kwargs is None:
-            engine_kwargs = {}
-        
+        # The engine is created on first use, so that importing the package does
+        # not need the database credentials (resolved at startup, see myAws.bootstrap)
+        self._engine_kwargs = engine_kwargs
+        self._engine = None
+        self._sessionmaker = None
+
+    def init(self):
+        engine_kwargs = dict(self._engine_kwargs or {})
+
         # Configure connection pooling
         engine_kwargs.update({
             "pool_size": 5,  # Reduced pool size for tests
@@ -32,8 +38,13 @@ class DatabaseSessionManager:
             expire_on_commit=False
         )
 
+    def _ensure_initialized(self):
+        if self._engine is None:
+            self.init()
+
     @property
     def engine(self):
+        self._ensure_initialized()
         return self._engine
 
     async def close(self):
@@ -45,8 +56,7 @@ class DatabaseSessionManager:
 
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
-        if self._engine is None:
-            raise Exception("DatabaseSessionManager is not initialized")
+        self._ensure_initialized()
 
         async with self._engine.begin() as connection:
             try:
@@ -57,8 +67,7 @@ class DatabaseSessionManager:
 
     @contextlib.asynccontextmanager
     async def session(self) -> AsyncIterator[AsyncSession]:
-        if self._sessionmaker is None:
-            raise Exception("DatabaseSessionManager is not initialized")
+        self._ensure_initialized()
 
         session = self._sessionmaker()
         try:
@@ -0,0 +1,137 @@
+"""
+Inventory ledger: applies stock movements in the application, in one transaction.
+
+Stock used to be maintained by MySQL triggers: every sale_items row inserted
+an inventory_history row, which in turn updated its product. A checkout of
+N lines ran 2N hidden statements and locked the product rows in line order,
+so two checkouts sharing products in a different order deadlocked.
+
+apply_movements() instead takes a whole batch of movements and:
+  1. locks every product involved with one SELECT ... FOR UPDATE, in id order,
+     so concurrent batches always lock in the same order and queue rather
+     than deadlock;
+  2. computes the running quantity of each product in Python, rejecting the
+     batch if a product would go below zero;
+  3. inserts all inventory_history rows with one multi-row INSERT;
+  4. sets the new quantities with one UPDATE ... CASE over the products.
+
+It does not commit: the movements are part of the caller's transaction,
+e.g. together with the sale they belong to.
+"""
+from myExceptions import service as serviceExceptions
+from .models import InventoryHistory, Product
+from dataclasses import dataclass
+from sqlalchemy import case, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Iterable, Optional
+
+MOVEMENT_TYPES = ("shipment", "sale", "return", "adjustment")
+
+
+@dataclass(frozen=True)
+class StockMovement:
+    """
+    One change of the stock of a product.
+    """
+    product_id: int
+    quantity_change: int
+    movement_type: str
+    reference_number: Optional[str] = None
+    sale_id: Optional[int] = None
+    notes: Optional[str] = None
+
+
+def sale_movements(sale_id: int, lines: Iterable[tuple[int, int]]) -> list[StockMovement]:
+    """
+    Movements taking the lines of a sale out of stock.
+
+    Args:
+        sale_id (int): The sale
+        lines (Iterable[tuple[int, int]]): (product_id, quantity) of each sale item
+    """
+    return [
+        StockMovement(product_id, -quantity, "sale", reference_number=f"SALE-{sale_id}", sale_id=sale_id)
+        for product_id, quantity in lines
+    ]
+
+
+def return_movements(return_id: int, lines: Iterable[tuple[int, int]]) -> list[StockMovement]:
+    """
+    Movements putting the lines of a return back in stock.
+
+    Args:
+        return_id (int): The return
+        lines (Iterable[tuple[int, int]]): (product_id, quantity) of each returned item
+    """
+    return [
+        StockMovement(product_id, quantity, "return", reference_number=f"RETURN-{return_id}")
+        for product_id, quantity in lines
+    ]
+
+
+async def apply_movements(db_session: AsyncSession, movements: Iterable[StockMovement], allow_negative: bool = False) -> dict[int, int]:
+    """
+    Apply a batch of stock movements within the current transaction.
+
+    Movements of the same product are applied in the given order, each
+    recorded with its own inventory_history row.
+
+    Args:
+        db_session (AsyncSession): Session whose transaction the movements join (the caller commits)
+        movements (Iterable[StockMovement]): The movements to apply
+        allow_negative (bool): Accept quantities below zero (e.g. for adjustments)
+
+    Returns:
+        dict[int, int]: The new quantity of each product moved
+
+    Raises:
+        ValueError: If a movement has an unknown type
+        ResourceNotFoundError: If a product does not exist
+        InsufficientStockError: If a product would go below zero; nothing is written
+    """
+    movements = list(movements)
+    if not movements:
+        return {}
+    for movement in movements:
+        if movement.movement_type not in MOVEMENT_TYPES:
+            raise ValueError(f"Unknown movement type: {movement.movement_type}")
+
+    product_ids = sorted({movement.product_id for movement in movements})
+    result = await db_session.execute(
+        select(Product.id, Product.current_quantity)
+        .where(Product.id.in_(product_ids))
+        .order_by(Product.id)
+        .with_for_update()
+    )
+    quantities = dict(result.all())
+    missing = [product_id for product_id in product_ids if product_id not in quantities]
+    if missing:
+        raise serviceExceptions.ResourceNotFoundError(f"Products not found: {missing}")
+
+    history = []
+    for movement in movements:
+        previous = quantities[movement.product_id]
+        quantities[movement.product_id] = previous + movement.quantity_change
+        history.append({
+            "product_id": movement.product_id,
+            "previous_quantity": previous,
+            "quantity_change": movement.quantity_change,
+            "new_quantity": previous + movement.quantity_change,
+            "movement_type": movement.movement_type,
+            "reference_number": movement.reference_number,
+            "sale_id": movement.sale_id,
+            "notes": movement.notes,
+        })
+
+    short = sorted(product_id for product_id, quantity in quantities.items() if quantity < 0)
+    if short and not allow_negative:
+        raise serviceExceptions.InsufficientStockError(f"Insufficient stock for products: {short}")
+
+    await db_session.execute(insert(InventoryHistory).values(history))
+    await db_session.execute(
+        update(Product)
+        .where(Product.id.in_(product_ids))
+        .values(current_quantity=case(quantities, value=Product.id))
+        .execution_options(synchronize_session=False)
+    )
+    return quantities
@@ -81,6 +81,8 @@ class Client(Base):
     last_name = Column(String(100), nullable=False)
     date_joined = Column(DateTime, default=func.now())
     is_afiliado = Column(Boolean, nullable=False, default=False)
+    # Part of the access token claims; bumping it revokes every issued token
+    token_version = Column(Integer, nullable=False, default=0)
 
     # Relationships
     addresses = relationship("Address", back_populates="client", cascade="all, delete-orphan")
@@ -0,0 +1,98 @@
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock
+from myExceptions import service as serviceExceptions
+from myOrm.ledger import StockMovement, apply_movements, return_movements, sale_movements
+from myOrm.models import InventoryHistory, Product
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql
+
+
+@pytest_asyncio.fixture
+async def products(db_session):
+    """Two products with 10 and 5 units in stock."""
+    products = [
+        Product(name="Shirt", price=10, product_type="shirt", current_quantity=10, for_baby=False),
+        Product(name="Sock", price=2, product_type="sock", current_quantity=5, for_baby=False),
+    ]
+    db_session.add_all(products)
+    await db_session.commit()
+    return products
+
+
+async def history(db_session, product_id):
+    result = await db_session.execute(
+        select(InventoryHistory.previous_quantity, InventoryHistory.quantity_change, InventoryHistory.new_quantity)
+        .where(InventoryHistory.product_id == product_id)
+        .order_by(InventoryHistory.id)
+    )
+    return result.all()
+
+
+@pytest.mark.asyncio
+async def test_apply_sale_movements(db_session, products):
+    """Test that a sale updates the quantities and records one history row per line."""
+    shirt, sock = products
+    quantities = await apply_movements(db_session, sale_movements(7, [(shirt.id, 3), (sock.id, 1), (shirt.id, 2)]))
+    await db_session.commit()
+
+    assert quantities == {shirt.id: 5, sock.id: 4}
+    assert await history(db_session, shirt.id) == [(10, -3, 7), (7, -2, 5)]
+    await db_session.refresh(shirt)
+    assert shirt.current_quantity == 5
+
+
+@pytest.mark.asyncio
+async def test_apply_return_movements(db_session, products):
+    """Test that a return puts the units back in stock."""
+    shirt, _ = products
+    await apply_movements(db_session, return_movements(3, [(shirt.id, 4)]))
+    await db_session.commit()
+
+    await db_session.refresh(shirt)
+    assert shirt.current_quantity == 14
+
+
+@pytest.mark.asyncio
+async def test_insufficient_stock_writes_nothing(db_session, products):
+    """Test that a batch taking a product below zero is rejected as a whole."""
+    shirt_id, sock_id = (product.id for product in products)
+    with pytest.raises(serviceExceptions.InsufficientStockError):
+        await apply_movements(db_session, sale_movements(8, [(shirt_id, 1), (sock_id, 6)]))
+    await db_session.rollback()
+
+    assert await history(db_session, shirt_id) == []
+    assert await db_session.scalar(select(Product.current_quantity).where(Product.id == sock_id)) == 5
+
+
+@pytest.mark.asyncio
+async def test_missing_product(db_session, products):
+    """Test that a movement of an unknown product is rejected."""
+    with pytest.raises(serviceExceptions.ResourceNotFoundError):
+        await apply_movements(db_session, [StockMovement(999999, 1, "shipment")])
+
+
+@pytest.mark.asyncio
+async def test_unknown_movement_type():
+    """Test that movement types are checked before touching the database."""
+    db_session = AsyncMock()
+    with pytest.raises(ValueError):
+        await apply_movements(db_session, [StockMovement(1, 1, "gift")])
+    db_session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_products_are_locked_in_id_order_with_set_based_writes():
+    """Test that one locking SELECT, one INSERT and one UPDATE are issued, whatever the batch size."""
+    db_session = AsyncMock()
+    locked = MagicMock()
+    locked.all.return_value = [(2, 10), (5, 10), (9, 10)]
+    db_session.execute.side_effect = [locked, MagicMock(), MagicMock()]
+
+    await apply_movements(db_session, sale_movements(1, [(9, 1), (2, 1), (5, 1), (2, 1)]))
+
+    statements = [str(call.args[0].compile(dialect=mysql.dialect())) for call in db_session.execute.await_args_list]
+    assert len(statements) == 3
+    assert "ORDER BY products.id FOR UPDATE" in statements[0]
+    assert statements[1].startswith("INSERT INTO inventory_history")
+    assert statements[2].startswith("UPDATE products SET current_quantity=CASE")
@@ -0,0 +1,33 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from myOrm.models import Client, Address
+from myOrm.statements import KeyLookup, client_by_id, address_by_id_and_client
+
+
+def test_statement_is_built_once_with_bound_parameters():
+    sql = str(client_by_id.statement)
+    assert "WHERE clients.id = :id" in sql
+    # The same construct (and memoized cache key) is reused by every lookup
+    assert client_by_id.statement is client_by_id.statement
+
+
+def test_multiple_key_columns():
+    sql = str(address_by_id_and_client.statement)
+    assert "addresses.id = :id" in sql
+    assert "addresses.client_id = :client_id" in sql
+
+
+@pytest.mark.asyncio
+async def test_one_or_none_binds_the_key_values():
+    client = Client(id=1)
+    db_session = AsyncMock()
+    result = MagicMock()
+    result.scalars.return_value.one_or_none.return_value = client
+    db_session.execute.return_value = result
+
+    assert await client_by_id.one_or_none(db_session, 1) is client
+    db_session.execute.assert_awaited_once_with(client_by_id.statement, {"id": 1})
+
+    lookup = KeyLookup(Address, "id", "client_id")
+    await lookup.one_or_none(db_session, 5, 1)
+    assert db_session.execute.await_args.args[1] == {"id": 5, "client_id": 1}
@@ -2,6 +2,8 @@ from fastapi import FastAPI
 from routers import image_router
 from contextlib import asynccontextmanager
 from myOrm.database import sessionmanager
+from myAws import secret_store
+from myHttp import NegotiatedResponse, NegotiationMiddleware, http_client
 import uvicorn
 
 
@@ -11,13 +13,19 @@ async def lifespan(app: FastAPI):
     Function that handles startup and shutdown events.
     To understand more, read https://fastapi.tiangolo.com/advanced/events/
     """
-    yield
+    # Fetch every secret the configuration depends on, concurrently
+    await secret_store.resolve_all()
+    # Close the pooled outbound HTTP connections on shutdown
+    async with http_client.lifespan():
+        yield
     if sessionmanager._engine is not None:
         # Close the DB connection
         await sessionmanager.close()
 
 
-app = FastAPI(lifespan=lifespan)
+# JSON by default, MessagePack for the services that ask for it (Accept: application/msgpack)
+app = FastAPI(lifespan=lifespan, default_response_class=NegotiatedResponse)
+app.add_middleware(NegotiationMiddleware)
 
 # Include routers
 app.include_router(image_router)
@@ -1,7 +1,7 @@
 # own imports
-from myOrm.models import Image, Client
+from myOrm.models import Image
 from .schema import ImageResponse
-from myDependencies import validate_is_admin
+from myDependencies import Principal, validate_is_admin
 from myAws.s3 import S3
 from config import Config, logger
 import os
@@ -30,7 +30,7 @@ router = APIRouter(
 async def create_image(
     db_session: AsyncSession = Depends(get_db_session),
     file: UploadFile = File(...),
-    user: Client = Depends(validate_is_admin)
+    user: Principal = Depends(validate_is_admin)
 ):
     start_time = datetime.now()
     logger.info(f"Starting image upload process for file: {file.filename}")
@@ -141,7 +141,7 @@ async def get_image(
 async def delete_image(
     image_id: int,
     db_session: AsyncSession = Depends(get_db_session),
-    user: Client = Depends(validate_is_admin)
+    user: Principal = Depends(validate_is_admin)
 ):
     logger.info(f"Attempting to delete image with ID: {image_id}")
     db_image = await db_session.get(Image, image_id)
@@ -1,9 +1,10 @@
 import os
-from myAws import SecretsManager
+from myAws import LazySecret
 import json
+import tempfile
 
 class Config:
-    JWT_SECRET_KEY = SecretsManager.get_secret("JWT_SECRET_KEY")
+    JWT_SECRET_KEY = LazySecret("JWT_SECRET_KEY")
     JWT_ALGORITHM = "HS256"
 
     # Logging
@@ -18,5 +19,42 @@ class Config:
 
     S3_BUCKET_NAME = os.getenv("AWS_BUCKET_NAME")
 
+    # Catalog cache
+    CATALOG_CACHE_TTL_SECONDS = int(os.getenv("CATALOG_CACHE_TTL_SECONDS", "300"))
+    CATALOG_CACHE_MAX_PRODUCTS = int(os.getenv("CATALOG_CACHE_MAX_PRODUCTS", "10000"))
+    CATALOG_CACHE_MAX_PAGES = int(os.getenv("CATALOG_CACHE_MAX_PAGES", "2000"))
+
+    # Facet counts: upper bounds of the price buckets (the last bucket is open-ended)
+    CATALOG_PRICE_BUCKETS = [250, 500, 1000, 2000]
+    CATALOG_LOAD_BATCH_SIZE = 1000
+
+    # Catalog snapshot shared by the workers of a host (see helper.SharedCatalogSnapshot).
+    # A worker starting while the snapshot is younger than the max age maps it instead of rebuilding it.
+    CATALOG_SNAPSHOT_PATH = os.getenv("CATALOG_SNAPSHOT_PATH", os.path.join(
+        "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "zartex_catalog.snapshot"
+    ))
+    CATALOG_SNAPSHOT_MAX_AGE_SECONDS = int(os.getenv("CATALOG_SNAPSHOT_MAX_AGE_SECONDS", "300"))
+    # Product ids each snapshot file lists as changed over its last generations, so that
+    # workers reload only those rows; a worker further behind rebuilds its indexes
+    CATALOG_SNAPSHOT_CHANGE_LOG_SIZE = int(os.getenv("CATALOG_SNAPSHOT_CHANGE_LOG_SIZE", "10000"))
+    # Sales and returns move stock outside this service: each worker reconciles the
+    # snapshot's quantities with the products table at most this often
+    CATALOG_STOCK_TTL_SECONDS = int(os.getenv("CATALOG_STOCK_TTL_SECONDS", "30"))
+
+    # Bulk product import: rows per INSERT statement and transaction, uploads kept
+    # in memory up to the spool size (then on disk), errors reported per import
+    PRODUCT_IMPORT_BATCH_SIZE = int(os.getenv("PRODUCT_IMPORT_BATCH_SIZE", "500"))
+    PRODUCT_IMPORT_SPOOL_SIZE = 8 * 1024 * 1024
+    PRODUCT_IMPORT_MAX_ERRORS = 1000
+
+    # Exports: rows fetched per server-side cursor round trip, bytes per streamed chunk
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    EXPORT_CHUNK_SIZE = 64 * 1024
+
+    # bcrypt cost factor of new hashes; stored hashes with another cost are
+    # rehashed on login. Pick it with: python -m myEncryption.calibrate
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    # Concurrent bcrypt operations: PASSWORD_HASH_MAX_WORKERS, read by myEncryption.hashing
+
     def gen_object_name(self, size_name: str, filename: str):
         return f"images/{size_name}/{filename}"
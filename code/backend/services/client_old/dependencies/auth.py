@@ -1,8 +1,7 @@
 from fastapi import HTTPException, Header, Depends
 from .core import DBSessionDep
 from helper import Encryption
-from orm import Client, get_db_session
-from sqlalchemy import select
+from orm import Client, get_db_session, client_by_id
 from jwt.exceptions import InvalidTokenError
 
 
@@ -13,7 +12,7 @@ async def validate_is_authenticated(
     db = await db_async_gen.__anext__()
     try:
         payload = Encryption.verify_token(token)
-        user = await db.execute(select(Client).where(Client.id == payload["user_id"]))
+        user = await client_by_id.one_or_none(db, payload["user_id"])
         if not user:
             raise HTTPException(status_code=401, detail="Invalid token")
         return user
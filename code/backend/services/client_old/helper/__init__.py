@@ -1,2 +1,7 @@
 from .encryption import Encryption
 from .image import ImageHelper
+from .cache import CatalogCache
+from .facets import FacetIndex
+from .search import SearchIndex
+from .snapshot import CatalogSnapshot
+from .shared_snapshot import MappedCatalogSnapshot, SharedCatalogSnapshot
@@ -0,0 +1,165 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+import time
+
+
+class CatalogCache:
+    """
+    In-process read cache for the product catalog.
+
+    Holds two kinds of entries, each with its own TTL and size-bounded LRU:
+    single products keyed by id, and list pages keyed by the normalized
+    product filter plus the sort order and pagination window. Writes
+    invalidate exactly the entries they can affect: the product itself and every cached page whose
+    filter matches the product before or after the write.
+    """
+
+    def __init__(self, max_products: int = 10_000, max_pages: int = 2_000, ttl_seconds: float = 300, clock: Callable[[], float] = time.monotonic):
+        self.max_products = max_products
+        self.max_pages = max_pages
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._products: OrderedDict[int, tuple[float, Any]] = OrderedDict()
+        # page key -> (expires_at, value, product ids in the page)
+        self._pages: OrderedDict[Hashable, tuple[float, Any, frozenset]] = OrderedDict()
+        self._stats = {
+            "products": {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0},
+            "pages": {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0},
+        }
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+    @staticmethod
+    def normalize_filter(filters: dict) -> tuple:
+        """
+        Normalize a product filter into a hashable key.
+
+        Unset values (None or empty strings) are dropped, matching how
+        list_products ignores them, so equivalent filters share an entry.
+
+        Args:
+            filters (dict): The filter values, e.g. ProductFilter.model_dump()
+
+        Returns:
+            tuple: Sorted (field, value) pairs of the active filters
+        """
+        return tuple(sorted(
+            (field, float(value) if field in ("min_price", "max_price") else value)
+            for field, value in filters.items()
+            if value is not None and value != ""
+        ))
+
+    @staticmethod
+    def filter_matches(filter_key: tuple, row: dict) -> bool:
+        """
+        Check whether a product row satisfies a normalized filter.
+
+        Args:
+            filter_key (tuple): A key produced by normalize_filter
+            row (dict): The product values (see routers.product.catalog.product_to_row)
+
+        Returns:
+            bool: True if the product belongs to the filter's result set
+        """
+        for field, value in filter_key:
+            if field == "min_price":
+                if row["price"] < value:
+                    return False
+            elif field == "max_price":
+                if row["price"] > value:
+                    return False
+            elif row.get(field) != value:
+                return False
+        return True
+
+    # ------------------------------------------------------------------
+    # Products
+    # ------------------------------------------------------------------
+    def get_product(self, product_id: int) -> Optional[Any]:
+        entry = self._products.get(product_id)
+        if entry is None or entry[0] <= self._clock():
+            if entry is not None:
+                del self._products[product_id]
+            self._stats["products"]["misses"] += 1
+            return None
+        self._products.move_to_end(product_id)
+        self._stats["products"]["hits"] += 1
+        return entry[1]
+
+    def set_product(self, product_id: int, value: Any) -> None:
+        self._products[product_id] = (self._clock() + self.ttl_seconds, value)
+        self._products.move_to_end(product_id)
+        while len(self._products) > self.max_products:
+            self._products.popitem(last=False)
+            self._stats["products"]["evictions"] += 1
+
+    # ------------------------------------------------------------------
+    # Pages
+    # ------------------------------------------------------------------
+    def get_page(self, filter_key: tuple, skip: int, limit: int, sort: Optional[str] = None) -> Optional[Any]:
+        key = (filter_key, sort, skip, limit)
+        entry = self._pages.get(key)
+        if entry is None or entry[0] <= self._clock():
+            if entry is not None:
+                del self._pages[key]
+            self._stats["pages"]["misses"] += 1
+            return None
+        self._pages.move_to_end(key)
+        self._stats["pages"]["hits"] += 1
+        return entry[1]
+
+    def set_page(self, filter_key: tuple, skip: int, limit: int, value: Any, product_ids, sort: Optional[str] = None) -> None:
+        key = (filter_key, sort, skip, limit)
+        self._pages[key] = (self._clock() + self.ttl_seconds, value, frozenset(product_ids))
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+            self._stats["pages"]["evictions"] += 1
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+    def invalidate_product(self, product_id: int, *rows: Optional[dict]) -> None:
+        """
+        Drop every entry a write to a product can affect.
+
+        Args:
+            product_id (int): The written product
+            *rows (dict | None): The product values before and/or after the write.
+                A page is dropped if it contains the product or if its filter
+                matches any of the given rows, since inserting or removing a
+                matching product shifts every page of that filter.
+        """
+        if self._products.pop(product_id, None) is not None:
+            self._stats["products"]["invalidations"] += 1
+
+        rows = [row for row in rows if row is not None]
+        stale = [
+            key for key, (_, _, ids) in self._pages.items()
+            if product_id in ids or any(self.filter_matches(key[0], row) for row in rows)
+        ]
+        for key in stale:
+            del self._pages[key]
+        self._stats["pages"]["invalidations"] += len(stale)
+
+    def clear(self) -> None:
+        self._products.clear()
+        self._pages.clear()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:
+        """
+        Return hit/miss counters and hit rates for both namespaces.
+        """
+        result = {}
+        for namespace, counters in self._stats.items():
+            lookups = counters["hits"] + counters["misses"]
+            result[namespace] = {
+                **counters,
+                "size": len(self._products if namespace == "products" else self._pages),
+                "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+            }
+        return result
@@ -0,0 +1,192 @@
+from bisect import bisect_right
+from typing import Any, Optional
+import numpy as np
+
+
+class FacetIndex:
+    """
+    In-memory faceted navigation counts for the product catalog.
+
+    Every product occupies a slot; each facet value keeps a bitmap (a Python
+    int) of the slots holding that value. Counts for a filter are computed by
+    AND-ing the bitmaps of the active filters and popcounting the result, so
+    answering a query never touches the database.
+
+    Facets follow the usual storefront semantics: the counts of a facet ignore
+    that facet's own filter, so the user can see the alternatives to the value
+    they picked.
+
+    Price ranges are not bucket-aligned, so prices are also kept in a NumPy
+    array by slot and a range is turned into a bitmap with one vectorized
+    comparison.
+    """
+
+    FACETS = ("product_type", "size", "color", "line", "for_baby", "price_bucket", "in_stock")
+
+    def __init__(self, price_edges: list[float]):
+        """
+        Args:
+            price_edges (list[float]): Ascending upper bounds of the price buckets;
+                a last open-ended bucket holds prices above the final edge
+        """
+        self.price_edges = sorted(price_edges)
+        self._labels = self._bucket_labels(self.price_edges)
+        self._slots: dict[int, int] = {}
+        self._free: list[int] = []
+        self._rows: dict[int, dict] = {}
+        self._live = 0
+        self._bitmaps: dict[str, dict[Any, int]] = {facet: {} for facet in self.FACETS}
+        # price by slot, NaN for free slots so that no range matches them
+        self._prices = np.full(64, np.nan)
+
+    @staticmethod
+    def _bucket_labels(edges: list[float]) -> list[str]:
+        bounds = [0, *edges]
+        labels = [f"{lower:g}-{upper:g}" for lower, upper in zip(bounds, bounds[1:])]
+        labels.append(f"{bounds[-1]:g}+")
+        return labels
+
+    def price_bucket(self, price: float) -> str:
+        return self._labels[bisect_right(self.price_edges, price)]
+
+    def _facet_values(self, row: dict) -> dict[str, Any]:
+        return {
+            "product_type": row["product_type"],
+            "size": row["size"],
+            "color": row["color"],
+            "line": row["line"],
+            "for_baby": row["for_baby"],
+            "price_bucket": self.price_bucket(row["price"]),
+            "in_stock": row["current_quantity"] > 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def upsert(self, row: dict) -> None:
+        """
+        Add a product or apply an update to it.
+
+        Args:
+            row (dict): The product values (see routers.product.catalog.product_to_row)
+        """
+        product_id = row["id"]
+        if product_id in self._slots:
+            slot = self._slots[product_id]
+            self._clear_slot(slot)
+        else:
+            slot = self._free.pop() if self._free else len(self._slots) + len(self._free)
+            self._slots[product_id] = slot
+
+        bit = 1 << slot
+        for facet, value in self._facet_values(row).items():
+            if value is None:
+                continue
+            bitmaps = self._bitmaps[facet]
+            bitmaps[value] = bitmaps.get(value, 0) | bit
+        if slot >= len(self._prices):
+            prices = np.full(max(slot + 1, 2 * len(self._prices)), np.nan)
+            prices[:len(self._prices)] = self._prices
+            self._prices = prices
+        self._prices[slot] = row["price"]
+        self._rows[slot] = dict(row)
+        self._live |= bit
+
+    def remove(self, product_id: int) -> None:
+        slot = self._slots.pop(product_id, None)
+        if slot is None:
+            return
+        self._clear_slot(slot)
+        del self._rows[slot]
+        self._prices[slot] = np.nan
+        self._free.append(slot)
+
+    def update_stock(self, product_id: int, quantity: int) -> None:
+        """
+        Apply a stock change without a full product write.
+
+        Args:
+            product_id (int): The product whose stock changed
+            quantity (int): The new current quantity
+        """
+        slot = self._slots.get(product_id)
+        if slot is None:
+            return
+        row = self._rows[slot]
+        if (row["current_quantity"] > 0) == (quantity > 0):
+            row["current_quantity"] = quantity
+            return
+        self.upsert({**row, "current_quantity": quantity})
+
+    def clear(self) -> None:
+        self._slots.clear()
+        self._free.clear()
+        self._rows.clear()
+        self._live = 0
+        self._bitmaps = {facet: {} for facet in self.FACETS}
+        self._prices = np.full(64, np.nan)
+
+    def _clear_slot(self, slot: int) -> None:
+        mask = ~(1 << slot)
+        for facet, value in self._facet_values(self._rows[slot]).items():
+            if value is None:
+                continue
+            bitmaps = self._bitmaps[facet]
+            remaining = bitmaps[value] & mask
+            if remaining:
+                bitmaps[value] = remaining
+            else:
+                del bitmaps[value]
+        self._live &= mask
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _price_mask(self, min_price: Optional[float], max_price: Optional[float]) -> int:
+        """
+        Bitmap of the products whose price lies within [min_price, max_price].
+        """
+        in_range = ~np.isnan(self._prices)
+        if min_price is not None:
+            in_range &= self._prices >= min_price
+        if max_price is not None:
+            in_range &= self._prices <= max_price
+        return int.from_bytes(np.packbits(in_range, bitorder="little").tobytes(), "little")
+
+    def counts(self, filter_key: tuple) -> dict:
+        """
+        Count the products per facet value given the active filters.
+
+        Args:
+            filter_key (tuple): Normalized ProductFilter (see CatalogCache.normalize_filter)
+
+        Returns:
+            dict: {"total": int, "facets": {facet: {value: count}}}
+        """
+        filters = dict(filter_key)
+        masks: dict[str, int] = {}
+        for facet in ("product_type", "size", "color", "line", "for_baby"):
+            if facet in filters:
+                masks[facet] = self._bitmaps[facet].get(filters[facet], 0)
+        if "min_price" in filters or "max_price" in filters:
+            masks["price_bucket"] = self._price_mask(filters.get("min_price"), filters.get("max_price"))
+
+        total = self._live
+        for mask in masks.values():
+            total &= mask
+
+        facets = {}
+        for facet in self.FACETS:
+            base = self._live
+            for other, mask in masks.items():
+                if other != facet:
+                    base &= mask
+            facets[facet] = {
+                value: count
+                for value, bitmap in self._bitmaps[facet].items()
+                if (count := (base & bitmap).bit_count())
+            }
+        return {"total": total.bit_count(), "facets": facets}
@@ -0,0 +1,164 @@
+from bisect import bisect_left, insort
+import math
+import re
+import unicodedata
+
+
+class SearchIndex:
+    """
+    In-process inverted index for full-text product search.
+
+    Indexes the name, product_type, line and color of each product. Queries
+    are tokenized like documents; every query token must match a document
+    term exactly or as a prefix (search-as-you-type), and matches are ranked
+    with BM25 over field-weighted term frequencies.
+    """
+
+    FIELD_WEIGHTS = {"name": 3.0, "product_type": 1.5, "line": 1.5, "color": 1.0}
+    PREFIX_PENALTY = 0.7
+    MIN_PREFIX_LENGTH = 2
+    K1 = 1.2
+    B = 0.75
+
+    _TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+    def __init__(self):
+        # term -> {product_id: weighted term frequency}
+        self._postings: dict[str, dict[int, float]] = {}
+        self._doc_terms: dict[int, dict[str, float]] = {}
+        self._doc_lengths: dict[int, float] = {}
+        self._total_length = 0.0
+        # sorted vocabulary, for prefix lookups
+        self._vocabulary: list[str] = []
+
+    @classmethod
+    def tokenize(cls, text: str) -> list[str]:
+        """
+        Split text into lowercase, accent-free alphanumeric tokens.
+
+        Args:
+            text (str): The text to tokenize
+
+        Returns:
+            list[str]: The tokens, e.g. "Cobija Pequeña" -> ["cobija", "pequena"]
+        """
+        if not text:
+            return []
+        decomposed = unicodedata.normalize("NFKD", text.lower())
+        stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+        return cls._TOKEN_RE.findall(stripped)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def upsert(self, row: dict) -> None:
+        """
+        Index a product, replacing any previous version of it.
+
+        Args:
+            row (dict): The product values (see routers.product.catalog.product_to_row)
+        """
+        product_id = row["id"]
+        self.remove(product_id)
+
+        terms: dict[str, float] = {}
+        for field, weight in self.FIELD_WEIGHTS.items():
+            for token in self.tokenize(row.get(field)):
+                terms[token] = terms.get(token, 0.0) + weight
+        if not terms:
+            return
+
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._vocabulary, term)
+            postings[product_id] = frequency
+        self._doc_terms[product_id] = terms
+        length = sum(terms.values())
+        self._doc_lengths[product_id] = length
+        self._total_length += length
+
+    def remove(self, product_id: int) -> None:
+        terms = self._doc_terms.pop(product_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[product_id]
+            if not postings:
+                del self._postings[term]
+                del self._vocabulary[bisect_left(self._vocabulary, term)]
+        self._total_length -= self._doc_lengths.pop(product_id)
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._doc_terms.clear()
+        self._doc_lengths.clear()
+        self._total_length = 0.0
+        self._vocabulary.clear()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def _expand(self, token: str) -> dict[str, float]:
+        """
+        Map a query token to the vocabulary terms it matches, with their boost.
+        """
+        matches = {}
+        if token in self._postings:
+            matches[token] = 1.0
+        if len(token) >= self.MIN_PREFIX_LENGTH:
+            index = bisect_left(self._vocabulary, token)
+            while index < len(self._vocabulary) and self._vocabulary[index].startswith(token):
+                matches.setdefault(self._vocabulary[index], self.PREFIX_PENALTY)
+                index += 1
+        return matches
+
+    def search(self, query: str, skip: int = 0, limit: int = 20) -> list[tuple[int, float]]:
+        """
+        Rank the products matching every token of the query.
+
+        Args:
+            query (str): Free-text query
+            skip (int): Number of results to skip (pagination)
+            limit (int): Maximum number of results to return
+
+        Returns:
+            list[tuple[int, float]]: (product_id, score) pairs, best first
+        """
+        tokens = list(dict.fromkeys(self.tokenize(query)))
+        if not tokens or not self._doc_terms:
+            return []
+
+        documents = len(self._doc_terms)
+        average_length = self._total_length / documents
+        scores: dict[int, float] = {}
+        for position, token in enumerate(tokens):
+            token_scores: dict[int, float] = {}
+            for term, boost in self._expand(token).items():
+                postings = self._postings[term]
+                idf = math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+                for product_id, frequency in postings.items():
+                    norm = self.K1 * (1 - self.B + self.B * self._doc_lengths[product_id] / average_length)
+                    score = boost * idf * frequency * (self.K1 + 1) / (frequency + norm)
+                    if score > token_scores.get(product_id, 0.0):
+                        token_scores[product_id] = score
+
+            # Every token must match: intersect with the previous tokens' matches
+            if position == 0:
+                scores = token_scores
+            else:
+                scores = {
+                    product_id: score + token_scores[product_id]
+                    for product_id, score in scores.items()
+                    if product_id in token_scores
+                }
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[skip:skip + limit]
@@ -0,0 +1,490 @@
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Iterator, Optional
+from .snapshot import CatalogSnapshot
+import numpy as np
+import asyncio
+import fcntl
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+
+# File layout (little endian, every section 8-byte aligned):
+#   header        MAGIC, version, change count, count, generation, built_at,
+#                 dictionary and payload sizes, changes_since
+#   columns       one array of `count` items per CatalogSnapshot.COLUMNS entry, rows ordered by id
+#   offsets       int64[count + 1], start of each product's payload in the payload section
+#   dictionary    JSON {coded column: [values in code order]}
+#   payloads      the concatenated product payloads
+#   changes       int64[change count] product ids, then int64[change count] generations:
+#                 every product written after generation changes_since, and the
+#                 generation it was last written in
+MAGIC = b"ZXCATLG\0"
+VERSION = 2
+_HEADER = struct.Struct("<8sIIQQdQQQ")
+_HEADER_SIZE = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _layout(count: int) -> tuple[dict[str, int], int]:
+    """
+    Compute the offset of each column and of the payload offsets array.
+    """
+    offsets = {}
+    position = _HEADER_SIZE
+    for name, (dtype, _) in CatalogSnapshot.COLUMNS.items():
+        offsets[name] = position
+        position = _align(position + count * np.dtype(dtype).itemsize)
+    offsets["payload_offsets"] = position
+    position = _align(position + (count + 1) * 8)
+    return offsets, position
+
+
+def write_snapshot(
+    snapshot: CatalogSnapshot,
+    file,
+    generation: int,
+    changes_since: Optional[int] = None,
+    changes: Optional[dict[int, int]] = None
+) -> None:
+    """
+    Serialize a snapshot's live products into the shared binary layout.
+
+    Args:
+        snapshot (CatalogSnapshot): The snapshot to write
+        file: A binary file object opened for writing
+        generation (int): Version number of the snapshot, increased on every publish
+        changes_since (int | None): Generation after which `changes` lists every
+            written product (default: this generation, nothing is listed)
+        changes (dict[int, int] | None): Generation each product was last written in
+    """
+    changes = changes or {}
+    columns, dictionary = snapshot.columns()
+    count = len(columns["id"])
+    payloads = [snapshot.payload(int(product_id)) or b"" for product_id in columns["id"]]
+    payload_offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum([len(payload) for payload in payloads], out=payload_offsets[1:])
+    dictionary_bytes = json.dumps(dictionary).encode()
+
+    offsets, data_start = _layout(count)
+    file.write(_HEADER.pack(
+        MAGIC, VERSION, len(changes), count, generation, snapshot.built_at,
+        len(dictionary_bytes), int(payload_offsets[-1]),
+        generation if changes_since is None else changes_since,
+    ).ljust(_HEADER_SIZE, b"\0"))
+    for name, (dtype, _) in CatalogSnapshot.COLUMNS.items():
+        file.seek(offsets[name])
+        file.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+    file.seek(offsets["payload_offsets"])
+    file.write(payload_offsets.tobytes())
+    file.seek(data_start)
+    file.write(dictionary_bytes)
+    for payload in payloads:
+        file.write(payload)
+    end = data_start + len(dictionary_bytes) + int(payload_offsets[-1])
+    file.write(b"\0" * (_align(end) - end))
+    file.write(np.fromiter(changes.keys(), dtype=np.int64, count=len(changes)).tobytes())
+    file.write(np.fromiter(changes.values(), dtype=np.int64, count=len(changes)).tobytes())
+
+
+class MappedCatalogSnapshot(CatalogSnapshot):
+    """
+    Read-only CatalogSnapshot backed by a memory-mapped snapshot file.
+
+    Columns are zero-copy NumPy views over the mapping, so every process
+    mapping the same file shares one copy of the catalog in the page cache.
+    Rows are stored ordered by id, so products are located by binary search.
+    Use thaw() to obtain a mutable copy, and changed_since() to find which
+    products differ from an earlier generation.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): The snapshot file to map
+
+        Raises:
+            ValueError: If the file is not a snapshot of a supported version
+        """
+        with open(path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.identity = (stat.st_dev, stat.st_ino)
+
+        (
+            magic, version, change_count, count, generation, built_at,
+            dictionary_length, payload_length, changes_since,
+        ) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Unsupported catalog snapshot file: {path}")
+        self.generation = generation
+        self.changes_since = changes_since
+        self.built_at = built_at
+        self.ready = True
+        self.changed = None
+
+        offsets, data_start = _layout(count)
+        self._columns = {
+            name: np.frombuffer(self._mmap, dtype=dtype, count=count, offset=offsets[name])
+            for name, (dtype, _) in self.COLUMNS.items()
+        }
+        self._payload_offsets = np.frombuffer(
+            self._mmap, dtype=np.int64, count=count + 1, offset=offsets["payload_offsets"]
+        )
+        dictionary = json.loads(self._mmap[data_start:data_start + dictionary_length])
+        self._codes = {
+            column: {value: code for code, value in enumerate(values)}
+            for column, values in dictionary.items()
+        }
+        self._payload_start = data_start + dictionary_length
+        self._size = self._capacity = count
+        changes_start = _align(self._payload_start + payload_length)
+        self._changed_ids = np.frombuffer(self._mmap, dtype=np.int64, count=change_count, offset=changes_start)
+        self._changed_generations = np.frombuffer(
+            self._mmap, dtype=np.int64, count=change_count, offset=changes_start + change_count * 8
+        )
+
+    def _slot(self, product_id: int) -> Optional[int]:
+        ids = self._columns["id"]
+        slot = int(np.searchsorted(ids, product_id))
+        if slot < self._size and ids[slot] == product_id:
+            return slot
+        return None
+
+    def _read_only(self, *args, **kwargs) -> None:
+        raise TypeError("A mapped catalog snapshot is read-only, thaw() it first")
+
+    upsert = remove = update_stock = set_payload = _read_only
+
+    def __len__(self) -> int:
+        return self._size
+
+    def payload(self, product_id: int) -> Optional[bytes]:
+        slot = self._slot(product_id)
+        if slot is None:
+            return None
+        start = self._payload_start + int(self._payload_offsets[slot])
+        end = self._payload_start + int(self._payload_offsets[slot + 1])
+        return self._mmap[start:end] if end > start else None
+
+    def payloads(self) -> Iterator[tuple[int, bytes]]:
+        for slot, product_id in enumerate(self._columns["id"].tolist()):
+            start, end = self._payload_offsets[slot:slot + 2].tolist()
+            if end > start:
+                yield product_id, self._mmap[self._payload_start + start:self._payload_start + end]
+
+    def changes(self) -> dict[int, int]:
+        """
+        The generation each product written after changes_since was last written in.
+        """
+        return dict(zip(self._changed_ids.tolist(), self._changed_generations.tolist()))
+
+    def changed_since(self, generation: int) -> Optional[list[int]]:
+        """
+        Ids of the products written (or removed) after a generation.
+
+        Args:
+            generation (int): An earlier generation, e.g. the one a process last indexed
+
+        Returns:
+            list[int] | None: The product ids, or None if the file does not go
+                back that far (a full build or a long series of writes since):
+                the caller must then reload the whole snapshot
+        """
+        if generation < self.changes_since or generation > self.generation:
+            return None
+        return self._changed_ids[self._changed_generations > generation].tolist()
+
+    def thaw(self) -> CatalogSnapshot:
+        """
+        Copy the mapped snapshot into a mutable CatalogSnapshot.
+
+        Returns:
+            CatalogSnapshot: An independent snapshot holding the same products
+        """
+        snapshot = CatalogSnapshot(capacity=max(self._size, 1))
+        for name, array in self._columns.items():
+            snapshot._columns[name][:self._size] = array
+        snapshot._size = self._size
+        snapshot._slots = {product_id: slot for slot, product_id in enumerate(self._columns["id"].tolist())}
+        snapshot._codes = {column: dict(codes) for column, codes in self._codes.items()}
+        snapshot._payloads = dict(self.payloads())
+        snapshot.built_at = self.built_at
+        snapshot.ready = True
+        snapshot.changed = set()
+        return snapshot
+
+
+class SharedCatalogSnapshot:
+    """
+    A catalog snapshot shared by every worker process on the host.
+
+    The snapshot lives in a file that workers map read-only. Publishing
+    writes a complete new file next to it and atomically renames it over
+    the old one, so readers never see a partial snapshot: they keep using
+    their current mapping until they notice the file was replaced (a new
+    inode) and remap it. Writers serialize on an flock so concurrent
+    updates from different workers are applied one after the other.
+
+    Each file also lists the products written over its last generations
+    (up to change_log_size of them), so a process can bring per-process
+    structures up to date by reloading only those rows.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        on_change: Optional[Callable[[MappedCatalogSnapshot], None]] = None,
+        change_log_size: int = 10_000
+    ):
+        """
+        Args:
+            path (str): Location of the snapshot file, ideally on a tmpfs such as /dev/shm
+            on_change (callable | None): Called with every new snapshot this process
+                maps or publishes through update() or submit(), e.g. to update
+                per-process indexes (see MappedCatalogSnapshot.changed_since)
+            change_log_size (int): Most product ids listed as changed in a file;
+                the oldest generations are dropped beyond it
+        """
+        self.path = path
+        self._on_change = on_change
+        self.change_log_size = change_log_size
+        self._snapshot: Optional[MappedCatalogSnapshot] = None
+        self._pending: list[tuple[Callable[[CatalogSnapshot], None], asyncio.Future]] = []
+        self._flusher: Optional[asyncio.Task] = None
+
+    def current(self) -> Optional[MappedCatalogSnapshot]:
+        """
+        Return the latest published snapshot, remapping it if the file was replaced.
+
+        Returns:
+            MappedCatalogSnapshot | None: The snapshot, or None if none was published yet
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return self._snapshot
+        if self._snapshot is None or (stat.st_dev, stat.st_ino) != self._snapshot.identity:
+            # The previous mapping is released once no request uses its arrays anymore
+            self._snapshot = MappedCatalogSnapshot(self.path)
+            if self._on_change is not None:
+                self._on_change(self._snapshot)
+        return self._snapshot
+
+    def age(self) -> Optional[float]:
+        """
+        Seconds since the current snapshot was built from the database, None if there is none.
+        """
+        snapshot = self.current()
+        return None if snapshot is None else time.time() - snapshot.built_at
+
+    @contextmanager
+    def lock(self, name: str = "write"):
+        """
+        Hold an exclusive lock shared by every process using the snapshot file.
+
+        Args:
+            name (str): Which lock; "write" guards publishing, other names can
+                serialize longer work (e.g. a full rebuild) without blocking writers
+        """
+        with open(f"{self.path}.{name}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @asynccontextmanager
+    async def acquire(self, name: str = "write", poll_interval: float = 0.05):
+        """
+        Same lock as lock(), for coroutines: waiting for it does not block the event loop.
+
+        Args:
+            name (str): Which lock, see lock()
+            poll_interval (float): Seconds between attempts while another holder has it
+        """
+        with open(f"{self.path}.{name}.lock", "a") as lock_file:
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    await asyncio.sleep(poll_interval)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> Optional[MappedCatalogSnapshot]:
+        """
+        Map the file as currently published, without calling on_change.
+        """
+        try:
+            return MappedCatalogSnapshot(self.path)
+        except FileNotFoundError:
+            return None
+
+    def _change_log(self, base: Optional[MappedCatalogSnapshot], snapshot: CatalogSnapshot, generation: int) -> tuple[int, dict[int, int]]:
+        """
+        Compute changes_since and the changes of a new generation written on top of base.
+        """
+        if snapshot.changed is None:
+            # Built from scratch: nothing is known about earlier generations
+            return generation, {}
+        since, log = (base.changes_since, base.changes()) if base is not None else (0, {})
+        log.update(dict.fromkeys(snapshot.changed, generation))
+        if len(log) > self.change_log_size:
+            # Drop whole generations, so the log stays complete after `since`
+            since = sorted(log.values())[len(log) - self.change_log_size - 1]
+            log = {product_id: written for product_id, written in log.items() if written > since}
+        return since, log
+
+    def _write(self, snapshot: CatalogSnapshot, base: Optional[MappedCatalogSnapshot]) -> MappedCatalogSnapshot:
+        generation = base.generation + 1 if base is not None else 1
+        changes_since, changes = self._change_log(base, snapshot, generation)
+        temporary_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporary_path, "wb") as file:
+                write_snapshot(snapshot, file, generation, changes_since, changes)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary_path, self.path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        return MappedCatalogSnapshot(self.path)
+
+    def publish(self, snapshot: CatalogSnapshot) -> MappedCatalogSnapshot:
+        """
+        Atomically replace the shared snapshot. The caller must hold lock("write").
+
+        Args:
+            snapshot (CatalogSnapshot): The new catalog contents
+
+        Returns:
+            MappedCatalogSnapshot: The published snapshot, mapped by this process
+        """
+        # This process already holds the new state, so on_change is not called
+        self._snapshot = self._write(snapshot, self._read())
+        return self._snapshot
+
+    def rebase(self, snapshot: CatalogSnapshot, since: int) -> Optional[list[int]]:
+        """
+        Carry the products written after a generation over from the published
+        snapshot into one built meanwhile. The caller must hold lock("write")
+        until it publishes the result.
+
+        A snapshot built from a scan of the database may hold rows read before
+        a write that update() or submit() published during the scan; publishing
+        it as is would undo that write. The published rows are at least as
+        recent as the scanned ones: any write committed after them is
+        published after the caller releases the lock, on top of its snapshot.
+
+        Args:
+            snapshot (CatalogSnapshot): The snapshot about to be published
+            since (int): Generation of the shared snapshot when the build started
+
+        Returns:
+            list[int] | None: The product ids carried over, or None if the
+                published snapshot does not list its changes back to `since`
+        """
+        current = self._read()
+        if current is None:
+            return []
+        changed = current.changed_since(since)
+        for product_id in changed or ():
+            snapshot.copy_product(current, product_id)
+        return changed
+
+    async def replace(self, snapshot: CatalogSnapshot) -> MappedCatalogSnapshot:
+        """
+        Take lock("write") and publish a snapshot from a worker thread.
+
+        Writing and syncing the file is proportional to the catalog size, so
+        coroutines use this rather than publish() to keep the event loop free.
+
+        Args:
+            snapshot (CatalogSnapshot): The new catalog contents
+
+        Returns:
+            MappedCatalogSnapshot: The published snapshot, mapped by this process
+        """
+        def locked_publish() -> MappedCatalogSnapshot:
+            with self.lock():
+                return self.publish(snapshot)
+
+        return await asyncio.to_thread(locked_publish)
+
+    def _apply(self, changes: list[Callable[[CatalogSnapshot], None]]) -> MappedCatalogSnapshot:
+        """
+        Apply changes on top of the latest published snapshot and publish the result.
+        """
+        with self.lock():
+            base = self._read()
+            snapshot = base.thaw() if base is not None else CatalogSnapshot()
+            for apply in changes:
+                apply(snapshot)
+            return self._write(snapshot, base)
+
+    def _install(self, published: MappedCatalogSnapshot) -> None:
+        self._snapshot = published
+        if self._on_change is not None:
+            self._on_change(published)
+
+    def update(self, apply: Callable[[CatalogSnapshot], None]) -> MappedCatalogSnapshot:
+        """
+        Apply a change on top of the latest snapshot and publish the result.
+
+        Args:
+            apply (callable): Mutates the CatalogSnapshot it is given
+
+        Returns:
+            MappedCatalogSnapshot: The published snapshot
+        """
+        published = self._apply([apply])
+        self._install(published)
+        return published
+
+    async def submit(self, apply: Callable[[CatalogSnapshot], None]) -> MappedCatalogSnapshot:
+        """
+        Like update(), for coroutines: the snapshot is rewritten in a worker thread.
+
+        Changes submitted while a rewrite is running are applied together by
+        the next one, so a burst of writes costs one rewrite of the file
+        (and one reload in the other workers) instead of one per write.
+
+        Args:
+            apply (callable): Mutates the CatalogSnapshot it is given
+
+        Returns:
+            MappedCatalogSnapshot: The first published snapshot including the change
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((apply, future))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = loop.create_task(self._flush())
+        # A cancelled caller does not cancel the publish the other changes wait on
+        return await asyncio.shield(future)
+
+    async def _flush(self) -> None:
+        while self._pending:
+            batch, self._pending = self._pending, []
+            try:
+                published = await asyncio.to_thread(self._apply, [apply for apply, _ in batch])
+                self._install(published)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(published)
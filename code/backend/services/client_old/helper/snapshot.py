@@ -0,0 +1,253 @@
+from datetime import datetime
+from typing import Iterator, Optional
+import numpy as np
+import time
+
+
+class CatalogSnapshot:
+    """
+    Columnar in-memory copy of the products table for filtering and sorting.
+
+    Each filterable column lives in a NumPy array indexed by slot; string
+    columns are dictionary encoded into int32 codes (-1 for NULL). A
+    ProductFilter is evaluated as a conjunction of boolean masks and the
+    result is ordered with a stable argsort, so a listing costs a few
+    vectorized passes over the arrays instead of a database round trip.
+
+    Each product may also carry an opaque payload (its serialized response),
+    so a page can be rendered from the snapshot alone.
+
+    A snapshot obtained with thaw() records the ids of the products written
+    since in `changed`, so that publishing it can tell readers which rows to
+    reload; it is None for a snapshot built from scratch.
+    """
+
+    CODED_COLUMNS = ("product_type", "size", "color", "line")
+    # name -> (dtype, fill value of unused slots)
+    COLUMNS = {
+        "id": (np.int64, 0),
+        "price": (np.float64, 0),
+        "created_at": (np.float64, 0),
+        "current_quantity": (np.int64, 0),
+        "for_baby": (np.bool_, False),
+        "alive": (np.bool_, False),
+        **{column: (np.int32, -1) for column in CODED_COLUMNS},
+    }
+    SORTS = ("price_asc", "price_desc", "newest")
+
+    def __init__(self, capacity: int = 1024):
+        self._slots: dict[int, int] = {}
+        self._free: list[int] = []
+        self._size = 0
+        self._codes: dict[str, dict[str, int]] = {column: {} for column in self.CODED_COLUMNS}
+        self._payloads: dict[int, bytes] = {}
+        self._allocate(capacity)
+        self.ready = False
+        self.changed: Optional[set[int]] = None
+        # Set when the snapshot is first built from the database; kept across updates
+        self.built_at = time.time()
+
+    def _allocate(self, capacity: int) -> None:
+        columns = {
+            name: np.full(capacity, fill, dtype=dtype)
+            for name, (dtype, fill) in self.COLUMNS.items()
+        }
+        if hasattr(self, "_columns"):
+            for name, array in self._columns.items():
+                columns[name][:self._size] = array[:self._size]
+        self._columns = columns
+        self._capacity = capacity
+
+    def _encode(self, column: str, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+        return code
+
+    def _slot(self, product_id: int) -> Optional[int]:
+        return self._slots.get(product_id)
+
+    def _claim(self, product_id: int) -> int:
+        """
+        Return the slot of a product, allocating one if it has none.
+        """
+        slot = self._slots.get(product_id)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                if self._size == self._capacity:
+                    self._allocate(self._capacity * 2)
+                slot = self._size
+                self._size += 1
+            self._slots[product_id] = slot
+        if self.changed is not None:
+            self.changed.add(product_id)
+        return slot
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def upsert(self, row: dict, payload: Optional[bytes] = None) -> None:
+        """
+        Add a product or overwrite its slot in place.
+
+        Args:
+            row (dict): The product values (see routers.product.catalog.product_to_row)
+            payload (bytes | None): Serialized product; None keeps the current one
+        """
+        slot = self._claim(row["id"])
+        created_at: Optional[datetime] = row.get("created_at")
+        columns = self._columns
+        columns["id"][slot] = row["id"]
+        columns["price"][slot] = row["price"]
+        columns["created_at"][slot] = created_at.timestamp() if created_at else 0.0
+        columns["current_quantity"][slot] = row["current_quantity"]
+        columns["for_baby"][slot] = bool(row["for_baby"])
+        columns["alive"][slot] = True
+        for column in self.CODED_COLUMNS:
+            columns[column][slot] = self._encode(column, row.get(column))
+        if payload is not None:
+            self._payloads[row["id"]] = payload
+
+    def copy_product(self, source: "CatalogSnapshot", product_id: int) -> None:
+        """
+        Overwrite a product with its state in another snapshot, or remove it
+        if the other snapshot does not hold it.
+
+        Args:
+            source (CatalogSnapshot): The snapshot to copy from, e.g. a mapped one
+            product_id (int): The product to copy
+        """
+        source_slot = source._slot(product_id)
+        if source_slot is None:
+            self.remove(product_id)
+            return
+        slot = self._claim(product_id)
+        for name in self.COLUMNS:
+            value = source._columns[name][source_slot]
+            if name in self.CODED_COLUMNS and value >= 0:
+                decode = {code: text for text, code in source._codes[name].items()}
+                value = self._encode(name, decode[int(value)])
+            self._columns[name][slot] = value
+        payload = source.payload(product_id)
+        if payload is not None:
+            self._payloads[product_id] = payload
+        else:
+            self._payloads.pop(product_id, None)
+
+    def set_payload(self, product_id: int, payload: bytes) -> None:
+        if product_id in self._slots:
+            self._payloads[product_id] = payload
+            if self.changed is not None:
+                self.changed.add(product_id)
+
+    def remove(self, product_id: int) -> None:
+        slot = self._slots.pop(product_id, None)
+        if slot is None:
+            return
+        self._columns["alive"][slot] = False
+        self._payloads.pop(product_id, None)
+        self._free.append(slot)
+        if self.changed is not None:
+            self.changed.add(product_id)
+
+    def update_stock(self, product_id: int, quantity: int) -> None:
+        slot = self._slots.get(product_id)
+        if slot is not None:
+            self._columns["current_quantity"][slot] = quantity
+            if self.changed is not None:
+                self.changed.add(product_id)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def payload(self, product_id: int) -> Optional[bytes]:
+        return self._payloads.get(product_id)
+
+    def payloads(self) -> Iterator[tuple[int, bytes]]:
+        """
+        Iterate over the (product_id, payload) pairs of the products that have one.
+        """
+        return iter(self._payloads.items())
+
+    def columns(self) -> tuple[dict[str, np.ndarray], dict[str, list[str]]]:
+        """
+        Export the live products as dense columns ordered by id.
+
+        Returns:
+            tuple: The arrays of every column in COLUMNS, and the values of each
+                coded column in code order (the dictionary to decode them)
+        """
+        live = np.flatnonzero(self._columns["alive"][:self._size])
+        live = live[np.argsort(self._columns["id"][live], kind="stable")]
+        columns = {name: self._columns[name][live] for name in self.COLUMNS}
+        dictionary = {
+            column: sorted(codes, key=codes.get)
+            for column, codes in self._codes.items()
+        }
+        return columns, dictionary
+
+    def mask(self, filter_key: tuple) -> np.ndarray:
+        """
+        Evaluate a normalized ProductFilter as a boolean mask over the slots.
+
+        Args:
+            filter_key (tuple): Normalized filter (see CatalogCache.normalize_filter)
+
+        Returns:
+            np.ndarray: True for every live product matching all the filters
+        """
+        columns = {name: array[:self._size] for name, array in self._columns.items()}
+        mask = columns["alive"].copy()
+        for field, value in filter_key:
+            if field in self.CODED_COLUMNS:
+                code = self._codes[field].get(value)
+                if code is None:
+                    return np.zeros(self._size, dtype=np.bool_)
+                mask &= columns[field] == code
+            elif field == "for_baby":
+                mask &= columns["for_baby"] == value
+            elif field == "min_price":
+                mask &= columns["price"] >= value
+            elif field == "max_price":
+                mask &= columns["price"] <= value
+        return mask
+
+    def query(self, filter_key: tuple, sort: Optional[str] = None, skip: int = 0, limit: int = 20) -> list[int]:
+        """
+        Return one page of product ids matching the filter.
+
+        Args:
+            filter_key (tuple): Normalized filter (see CatalogCache.normalize_filter)
+            sort (str | None): One of SORTS; None keeps primary key order
+            skip (int): Number of records to skip (pagination)
+            limit (int): Maximum number of records to return
+
+        Returns:
+            list[int]: The product ids of the page, in order
+        """
+        slots = np.flatnonzero(self.mask(filter_key))
+        ids = self._columns["id"][slots]
+        if sort is None:
+            # Primary key order, like an unordered InnoDB scan
+            keys = ids
+        elif sort == "price_asc":
+            keys = self._columns["price"][slots]
+        elif sort == "price_desc":
+            keys = -self._columns["price"][slots]
+        elif sort == "newest":
+            keys = -self._columns["created_at"][slots]
+        else:
+            raise ValueError(f"Unknown sort: {sort}")
+
+        # Sort by id first so that ties keep a deterministic order
+        by_id = np.argsort(ids, kind="stable")
+        order = by_id[np.argsort(keys[by_id], kind="stable")]
+        return ids[order[skip:skip + limit]].tolist()
@@ -1,7 +1,10 @@
 from fastapi import FastAPI
-from routers import client_router, address_router, product_router
+from routers import client_router, address_router, product_router, export_router
+from routers.product.catalog import load_catalog
 from contextlib import asynccontextmanager
 from orm import sessionmanager
+from myAws import secret_store
+from myHttp import NegotiatedResponse, NegotiationMiddleware, http_client
 from config import Config
 import uvicorn
 import logging
@@ -21,18 +24,28 @@ async def lifespan(app: FastAPI):
     Function that handles startup and shutdown events.
     To understand more, read https://fastapi.tiangolo.com/advanced/events/
     """
-    yield
+    # Fetch every secret the configuration depends on, concurrently
+    await secret_store.resolve_all()
+    # Build the in-memory catalog (facet counts, search index) before serving requests
+    async with sessionmanager.session() as db_session:
+        await load_catalog(db_session)
+    # Close the pooled outbound HTTP connections on shutdown
+    async with http_client.lifespan():
+        yield
     if sessionmanager._engine is not None:
         # Close the DB connection
         await sessionmanager.close()
 
 
-app = FastAPI(lifespan=lifespan)
+# JSON by default, MessagePack for the services that ask for it (Accept: application/msgpack)
+app = FastAPI(lifespan=lifespan, default_response_class=NegotiatedResponse)
+app.add_middleware(NegotiationMiddleware)
 
 # Include routers
 app.include_router(client_router)
 app.include_router(address_router)
 app.include_router(product_router)
+app.include_router(export_router)
 
 # Health check endpoint for aws load balancer
 @app.get("/health")
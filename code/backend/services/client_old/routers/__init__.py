@@ -1,4 +1,5 @@
 from .client import router as client_router
 from .address import router as address_router
 from .product import router as product_router
-from .image import router as image_router
\ No newline at end of file
+from .image import router as image_router
+from .export import router as export_router
\ No newline at end of file
@@ -48,7 +48,7 @@ async def register_user(
     # Create new user
     db_user = Client(
         email=user.email,
-        password_hash=Encryption.hash_password(user.password),
+        password_hash=await Encryption.hash_password_async(user.password),
         first_name=user.first_name,
         last_name=user.last_name
     )
@@ -78,15 +78,23 @@ async def login_for_access_token(
     db_session = await db_session_gen.__anext__()
     result = await db_session.execute(select(Client).where(Client.email == form_data.username))
     user = result.scalar_one_or_none()
-    if not user or not Encryption.verify_password(form_data.password, user.password_hash):
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await Encryption.verify_and_rehash_async(form_data.password, user.password_hash)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Stored with an outdated cost factor (Config.BCRYPT_ROUNDS changed)
+        user.password_hash = new_hash
+        await db_session.commit()
     
+    # Same claims as myDependencies.token_claims, which the other services validate
     access_token = Encryption.generate_token(
-        data={"user_id": user.id}
+        data={"user_id": user.id, "is_admin": bool(user.is_admin), "ver": user.token_version or 0}
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -0,0 +1,91 @@
+"""
+Incremental serializers for streaming exports.
+
+Each serializer consumes an async iterator of row mappings and yields the
+encoded output in chunks of about Config.EXPORT_CHUNK_SIZE bytes, so only
+one chunk of output and one fetch batch of rows are in memory at a time.
+"""
+from config import Config
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Mapping, Sequence
+import csv
+import io
+import json
+import zlib
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        # Keep amounts exact: 199.90 stays "199.90"
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+async def ndjson_chunks(rows: AsyncIterator[Mapping]) -> AsyncIterator[bytes]:
+    """
+    Encode rows as newline-delimited JSON objects.
+
+    Args:
+        rows (AsyncIterator[Mapping]): The rows to export
+
+    Yields:
+        bytes: Chunks of NDJSON
+    """
+    buffer = io.StringIO()
+    async for row in rows:
+        buffer.write(json.dumps(dict(row), default=_json_default, separators=(",", ":")))
+        buffer.write("\n")
+        if buffer.tell() >= Config.EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def csv_chunks(columns: Sequence[str], rows: AsyncIterator[Mapping]) -> AsyncIterator[bytes]:
+    """
+    Encode rows as CSV, with a header line.
+
+    Args:
+        columns (Sequence[str]): The column names, in output order
+        rows (AsyncIterator[Mapping]): The rows to export
+
+    Yields:
+        bytes: Chunks of CSV
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for row in rows:
+        writer.writerow([
+            value.isoformat() if isinstance(value, (datetime, date)) else value
+            for value in (row[column] for column in columns)
+        ])
+        if buffer.tell() >= Config.EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Compress a stream of chunks into a single gzip member.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The uncompressed chunks
+
+    Yields:
+        bytes: The gzip stream
+    """
+    compressor = zlib.compressobj(level=6, wbits=31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
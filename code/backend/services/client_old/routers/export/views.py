@@ -0,0 +1,171 @@
+# own imports
+from orm import Product, Sale, SaleItem, InventoryHistory, Client, sessionmanager
+from dependencies import validate_is_admin
+from config import Config
+from .streaming import ndjson_chunks, csv_chunks, gzip_chunks
+
+# external imports
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+from datetime import datetime
+from typing import AsyncIterator, Mapping, Optional
+
+# Router configuration
+router = APIRouter(
+    prefix="/api/v1/exports",
+    tags=["exports"]
+)
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+async def stream_rows(statement: Select) -> AsyncIterator[Mapping]:
+    """
+    Stream the rows of a statement through a server-side cursor.
+
+    The session is opened here rather than taken from a dependency, because
+    dependency sessions are closed before a StreamingResponse body is sent.
+
+    Args:
+        statement (Select): The query to export
+
+    Yields:
+        Mapping: One row at a time; only Config.EXPORT_BATCH_SIZE rows are buffered
+    """
+    async with sessionmanager.session() as db_session:
+        result = await db_session.stream(
+            statement.execution_options(yield_per=Config.EXPORT_BATCH_SIZE)
+        )
+        async for row in result.mappings():
+            yield row
+
+
+def export_response(name: str, statement: Select, format: str, compress: bool) -> StreamingResponse:
+    """
+    Build the streaming response of an export.
+
+    Args:
+        name (str): Base name of the downloaded file
+        statement (Select): Column-level query producing the rows
+        format (str): ndjson or csv
+        compress (bool): Whether to gzip the output
+
+    Returns:
+        StreamingResponse: The export, sent as a file attachment
+    """
+    rows = stream_rows(statement)
+    if format == "csv":
+        chunks = csv_chunks([column.key for column in statement.selected_columns], rows)
+    else:
+        chunks = ndjson_chunks(rows)
+
+    filename = f"{name}.{format}"
+    media_type = MEDIA_TYPES[format]
+    if compress:
+        chunks = gzip_chunks(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+def created_between(statement: Select, column, since: Optional[datetime], until: Optional[datetime]) -> Select:
+    if since is not None:
+        statement = statement.where(column >= since)
+    if until is not None:
+        statement = statement.where(column < until)
+    return statement
+
+
+@router.get("/products")
+async def export_products(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = False,
+    user: Client = Depends(validate_is_admin)
+):
+    """
+    Export every product.
+
+    Rows are read through a server-side cursor and serialized as they
+    arrive, so memory use does not depend on the size of the table.
+
+    Args:
+        format: Output format (ndjson or csv)
+        gzip: Whether to gzip the output
+        user: Authenticated user (must be admin)
+
+    Returns:
+        Streamed file with one product per line
+    """
+    statement = select(
+        Product.id, Product.name, Product.price, Product.product_type, Product.current_quantity,
+        Product.for_baby, Product.size, Product.color, Product.line,
+        Product.created_at, Product.updated_at
+    ).order_by(Product.id)
+    return export_response("products", statement, format, gzip)
+
+
+@router.get("/sales")
+async def export_sales(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = False,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    user: Client = Depends(validate_is_admin)
+):
+    """
+    Export sales, one line per sale item with the columns of its sale.
+
+    Args:
+        format: Output format (ndjson or csv)
+        gzip: Whether to gzip the output
+        since: Only sales created at or after this time
+        until: Only sales created before this time
+        user: Authenticated user (must be admin)
+
+    Returns:
+        Streamed file with one sale item per line
+    """
+    statement = select(
+        Sale.id.label("sale_id"), Sale.client_id, Sale.shipping_address_id, Sale.total_amount,
+        Sale.payment_method, Sale.payment_status, Sale.shipping_status, Sale.tracking_number,
+        Sale.created_at, SaleItem.id.label("sale_item_id"), SaleItem.product_id,
+        SaleItem.quantity, SaleItem.unit_price, SaleItem.total_price
+    ).join(SaleItem, SaleItem.sale_id == Sale.id).order_by(Sale.id, SaleItem.id)
+    statement = created_between(statement, Sale.created_at, since, until)
+    return export_response("sales", statement, format, gzip)
+
+
+@router.get("/inventory-history")
+async def export_inventory_history(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = False,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    user: Client = Depends(validate_is_admin)
+):
+    """
+    Export the inventory movements.
+
+    Args:
+        format: Output format (ndjson or csv)
+        gzip: Whether to gzip the output
+        since: Only movements recorded at or after this time
+        until: Only movements recorded before this time
+        user: Authenticated user (must be admin)
+
+    Returns:
+        Streamed file with one movement per line
+    """
+    statement = select(
+        InventoryHistory.id, InventoryHistory.product_id, InventoryHistory.previous_quantity,
+        InventoryHistory.quantity_change, InventoryHistory.new_quantity, InventoryHistory.movement_type,
+        InventoryHistory.reference_number, InventoryHistory.sale_id, InventoryHistory.notes,
+        InventoryHistory.created_at
+    ).order_by(InventoryHistory.id)
+    statement = created_between(statement, InventoryHistory.created_at, since, until)
+    return export_response("inventory_history", statement, format, gzip)
@@ -0,0 +1,374 @@
+"""
+In-memory catalog state shared by the product routes.
+
+Every product write goes through product_saved / product_deleted so that the
+read-side structures built on top of the products table stay consistent.
+
+The catalog snapshot (filter columns plus each product's serialized
+response) is shared by all the workers of the host through a memory-mapped
+file. The facet and search indexes and the read cache are per process; they
+follow every snapshot this worker maps or publishes, reloading only the
+products the snapshot lists as changed since the one they reflect. When
+that is not known (first mapping, full rebuild of the snapshot, change log
+exceeded) the indexes are rebuilt from every payload in a thread and
+swapped in, while requests keep using the previous ones.
+"""
+from config import Config
+from helper import CatalogCache, CatalogSnapshot, FacetIndex, MappedCatalogSnapshot, SearchIndex, SharedCatalogSnapshot
+from orm import Product, Image, ProductImage
+from .schema import ProductListResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import Iterable, Optional
+import asyncio
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+catalog_cache = CatalogCache(
+    max_products=Config.CATALOG_CACHE_MAX_PRODUCTS,
+    max_pages=Config.CATALOG_CACHE_MAX_PAGES,
+    ttl_seconds=Config.CATALOG_CACHE_TTL_SECONDS,
+)
+# Replaced as a whole by full rebuilds: use them as catalog.facet_index / catalog.search_index
+facet_index = FacetIndex(price_edges=Config.CATALOG_PRICE_BUCKETS)
+search_index = SearchIndex()
+
+# Guards the index swap; the latest snapshot seen, and the one the indexes
+# are complete up to (None while a full rebuild is pending)
+_index_lock = threading.Lock()
+_latest: Optional[MappedCatalogSnapshot] = None
+_indexed: Optional[MappedCatalogSnapshot] = None
+_rebuild: Optional[threading.Thread] = None
+
+
+def _load_row(snapshot: MappedCatalogSnapshot, product_id: int) -> Optional[dict]:
+    payload = snapshot.payload(product_id)
+    return json.loads(payload) if payload is not None else None
+
+
+def _apply_rows(snapshot: MappedCatalogSnapshot, product_ids: Iterable[int], facets: FacetIndex, search: SearchIndex) -> None:
+    for product_id in product_ids:
+        row = _load_row(snapshot, product_id)
+        if row is None:
+            facets.remove(product_id)
+            search.remove(product_id)
+        else:
+            facets.upsert(row)
+            search.upsert(row)
+
+
+def _rebuild_indexes(snapshot: MappedCatalogSnapshot) -> None:
+    """
+    Build new indexes from every payload of a snapshot, then swap them in
+    after replaying the changes published meanwhile. Runs in a thread.
+    """
+    global facet_index, search_index, _indexed, _rebuild
+    try:
+        while True:
+            facets = FacetIndex(price_edges=Config.CATALOG_PRICE_BUCKETS)
+            search = SearchIndex()
+            for _, payload in snapshot.payloads():
+                row = json.loads(payload)
+                facets.upsert(row)
+                search.upsert(row)
+
+            with _index_lock:
+                if _indexed is not None and _indexed.generation >= snapshot.generation:
+                    # load_catalog installed complete indexes of a newer snapshot meanwhile
+                    return
+                changed = _latest.changed_since(snapshot.generation)
+                if changed is None:
+                    # Too much changed while building: start over from the latest snapshot
+                    snapshot = _latest
+                    continue
+                _apply_rows(_latest, changed, facets, search)
+                facet_index, search_index, _indexed = facets, search, _latest
+            logger.info(f"Catalog indexes rebuilt from snapshot generation {snapshot.generation} ({len(facets)} products)")
+            return
+    except Exception:
+        logger.exception("Catalog index rebuild failed")
+    finally:
+        with _index_lock:
+            _rebuild = None
+
+
+def _snapshot_changed(snapshot: MappedCatalogSnapshot) -> None:
+    """
+    Bring the per-process structures up to date with a newly mapped or published snapshot.
+    """
+    global _latest, _indexed, _rebuild
+    with _index_lock:
+        previous, _latest = _latest, snapshot
+        changed = snapshot.changed_since(previous.generation) if previous is not None else None
+        if changed is None:
+            catalog_cache.clear()
+        else:
+            for product_id in changed:
+                catalog_cache.invalidate_product(product_id, _load_row(previous, product_id), _load_row(snapshot, product_id))
+
+        indexed = snapshot.changed_since(_indexed.generation) if _indexed is not None else None
+        if indexed is not None:
+            _apply_rows(snapshot, indexed, facet_index, search_index)
+            _indexed = snapshot
+            return
+        _indexed = None
+        if _rebuild is None:
+            _rebuild = threading.Thread(target=_rebuild_indexes, args=(snapshot,), name="catalog-index-rebuild", daemon=True)
+            _rebuild.start()
+    logger.info(f"Catalog snapshot generation {snapshot.generation} mapped with {len(snapshot)} products, rebuilding the indexes")
+
+
+def _install_indexes(snapshot: MappedCatalogSnapshot, facets: FacetIndex, search: SearchIndex, changed: Iterable[int] = ()) -> None:
+    """
+    Swap in indexes built along with a snapshot this process published,
+    after reloading the given products from it.
+    """
+    global facet_index, search_index, _latest, _indexed
+    with _index_lock:
+        _apply_rows(snapshot, changed, facets, search)
+        catalog_cache.clear()
+        facet_index, search_index, _latest, _indexed = facets, search, snapshot, snapshot
+
+
+async def indexes_ready() -> None:
+    """
+    Wait for a running full rebuild of the indexes, without blocking the event loop.
+    """
+    rebuild = _rebuild
+    if rebuild is not None:
+        await asyncio.to_thread(rebuild.join)
+
+
+shared_snapshot = SharedCatalogSnapshot(
+    Config.CATALOG_SNAPSHOT_PATH,
+    on_change=_snapshot_changed,
+    change_log_size=Config.CATALOG_SNAPSHOT_CHANGE_LOG_SIZE,
+)
+
+
+def product_to_row(product) -> dict:
+    """
+    Snapshot the filterable columns of a Product into a plain dict.
+
+    Args:
+        product: A Product ORM instance
+
+    Returns:
+        dict: The product values used by the catalog structures
+    """
+    return {
+        "id": product.id,
+        "name": product.name,
+        "price": float(product.price),
+        "product_type": product.product_type,
+        "current_quantity": product.current_quantity or 0,
+        "for_baby": product.for_baby,
+        "size": product.size,
+        "color": product.color,
+        "line": product.line,
+        "created_at": product.created_at,
+        "updated_at": product.updated_at,
+    }
+
+
+def image_to_dict(product_id: int, image) -> dict:
+    """
+    Args:
+        product_id (int): The product the image belongs to
+        image: An Image ORM instance
+
+    Returns:
+        dict: The image as serialized in product responses
+    """
+    return {
+        "image_id": image.id,
+        "product_id": product_id,
+        "small_url": image.small_url,
+        "medium_url": image.medium_url,
+        "large_url": image.large_url,
+    }
+
+
+def product_payload(row: dict, images: list[dict]) -> bytes:
+    """
+    Serialize a product the way the product routes return it.
+
+    Args:
+        row (dict): The product values (see product_to_row)
+        images (list[dict]): The product images (see image_to_dict)
+
+    Returns:
+        bytes: The JSON product, stored as the product's snapshot payload
+    """
+    return ProductListResponse.model_validate({**row, "images": images}).model_dump_json().encode()
+
+
+def _patch_payload(snapshot: CatalogSnapshot, product_id: int, **fields) -> None:
+    payload = snapshot.payload(product_id)
+    if payload is not None:
+        snapshot.set_payload(product_id, json.dumps({**json.loads(payload), **fields}).encode())
+
+
+async def product_saved(current: dict) -> None:
+    """
+    Propagate a created or updated product to the catalog structures.
+
+    The snapshot is republished with it; the cache and indexes of every
+    worker follow from the new snapshot (see _snapshot_changed).
+
+    Args:
+        current (dict): The product row after the write
+    """
+    def apply(snapshot: CatalogSnapshot) -> None:
+        # Product writes do not touch images, keep the ones already serialized
+        payload = snapshot.payload(current["id"])
+        images = json.loads(payload)["images"] if payload is not None else []
+        snapshot.upsert(current, product_payload(current, images))
+
+    await shared_snapshot.submit(apply)
+
+
+async def product_deleted(product_id: int) -> None:
+    """
+    Propagate a deleted product to the catalog structures.
+
+    Args:
+        product_id (int): The deleted product
+    """
+    await shared_snapshot.submit(lambda snapshot: snapshot.remove(product_id))
+
+
+async def product_images_changed(db_session: AsyncSession, product_id: int) -> None:
+    """
+    Propagate an image attached to or removed from a product.
+
+    Args:
+        db_session (AsyncSession): Database session used to load the product images
+        product_id (int): The product whose images changed
+    """
+    result = await db_session.execute(
+        select(Image)
+        .join(ProductImage, ProductImage.image_id == Image.id)
+        .where(ProductImage.product_id == product_id)
+    )
+    images = [image_to_dict(product_id, image) for image in result.scalars().all()]
+    await shared_snapshot.submit(lambda snapshot: _patch_payload(snapshot, product_id, images=images))
+
+
+async def stock_changed(quantities: dict[int, int]) -> None:
+    """
+    Propagate changes of products' current quantity.
+
+    Args:
+        quantities (dict[int, int]): The new current quantity of each product whose stock changed
+    """
+    def apply(snapshot: CatalogSnapshot) -> None:
+        for product_id, quantity in quantities.items():
+            snapshot.update_stock(product_id, quantity)
+            _patch_payload(snapshot, product_id, current_quantity=quantity)
+
+    await shared_snapshot.submit(apply)
+
+
+_stock_checked_at = 0.0
+
+
+async def refresh_stock(db_session: AsyncSession) -> None:
+    """
+    Reconcile the snapshot's stock with the products table, at most once
+    every Config.CATALOG_STOCK_TTL_SECONDS per worker.
+
+    Sales and returns move stock through the inventory ledger of the users
+    service, which does not go through the hooks above, so without this the
+    served quantities and the "in stock" facet would drift. Only the id and
+    quantity columns are read, and only the products whose quantity changed
+    are republished.
+
+    Args:
+        db_session (AsyncSession): Database session used to read the quantities
+    """
+    global _stock_checked_at
+    snapshot = shared_snapshot.current()
+    if snapshot is None or time.monotonic() - _stock_checked_at < Config.CATALOG_STOCK_TTL_SECONDS:
+        return
+    # Set before awaiting so concurrent requests do not run the same query
+    _stock_checked_at = time.monotonic()
+
+    result = await db_session.execute(select(Product.id, Product.current_quantity))
+    columns, _ = snapshot.columns()
+    known = dict(zip(columns["id"].tolist(), columns["current_quantity"].tolist()))
+    quantities = {
+        product_id: quantity or 0
+        for product_id, quantity in result.all()
+        if product_id in known and known[product_id] != (quantity or 0)
+    }
+    if quantities:
+        logger.info(f"Catalog stock of {len(quantities)} products changed outside the catalog")
+        await stock_changed(quantities)
+
+
+async def load_catalog(db_session: AsyncSession, force: bool = False) -> None:
+    """
+    Make the catalog structures available to this worker.
+
+    If another worker of the host published the shared snapshot less than
+    Config.CATALOG_SNAPSHOT_MAX_AGE_SECONDS ago it is mapped as is. Otherwise
+    the snapshot is rebuilt from a streaming scan of the products, fetched in
+    batches of Config.CATALOG_LOAD_BATCH_SIZE so the scan never holds the
+    whole table in memory at once. Workers starting together wait for the
+    first one's build instead of all scanning the table. Either way this
+    worker's indexes are complete when it returns.
+
+    Product writes keep being published during the scan. The built snapshot
+    is published under lock("write") after taking over the products written
+    since the scan started (see SharedCatalogSnapshot.rebase), so a write
+    the scan missed is not undone.
+
+    Args:
+        db_session (AsyncSession): Database session used for the scan
+        force (bool): Rebuild even if the shared snapshot is recent, e.g. after a bulk import
+    """
+    # Waiting for another worker's build must not block this worker's event loop
+    async with shared_snapshot.acquire("build"):
+        age = shared_snapshot.age()
+        if not force and age is not None and age <= Config.CATALOG_SNAPSHOT_MAX_AGE_SECONDS:
+            # Mapping it started a rebuild of the indexes
+            await indexes_ready()
+            return
+
+        started = shared_snapshot.current()
+        since = started.generation if started is not None else 0
+        facets = FacetIndex(price_edges=Config.CATALOG_PRICE_BUCKETS)
+        search = SearchIndex()
+        snapshot = CatalogSnapshot()
+        result = await db_session.stream_scalars(
+            select(Product)
+            .options(selectinload(Product.images))
+            .execution_options(yield_per=Config.CATALOG_LOAD_BATCH_SIZE)
+        )
+        async for product in result:
+            row = product_to_row(product)
+            images = [image_to_dict(product.id, image) for image in product.images]
+            snapshot.upsert(row, product_payload(row, images))
+            facets.upsert(row)
+            search.upsert(row)
+
+        def publish() -> tuple[MappedCatalogSnapshot, Optional[list[int]]]:
+            with shared_snapshot.lock():
+                changed = shared_snapshot.rebase(snapshot, since)
+                return shared_snapshot.publish(snapshot), changed
+
+        published, changed = await asyncio.to_thread(publish)
+        if changed is None:
+            logger.warning(
+                f"Catalog snapshot changed too much during the build (since generation {since}): "
+                "writes made meanwhile may be missing until the next build"
+            )
+        _install_indexes(published, facets, search, changed or ())
+    logger.info(f"Catalog snapshot built with {len(snapshot)} products")
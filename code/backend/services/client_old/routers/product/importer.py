@@ -0,0 +1,232 @@
+"""
+Bulk product import from CSV or NDJSON.
+
+Rows are read one at a time, validated with ProductCreate and written in
+batches: one multi-row INSERT per batch, committed on its own, so a file of
+thousands of products costs a handful of round trips instead of a commit
+and refresh per product. Rows carrying an "id" are upserted (INSERT ... ON
+DUPLICATE KEY UPDATE) instead of created. Invalid rows, and rows the
+database rejects, are reported without aborting the rest of the file.
+
+Also runnable as a CLI from the service directory:
+
+    python -m routers.product.importer products.csv [--format csv] [--batch-size 500]
+"""
+from config import Config
+from orm import Product
+from .schema import ProductCreate, ProductImportResponse, ProductImportRowError
+from pydantic import PositiveInt, TypeAdapter, ValidationError
+from sqlalchemy import func
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Iterator, TextIO, Union
+import argparse
+import asyncio
+import csv
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "ndjson")
+UPSERT_COLUMNS = tuple(ProductCreate.model_fields)
+PRODUCT_ID = TypeAdapter(PositiveInt)
+
+
+def read_rows(file: TextIO, format: str) -> Iterator[tuple[int, Union[dict, str]]]:
+    """
+    Stream the raw rows of an import file.
+
+    Args:
+        file (TextIO): The file, opened in text mode with newline=""
+        format (str): "csv" (with a header line) or "ndjson" (one object per line)
+
+    Yields:
+        tuple[int, dict | str]: The line number of the row and its values,
+            or an error message if the row could not be parsed
+    """
+    if format == "csv":
+        reader = csv.DictReader(file)
+        for values in reader:
+            if None in values:
+                yield reader.line_num, "Row has more fields than the header"
+                continue
+            # Empty cells are unset values
+            yield reader.line_num, {field: value for field, value in values.items() if value != ""}
+    elif format == "ndjson":
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                values = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(values, dict):
+                yield line_number, "Expected a JSON object"
+                continue
+            yield line_number, values
+    else:
+        raise ValueError(f"Unknown import format: {format}")
+
+
+def validate_row(values: dict) -> Union[dict, list[str]]:
+    """
+    Validate one row with ProductCreate.
+
+    Args:
+        values (dict): The raw row values
+
+    Returns:
+        dict | list[str]: The column values to insert, or the validation errors
+    """
+    try:
+        product = ProductCreate.model_validate(values)
+    except ValidationError as e:
+        return [f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()]
+
+    product_id = values.get("id")
+    if product_id is not None:
+        # Accepts 7, 7.0 and "7"; rejects 7.5, booleans, lists and objects
+        try:
+            if isinstance(product_id, bool):
+                raise ValueError
+            product_id = PRODUCT_ID.validate_python(product_id)
+        except ValueError:
+            return ["id: must be a positive integer"]
+
+    row = product.model_dump()
+    if product_id is not None:
+        row["id"] = product_id
+    return row
+
+
+class _Import:
+    """
+    State of one import: the pending batch and the running result.
+    """
+
+    def __init__(self, db_session: AsyncSession, batch_size: int):
+        self.db_session = db_session
+        self.batch_size = batch_size
+        self.batch: list[tuple[int, dict]] = []
+        self.result = ProductImportResponse()
+
+    def fail(self, line_number: int, errors: list[str]) -> None:
+        self.result.failed += 1
+        if len(self.result.errors) < Config.PRODUCT_IMPORT_MAX_ERRORS:
+            self.result.errors.append(ProductImportRowError(row=line_number, errors=errors))
+
+    async def _execute(self, rows: list[dict]) -> None:
+        created = [row for row in rows if "id" not in row]
+        upserted = [row for row in rows if "id" in row]
+        if created:
+            await self.db_session.execute(insert(Product).values(created))
+        if upserted:
+            statement = insert(Product).values(upserted)
+            statement = statement.on_duplicate_key_update({
+                **{column: statement.inserted[column] for column in UPSERT_COLUMNS},
+                "updated_at": func.now(),
+            })
+            await self.db_session.execute(statement)
+        await self.db_session.commit()
+        self.result.created += len(created)
+        self.result.upserted += len(upserted)
+
+    async def flush(self) -> None:
+        """
+        Write the pending batch in one transaction.
+
+        If the database rejects the batch, it is rolled back and its rows
+        are retried one by one so that only the offending rows fail.
+        """
+        batch, self.batch = self.batch, []
+        if not batch:
+            return
+        try:
+            await self._execute([row for _, row in batch])
+            return
+        except SQLAlchemyError as e:
+            await self.db_session.rollback()
+            logger.warning(f"Import batch of {len(batch)} rows rejected, retrying row by row: {e}")
+
+        for line_number, row in batch:
+            try:
+                await self._execute([row])
+            except SQLAlchemyError as e:
+                await self.db_session.rollback()
+                self.fail(line_number, [str(e.orig if getattr(e, "orig", None) else e)])
+
+    async def add(self, line_number: int, values: Union[dict, str]) -> None:
+        self.result.rows += 1
+        if isinstance(values, str):
+            self.fail(line_number, [values])
+            return
+        row = validate_row(values)
+        if isinstance(row, list):
+            self.fail(line_number, row)
+            return
+        self.batch.append((line_number, row))
+        if len(self.batch) >= self.batch_size:
+            await self.flush()
+
+
+async def import_products(db_session: AsyncSession, file: TextIO, format: str, batch_size: int = Config.PRODUCT_IMPORT_BATCH_SIZE) -> ProductImportResponse:
+    """
+    Import the products of a CSV or NDJSON file.
+
+    Args:
+        db_session (AsyncSession): Database session used for the inserts
+        file (TextIO): The file, opened in text mode with newline=""
+        format (str): One of FORMATS
+        batch_size (int): Rows per INSERT statement and transaction
+
+    Returns:
+        ProductImportResponse: Row counts and the errors of the rejected rows,
+            identified by their line number in the file. If the file stops
+            being valid UTF-8, the rows before are imported and the result
+            is marked truncated
+    """
+    state = _Import(db_session, batch_size)
+    line_number = 0
+    try:
+        for line_number, values in read_rows(file, format):
+            await state.add(line_number, values)
+    except UnicodeDecodeError:
+        # The batches already committed stay imported, the rest of the file is not read
+        state.result.truncated = True
+        state.fail(line_number + 1, ["The file must be UTF-8 encoded, the rest of the file was not imported"])
+    await state.flush()
+    logger.info(
+        f"Imported {state.result.rows} rows: {state.result.created} created, "
+        f"{state.result.upserted} upserted, {state.result.failed} failed"
+    )
+    return state.result
+
+
+async def _main(path: str, format: str, batch_size: int) -> None:
+    from orm import sessionmanager
+    from .catalog import load_catalog
+
+    try:
+        async with sessionmanager.session() as db_session:
+            with open(path, encoding="utf-8-sig", newline="") as file:
+                result = await import_products(db_session, file, format, batch_size)
+            if result.created or result.upserted:
+                # Republish the catalog snapshot for the workers of this host
+                await load_catalog(db_session, force=True)
+    finally:
+        await sessionmanager.close()
+    print(result.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import products from a CSV or NDJSON file")
+    parser.add_argument("path", help="File to import")
+    parser.add_argument("--format", choices=FORMATS, help="File format (default: from the file extension)")
+    parser.add_argument("--batch-size", type=int, default=Config.PRODUCT_IMPORT_BATCH_SIZE, help="Rows per INSERT and transaction")
+    args = parser.parse_args()
+
+    format = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    asyncio.run(_main(args.path, format, args.batch_size))
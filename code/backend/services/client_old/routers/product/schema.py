@@ -91,3 +91,15 @@ class ProductFilter(BaseModel):
             if v <= values['min_price']:
                 raise ValueError('max_price must be greater than min_price')
         return v
+
+class ProductImportRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+class ProductImportResponse(BaseModel):
+    rows: int = 0
+    created: int = 0
+    upserted: int = 0
+    failed: int = 0
+    truncated: bool = False
+    errors: List[ProductImportRowError] = []
@@ -1,16 +1,21 @@
 # own imports
-from orm import Product, Review, Client, ProductImage
+from orm import Product, Review, Client, ProductImage, product_by_id
 from .schema import (
     ProductCreate, ProductResponse, ProductListResponse, ProductUpdate,
     ProductReviewCreate, ProductReviewResponse, ProductImageCreate, ProductImageResponse,
-    ProductFilter
+    ProductFilter, ProductImportResponse
 )
+from . import catalog, importer
+from .catalog import catalog_cache, shared_snapshot, product_to_row
 from dependencies import validate_is_authenticated, validate_is_admin, DBSessionDep
+from config import Config
 
 # external imports
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import select, and_
-from typing import List
+from typing import List, Optional
+import io
+import tempfile
 
 # Router configuration
 router = APIRouter(
@@ -22,22 +27,41 @@ router = APIRouter(
 async def list_products(
     db_session_gen: DBSessionDep,
     filters: ProductFilter = Depends(),
+    sort: Optional[str] = Query(None, pattern="^(price_asc|price_desc|newest)$"),
     skip: int = 0,
     limit: int = 20
 ):
     """
     List products with optional filters.
     
+    Once the shared catalog snapshot is published, filtering, sorting,
+    pagination and serialization run against it without touching the database,
+    apart from the stock reconciliation every Config.CATALOG_STOCK_TTL_SECONDS.
+    
     Args:
         db_session_gen: Database session dependency
         filters: Product filters (type, price range, etc.)
+        sort: Optional order (price_asc, price_desc, newest)
         skip: Number of records to skip (pagination)
         limit: Maximum number of records to return
         
     Returns:
         List of products matching the filters
     """
+    filter_key = catalog_cache.normalize_filter(filters.model_dump())
     db_session = await db_session_gen.__anext__()
+    await catalog.refresh_stock(db_session)
+    snapshot = shared_snapshot.current()
+    if snapshot is not None:
+        product_ids = snapshot.query(filter_key, sort=sort, skip=skip, limit=limit)
+        # The payloads are already serialized products: join them into the response
+        payloads = [snapshot.payload(product_id) for product_id in product_ids]
+        return Response(b"[" + b",".join(payloads) + b"]", media_type="application/json")
+
+    cached = catalog_cache.get_page(filter_key, skip, limit, sort=sort)
+    if cached is not None:
+        return cached
+
     query = select(Product)
     
     # Apply filters
@@ -60,11 +84,97 @@ async def list_products(
     if conditions:
         query = query.where(and_(*conditions))
     
+    # Apply ordering, with the id as tie-breaker so pages are stable
+    if sort == "price_asc":
+        query = query.order_by(Product.price.asc(), Product.id)
+    elif sort == "price_desc":
+        query = query.order_by(Product.price.desc(), Product.id)
+    elif sort == "newest":
+        query = query.order_by(Product.created_at.desc(), Product.id)
+    
     # Apply pagination
     query = query.offset(skip).limit(limit)
     
     result = await db_session.execute(query)
-    return result.scalars().all()
+    products = [ProductListResponse.model_validate(p) for p in result.scalars().all()]
+    catalog_cache.set_page(filter_key, skip, limit, products, [p.id for p in products], sort=sort)
+    return products
+
+@router.get("/facets")
+async def get_product_facets(
+    db_session_gen: DBSessionDep,
+    filters: ProductFilter = Depends(),
+):
+    """
+    Count products per facet value (type, size, color, line, for_baby,
+    price bucket and stock) given the active filters.
+
+    The counts of each facet ignore that facet's own filter. They are
+    served from the in-memory facet index; the database is only read to
+    reconcile stock every Config.CATALOG_STOCK_TTL_SECONDS.
+    
+    Args:
+        db_session_gen: Database session dependency, used to reconcile stock
+        filters: Product filters currently applied by the storefront
+        
+    Returns:
+        The number of matching products and the counts per facet value
+    """
+    await catalog.refresh_stock(await db_session_gen.__anext__())
+    # Remaps the snapshot, and rebuilds the index, if another worker published one
+    shared_snapshot.current()
+    return catalog.facet_index.counts(catalog_cache.normalize_filter(filters.model_dump()))
+
+@router.get("/search", response_model=List[ProductListResponse])
+async def search_products(
+    db_session_gen: DBSessionDep,
+    q: str = Query(..., min_length=1, max_length=100),
+    skip: int = 0,
+    limit: int = 20
+):
+    """
+    Full-text search over product name, type, line and color.
+    
+    Matching and ranking run against the in-memory search index; the
+    database is only hit to load the ranked page by primary key.
+    
+    Args:
+        db_session_gen: Database session dependency
+        q: Search query; the last words may be incomplete (prefix matching)
+        skip: Number of results to skip (pagination)
+        limit: Maximum number of results to return
+        
+    Returns:
+        List of matching products, best match first
+    """
+    db_session = await db_session_gen.__anext__()
+    await catalog.refresh_stock(db_session)
+    shared_snapshot.current()
+    ranked = catalog.search_index.search(q, skip=skip, limit=limit)
+    if not ranked:
+        return []
+
+    product_ids = [product_id for product_id, _ in ranked]
+    result = await db_session.execute(
+        select(Product).where(Product.id.in_(product_ids))
+    )
+    products = {product.id: product for product in result.scalars().all()}
+    return [products[product_id] for product_id in product_ids if product_id in products]
+
+@router.get("/cache/stats")
+async def get_catalog_cache_stats(
+    user: Client = Depends(validate_is_admin)
+):
+    """
+    Get hit/miss counters and hit rates of the catalog cache.
+    
+    Args:
+        user: Authenticated user (must be admin)
+        
+    Returns:
+        Cache statistics per namespace (products, pages)
+    """
+    return catalog_cache.stats()
 
 @router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
 async def create_product(
@@ -92,8 +202,60 @@ async def create_product(
     db_session.add(db_product)
     await db_session.commit()
     await db_session.refresh(db_product)
+    await catalog.product_saved(product_to_row(db_product))
     return db_product
 
+@router.post("/import", response_model=ProductImportResponse)
+async def import_products(
+    request: Request,
+    db_session_gen: DBSessionDep,
+    format: str = Query(..., pattern="^(csv|ndjson)$"),
+    batch_size: int = Query(Config.PRODUCT_IMPORT_BATCH_SIZE, ge=1, le=5000),
+    user: Client = Depends(validate_is_admin)
+):
+    """
+    Bulk create or upsert products from a CSV or NDJSON request body.
+    
+    Rows are validated like POST /, then written in batches of batch_size
+    rows per INSERT and transaction. Rows with an "id" are upserted. Invalid
+    rows are reported and skipped; the rest of the file is still imported.
+    If the body stops being UTF-8 midway, the rows before it are kept and
+    the response is marked truncated.
+    
+    Args:
+        request: The request, whose body is the file to import
+        db_session_gen: Database session dependency
+        format: Body format, csv (with a header line) or ndjson
+        batch_size: Rows per INSERT statement and transaction
+        user: Authenticated user (must be admin)
+        
+    Returns:
+        Row counts and the errors of the rejected rows, by line number
+        
+    Raises:
+        HTTPException: If nothing could be decoded as UTF-8 or user not authorized
+    """
+    db_session = await db_session_gen.__anext__()
+
+    # Spool the upload (to disk past PRODUCT_IMPORT_SPOOL_SIZE) so it is never fully held in memory
+    with tempfile.SpooledTemporaryFile(max_size=Config.PRODUCT_IMPORT_SPOOL_SIZE) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        result = await importer.import_products(
+            db_session, io.TextIOWrapper(spool, encoding="utf-8-sig", newline=""), format, batch_size
+        )
+
+    if result.created or result.upserted:
+        # Also after a truncated import: the batches before the bad bytes are committed
+        await catalog.load_catalog(db_session, force=True)
+    elif result.truncated:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The file must be UTF-8 encoded"
+        )
+    return result
+
 @router.get("/{product_id}", response_model=ProductResponse)
 async def get_product(
     product_id: int,
@@ -113,16 +275,26 @@ async def get_product(
         HTTPException: If product not found
     """
     db_session = await db_session_gen.__anext__()
-    result = await db_session.execute(
-        select(Product).where(Product.id == product_id)
-    )
-    product = result.scalar_one_or_none()
+    await catalog.refresh_stock(db_session)
+    snapshot = shared_snapshot.current()
+    if snapshot is not None:
+        payload = snapshot.payload(product_id)
+        if payload is not None:
+            return Response(payload, media_type="application/json")
+
+    cached = catalog_cache.get_product(product_id)
+    if cached is not None:
+        return cached
+
+    product = await product_by_id.one_or_none(db_session, product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
-    return product
+    response = ProductResponse.model_validate(product)
+    catalog_cache.set_product(product_id, response)
+    return response
 
 @router.put("/{product_id}", response_model=ProductResponse)
 async def update_product(
@@ -148,10 +320,7 @@ async def update_product(
     """
     db_session = await db_session_gen.__anext__()
     
-    result = await db_session.execute(
-        select(Product).where(Product.id == product_id)
-    )
-    product = result.scalar_one_or_none()
+    product = await product_by_id.one_or_none(db_session, product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -164,6 +333,7 @@ async def update_product(
     
     await db_session.commit()
     await db_session.refresh(product)
+    await catalog.product_saved(product_to_row(product))
     return product
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -185,10 +355,7 @@ async def delete_product(
     """
     db_session = await db_session_gen.__anext__()
     
-    result = await db_session.execute(
-        select(Product).where(Product.id == product_id)
-    )
-    product = result.scalar_one_or_none()
+    product = await product_by_id.one_or_none(db_session, product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -197,6 +364,7 @@ async def delete_product(
     
     await db_session.delete(product)
     await db_session.commit()
+    await catalog.product_deleted(product_id)
 
 @router.post("/{product_id}/images", response_model=ProductImageResponse, status_code=status.HTTP_201_CREATED)
 async def add_product_image(
@@ -223,10 +391,7 @@ async def add_product_image(
     db_session = await db_session_gen.__anext__()
 
     # Verify product exists
-    result = await db_session.execute(
-        select(Product).where(Product.id == product_id)
-    )
-    if not result.scalar_one_or_none():
+    if not await product_by_id.one_or_none(db_session, product_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
@@ -236,6 +401,7 @@ async def add_product_image(
     db_session.add(db_image)
     await db_session.commit()
     await db_session.refresh(db_image)
+    await catalog.product_images_changed(db_session, product_id)
     return db_image
 
 @router.get("/{product_id}/reviews", response_model=List[ProductReviewResponse])
@@ -263,10 +429,7 @@ async def get_product_reviews(
     db_session = await db_session_gen.__anext__()
     
     # Verify product exists
-    result = await db_session.execute(
-        select(Product).where(Product.id == product_id)
-    )
-    if not result.scalar_one_or_none():
+    if not await product_by_id.one_or_none(db_session, product_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
@@ -306,10 +469,7 @@ async def create_product_review(
     db_session = await db_session_gen.__anext__()
     
     # Verify product exists
-    result = await db_session.execute(
-        select(Product).where(Product.id == product_id)
-    )
-    if not result.scalar_one_or_none():
+    if not await product_by_id.one_or_none(db_session, product_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
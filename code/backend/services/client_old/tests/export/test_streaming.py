@@ -0,0 +1,61 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from config import Config
+from routers.export.streaming import ndjson_chunks, csv_chunks, gzip_chunks
+
+
+ROWS = [
+    {"id": 1, "name": "Cobija", "price": Decimal("199.90"), "size": None, "created_at": datetime(2024, 1, 2, 3, 4, 5)},
+    {"id": 2, "name": 'Toalla "Spa", grande', "price": Decimal("80.00"), "size": "L", "created_at": datetime(2024, 2, 1)},
+]
+
+
+async def rows(count=None):
+    for index in range(count or len(ROWS)):
+        yield ROWS[index % len(ROWS)]
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.asyncio
+async def test_ndjson():
+    output = b"".join(await collect(ndjson_chunks(rows())))
+    lines = [json.loads(line) for line in output.decode().splitlines()]
+    assert lines[0] == {"id": 1, "name": "Cobija", "price": "199.90", "size": None, "created_at": "2024-01-02T03:04:05"}
+    assert lines[1]["name"] == 'Toalla "Spa", grande'
+
+
+@pytest.mark.asyncio
+async def test_csv():
+    output = b"".join(await collect(csv_chunks(["id", "name", "price", "size"], rows())))
+    records = list(csv.reader(io.StringIO(output.decode())))
+    assert records == [
+        ["id", "name", "price", "size"],
+        ["1", "Cobija", "199.90", ""],
+        ["2", 'Toalla "Spa", grande', "80.00", "L"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_output_is_chunked(monkeypatch):
+    monkeypatch.setattr(Config, "EXPORT_CHUNK_SIZE", 1024)
+    chunks = await collect(ndjson_chunks(rows(1000)))
+    assert len(chunks) > 1
+    # Chunks only slightly exceed the chunk size (by at most one row)
+    assert max(len(chunk) for chunk in chunks) < 1024 + 200
+    assert len(b"".join(chunks).splitlines()) == 1000
+
+
+@pytest.mark.asyncio
+async def test_gzip():
+    plain = b"".join(await collect(ndjson_chunks(rows(100))))
+    compressed = b"".join(await collect(gzip_chunks(ndjson_chunks(rows(100)))))
+    assert gzip.decompress(compressed) == plain
+    assert len(compressed) < len(plain)
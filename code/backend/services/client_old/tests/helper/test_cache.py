@@ -0,0 +1,110 @@
+import pytest
+from helper.cache import CatalogCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return CatalogCache(max_products=2, max_pages=2, ttl_seconds=10, clock=clock)
+
+
+def make_row(product_id, **overrides):
+    row = {
+        "id": product_id,
+        "name": "Cobija",
+        "price": 100.0,
+        "product_type": "blanket",
+        "current_quantity": 5,
+        "for_baby": False,
+        "size": "M",
+        "color": "red",
+        "line": "classic",
+        "created_at": None,
+    }
+    row.update(overrides)
+    return row
+
+
+def test_normalize_filter_drops_unset_values():
+    key = CatalogCache.normalize_filter({"product_type": "blanket", "size": None, "color": "", "for_baby": False})
+    assert key == (("for_baby", False), ("product_type", "blanket"))
+
+
+def test_filter_matches_price_range():
+    key = CatalogCache.normalize_filter({"min_price": 50, "max_price": 150})
+    assert CatalogCache.filter_matches(key, make_row(1, price=100.0))
+    assert not CatalogCache.filter_matches(key, make_row(1, price=200.0))
+
+
+def test_product_hit_miss_and_ttl(cache, clock):
+    assert cache.get_product(1) is None
+    cache.set_product(1, "product-1")
+    assert cache.get_product(1) == "product-1"
+
+    # Entries expire after the TTL
+    clock.now = 11
+    assert cache.get_product(1) is None
+
+    stats = cache.stats()["products"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+
+def test_product_lru_eviction(cache):
+    cache.set_product(1, "a")
+    cache.set_product(2, "b")
+    cache.get_product(1)  # 1 becomes most recently used
+    cache.set_product(3, "c")
+
+    assert cache.get_product(2) is None
+    assert cache.get_product(1) == "a"
+    assert cache.stats()["products"]["evictions"] == 1
+
+
+def test_invalidate_drops_only_matching_pages(cache):
+    blankets = CatalogCache.normalize_filter({"product_type": "blanket"})
+    towels = CatalogCache.normalize_filter({"product_type": "towel"})
+    cache.set_page(blankets, 0, 20, ["page"], [1])
+    cache.set_page(towels, 0, 20, ["page"], [2])
+    cache.set_product(1, "product-1")
+
+    # A new blanket shifts every blanket page but not the towel pages
+    cache.invalidate_product(3, make_row(3))
+
+    assert cache.get_page(blankets, 0, 20) is None
+    assert cache.get_page(towels, 0, 20) == ["page"]
+    assert cache.get_product(1) == "product-1"
+
+
+def test_invalidate_update_matches_previous_and_current_rows(cache):
+    towels = CatalogCache.normalize_filter({"product_type": "towel"})
+    cache.set_page(towels, 0, 20, ["page"], [])
+
+    # A blanket turned into a towel must appear in the towel pages
+    cache.invalidate_product(1, make_row(1), make_row(1, product_type="towel"))
+
+    assert cache.get_page(towels, 0, 20) is None
+
+
+def test_invalidate_drops_pages_holding_the_product(cache):
+    key = CatalogCache.normalize_filter({})
+    cache.set_page(key, 0, 20, ["page"], [1])
+    cache.set_product(1, "product-1")
+
+    cache.invalidate_product(1)
+
+    assert cache.get_product(1) is None
+    assert cache.get_page(key, 0, 20) is None
@@ -0,0 +1,101 @@
+import pytest
+from helper.facets import FacetIndex
+from helper.cache import CatalogCache
+
+
+def make_row(product_id, **overrides):
+    row = {
+        "id": product_id,
+        "name": "Cobija",
+        "price": 100.0,
+        "product_type": "blanket",
+        "current_quantity": 5,
+        "for_baby": False,
+        "size": "M",
+        "color": "red",
+        "line": "classic",
+        "created_at": None,
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def index():
+    index = FacetIndex(price_edges=[250, 500])
+    index.upsert(make_row(1))
+    index.upsert(make_row(2, color="blue", price=300.0))
+    index.upsert(make_row(3, product_type="towel", for_baby=True, price=600.0))
+    index.upsert(make_row(4, product_type="towel", color="blue", size=None, current_quantity=0))
+    return index
+
+
+def key(**filters):
+    return CatalogCache.normalize_filter(filters)
+
+
+def test_price_buckets():
+    index = FacetIndex(price_edges=[250, 500])
+    assert index.price_bucket(100) == "0-250"
+    assert index.price_bucket(250) == "250-500"
+    assert index.price_bucket(900) == "500+"
+
+
+def test_counts_without_filters(index):
+    counts = index.counts(key())
+    assert counts["total"] == 4
+    assert counts["facets"]["product_type"] == {"blanket": 2, "towel": 2}
+    assert counts["facets"]["color"] == {"red": 2, "blue": 2}
+    assert counts["facets"]["size"] == {"M": 3}
+    assert counts["facets"]["price_bucket"] == {"0-250": 2, "250-500": 1, "500+": 1}
+    assert counts["facets"]["in_stock"] == {True: 3, False: 1}
+
+
+def test_counts_ignore_own_facet_filter(index):
+    counts = index.counts(key(product_type="towel"))
+    assert counts["total"] == 2
+    # The selected facet still shows the alternatives
+    assert counts["facets"]["product_type"] == {"blanket": 2, "towel": 2}
+    # Other facets are narrowed to towels
+    assert counts["facets"]["color"] == {"red": 1, "blue": 1}
+    assert counts["facets"]["for_baby"] == {True: 1, False: 1}
+
+
+def test_counts_with_price_range(index):
+    counts = index.counts(key(min_price=200, max_price=700))
+    assert counts["total"] == 2
+    assert counts["facets"]["product_type"] == {"blanket": 1, "towel": 1}
+
+
+def test_update_and_remove(index):
+    index.upsert(make_row(1, color="green"))
+    index.remove(2)
+
+    counts = index.counts(key())
+    assert counts["total"] == 3
+    assert counts["facets"]["color"] == {"green": 1, "red": 1, "blue": 1}
+
+    # Freed slots are reused by new products
+    index.upsert(make_row(5))
+    assert index.counts(key())["total"] == 4
+
+
+def test_update_stock(index):
+    index.update_stock(4, 10)
+    index.update_stock(1, 0)
+    assert index.counts(key())["facets"]["in_stock"] == {True: 3, False: 1}
+    assert index.counts(key(product_type="towel"))["facets"]["in_stock"] == {True: 2}
+
+
+def test_price_range_across_bucket_bounds_and_freed_slots():
+    index = FacetIndex(price_edges=[250, 500])
+    for product_id in range(1, 201):
+        index.upsert(make_row(product_id, price=float(product_id * 5)))
+    index.remove(60)
+    index.upsert(make_row(60, price=1.0))
+
+    # 245-505: part of every bucket, without product 60 which moved below the range
+    counts = index.counts(key(min_price=245, max_price=505))
+    assert counts["total"] == len(range(49, 102)) - 1
+    assert index.counts(key(max_price=10))["total"] == 3
+    assert index.counts(key(min_price=990))["total"] == 3
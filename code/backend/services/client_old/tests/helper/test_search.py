@@ -0,0 +1,74 @@
+import pytest
+from helper.search import SearchIndex
+
+
+def make_row(product_id, name, **overrides):
+    row = {
+        "id": product_id,
+        "name": name,
+        "price": 100.0,
+        "product_type": "blanket",
+        "current_quantity": 5,
+        "for_baby": False,
+        "size": "M",
+        "color": "red",
+        "line": "classic",
+        "created_at": None,
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.upsert(make_row(1, "Cobija Pequeña"))
+    index.upsert(make_row(2, "Cobija Grande", color="azul"))
+    index.upsert(make_row(3, "Toalla de baño", product_type="towel", color="azul", line="spa"))
+    return index
+
+
+def ids(results):
+    return [product_id for product_id, _ in results]
+
+
+def test_tokenize_strips_accents_and_punctuation():
+    assert SearchIndex.tokenize("Cobija Pequeña, Baño-XL") == ["cobija", "pequena", "bano", "xl"]
+
+
+def test_exact_match(index):
+    assert ids(index.search("toalla")) == [3]
+
+
+def test_accent_insensitive(index):
+    assert ids(index.search("pequeña")) == [1]
+    assert ids(index.search("pequena")) == [1]
+
+
+def test_prefix_match(index):
+    assert sorted(ids(index.search("cob"))) == [1, 2]
+
+
+def test_all_tokens_must_match(index):
+    assert ids(index.search("cobija azul")) == [2]
+    assert index.search("cobija spa") == []
+
+
+def test_name_matches_rank_above_other_fields(index):
+    index.upsert(make_row(4, "Sabana", color="toalla"))
+    assert ids(index.search("toalla")) == [3, 4]
+
+
+def test_update_and_remove(index):
+    index.upsert(make_row(1, "Almohada"))
+    assert ids(index.search("pequena")) == []
+    assert ids(index.search("almo")) == [1]
+
+    index.remove(1)
+    assert index.search("almohada") == []
+    assert len(index) == 2
+
+
+def test_pagination(index):
+    assert len(index.search("classic", skip=0, limit=2)) == 2
+    assert len(index.search("classic", skip=2, limit=2)) == 0
@@ -0,0 +1,223 @@
+import asyncio
+from datetime import datetime
+import pytest
+from helper.snapshot import CatalogSnapshot
+from helper.shared_snapshot import MappedCatalogSnapshot, SharedCatalogSnapshot
+from helper.cache import CatalogCache
+
+
+def make_row(product_id, **overrides):
+    row = {
+        "id": product_id,
+        "name": "Cobija",
+        "price": 100.0,
+        "product_type": "blanket",
+        "current_quantity": 5,
+        "for_baby": False,
+        "size": "M",
+        "color": "red",
+        "line": "classic",
+        "created_at": datetime(2024, 1, product_id),
+    }
+    row.update(overrides)
+    return row
+
+
+def key(**filters):
+    return CatalogCache.normalize_filter(filters)
+
+
+@pytest.fixture
+def snapshot():
+    snapshot = CatalogSnapshot()
+    # Inserted out of id order: the file stores rows ordered by id
+    snapshot.upsert(make_row(3, product_type="towel", price=600.0), b'{"id": 3}')
+    snapshot.upsert(make_row(1), b'{"id": 1}')
+    snapshot.upsert(make_row(2, color="blue", price=300.0, size=None), b'{"id": 2}')
+    return snapshot
+
+
+@pytest.fixture
+def shared(tmp_path):
+    return SharedCatalogSnapshot(str(tmp_path / "catalog.snapshot"))
+
+
+def test_nothing_published(shared):
+    assert shared.current() is None
+    assert shared.age() is None
+
+
+def test_publish_and_map(shared, snapshot):
+    with shared.lock():
+        mapped = shared.publish(snapshot)
+
+    assert isinstance(mapped, MappedCatalogSnapshot)
+    assert mapped.generation == 1
+    assert len(mapped) == 3
+    assert mapped.query(key()) == [1, 2, 3]
+    assert mapped.query(key(), sort="price_desc") == [3, 2, 1]
+    assert mapped.query(key(color="blue")) == [2]
+    assert mapped.query(key(size="M")) == [1, 3]
+    assert mapped.payload(2) == b'{"id": 2}'
+    assert mapped.payload(4) is None
+    assert list(mapped.payloads()) == [(1, b'{"id": 1}'), (2, b'{"id": 2}'), (3, b'{"id": 3}')]
+
+
+def test_mapped_snapshot_is_read_only(shared, snapshot):
+    with shared.lock():
+        mapped = shared.publish(snapshot)
+    with pytest.raises(TypeError):
+        mapped.upsert(make_row(4))
+    with pytest.raises(ValueError):
+        mapped._columns["price"][0] = 1.0
+
+
+def test_update_publishes_a_new_generation(shared, snapshot):
+    with shared.lock():
+        shared.publish(snapshot)
+
+    def apply(mutable):
+        mutable.remove(1)
+        mutable.upsert(make_row(4, color="green"), b'{"id": 4}')
+        mutable.update_stock(3, 0)
+
+    mapped = shared.update(apply)
+    assert mapped.generation == 2
+    assert mapped.query(key()) == [2, 3, 4]
+    assert mapped.query(key(color="green")) == [4]
+    assert mapped.payload(1) is None
+    assert mapped._columns["current_quantity"][mapped._slot(3)] == 0
+
+
+def test_other_processes_remap_on_replace(shared, snapshot, tmp_path):
+    changes = []
+    reader = SharedCatalogSnapshot(shared.path, on_change=changes.append)
+    with shared.lock():
+        shared.publish(snapshot)
+
+    first = reader.current()
+    assert changes == [first]
+    # Unchanged file: the mapping is reused
+    assert reader.current() is first
+
+    shared.update(lambda mutable: mutable.remove(2))
+    second = reader.current()
+    assert second is not first
+    assert changes == [first, second]
+    assert second.query(key()) == [1, 3]
+    # The previous mapping stays readable
+    assert first.query(key()) == [1, 2, 3]
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / "catalog.snapshot"
+    path.write_bytes(b"\0" * 128)
+    with pytest.raises(ValueError):
+        MappedCatalogSnapshot(str(path))
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_without_blocking_the_loop(shared):
+    order = []
+
+    async def build(name):
+        async with shared.acquire("build", poll_interval=0.01):
+            order.append(f"{name} start")
+            await asyncio.sleep(0.05)
+            order.append(f"{name} end")
+
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    await asyncio.gather(build("first"), build("second"), tick())
+    assert order == ["first start", "first end", "second start", "second end"]
+    assert ticks == 5
+
+
+@pytest.mark.asyncio
+async def test_replace_publishes_from_a_thread(shared, snapshot):
+    mapped = await shared.replace(snapshot)
+    assert mapped.generation == 1
+    assert shared.current() is mapped
+    assert (await shared.replace(snapshot)).generation == 2
+
+
+@pytest.mark.asyncio
+async def test_submit_batches_concurrent_changes(shared, snapshot):
+    await shared.replace(snapshot)
+
+    published = await asyncio.gather(
+        shared.submit(lambda mutable: mutable.remove(1)),
+        shared.submit(lambda mutable: mutable.remove(2)),
+        shared.submit(lambda mutable: mutable.update_stock(3, 0)),
+    )
+    # Queued before the flush ran: one rewrite publishes the three of them
+    assert [mapped.generation for mapped in published] == [2, 2, 2]
+    assert shared.current().query(key()) == [3]
+
+
+@pytest.mark.asyncio
+async def test_submit_notifies_own_publishes(shared, snapshot):
+    changes = []
+    writer = SharedCatalogSnapshot(shared.path, on_change=changes.append)
+    await shared.replace(snapshot)
+    writer.current()
+
+    await shared.submit(lambda mutable: mutable.remove(1))
+    mapped = await writer.submit(lambda mutable: mutable.remove(2))
+    assert changes[-1] is mapped
+    assert mapped.query(key()) == [3]
+    assert len(changes) == 2
+    # The writer had not mapped the other process's change: both are listed
+    assert sorted(mapped.changed_since(changes[0].generation)) == [1, 2]
+
+
+def test_changed_since(shared, snapshot):
+    with shared.lock():
+        shared.publish(snapshot)
+    shared.update(lambda mutable: mutable.update_stock(1, 0))
+    shared.update(lambda mutable: mutable.remove(2))
+    mapped = shared.update(lambda mutable: mutable.upsert(make_row(4), b'{"id": 4}'))
+
+    assert mapped.generation == 4
+    assert mapped.changed_since(4) == []
+    assert mapped.changed_since(3) == [4]
+    assert sorted(mapped.changed_since(1)) == [1, 2, 4]
+    # Nothing is known before a snapshot built from scratch
+    assert mapped.changed_since(0) is None
+
+    with shared.lock():
+        rebuilt = shared.publish(snapshot)
+    assert rebuilt.changed_since(4) is None
+    assert rebuilt.changed_since(5) == []
+
+
+def test_change_log_drops_the_oldest_generations(tmp_path, snapshot):
+    shared = SharedCatalogSnapshot(str(tmp_path / "catalog.snapshot"), change_log_size=2)
+    with shared.lock():
+        shared.publish(snapshot)
+    shared.update(lambda mutable: mutable.update_stock(1, 0))
+    shared.update(lambda mutable: mutable.update_stock(2, 0))
+    mapped = shared.update(lambda mutable: mutable.update_stock(3, 0))
+
+    assert mapped.changes_since == 2
+    assert mapped.changes() == {2: 3, 3: 4}
+    assert mapped.changed_since(1) is None
+    assert sorted(mapped.changed_since(2)) == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_submit_reports_failures(shared, snapshot):
+    await shared.replace(snapshot)
+
+    def fail(mutable):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await shared.submit(fail)
+    assert (await shared.submit(lambda mutable: mutable.remove(1))).generation == 2
@@ -0,0 +1,79 @@
+from datetime import datetime
+import pytest
+from helper.snapshot import CatalogSnapshot
+from helper.cache import CatalogCache
+
+
+def make_row(product_id, **overrides):
+    row = {
+        "id": product_id,
+        "name": "Cobija",
+        "price": 100.0,
+        "product_type": "blanket",
+        "current_quantity": 5,
+        "for_baby": False,
+        "size": "M",
+        "color": "red",
+        "line": "classic",
+        "created_at": datetime(2024, 1, product_id),
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def snapshot():
+    snapshot = CatalogSnapshot(capacity=2)
+    snapshot.upsert(make_row(1))
+    snapshot.upsert(make_row(2, color="blue", price=300.0))
+    snapshot.upsert(make_row(3, product_type="towel", for_baby=True, price=600.0))
+    snapshot.upsert(make_row(4, product_type="towel", color="blue", size=None, price=100.0))
+    return snapshot
+
+
+def key(**filters):
+    return CatalogCache.normalize_filter(filters)
+
+
+def test_query_without_filters_keeps_id_order(snapshot):
+    assert snapshot.query(key()) == [1, 2, 3, 4]
+    assert len(snapshot) == 4
+
+
+def test_filters(snapshot):
+    assert snapshot.query(key(product_type="towel")) == [3, 4]
+    assert snapshot.query(key(color="blue", product_type="towel")) == [4]
+    assert snapshot.query(key(for_baby=True)) == [3]
+    assert snapshot.query(key(min_price=200, max_price=700)) == [2, 3]
+    assert snapshot.query(key(size="M")) == [1, 2, 3]
+
+
+def test_unknown_value_matches_nothing(snapshot):
+    assert snapshot.query(key(color="green")) == []
+
+
+def test_sorts_break_ties_by_id(snapshot):
+    assert snapshot.query(key(), sort="price_asc") == [1, 4, 2, 3]
+    assert snapshot.query(key(), sort="price_desc") == [3, 2, 1, 4]
+    assert snapshot.query(key(), sort="newest") == [4, 3, 2, 1]
+
+
+def test_pagination(snapshot):
+    assert snapshot.query(key(), sort="price_asc", skip=1, limit=2) == [4, 2]
+    assert snapshot.query(key(), skip=4, limit=2) == []
+
+
+def test_update_remove_and_stock(snapshot):
+    snapshot.upsert(make_row(1, price=1000.0))
+    snapshot.remove(2)
+    snapshot.update_stock(3, 0)
+    assert snapshot.query(key(), sort="price_desc") == [1, 3, 4]
+
+    # Freed slots are reused by new products
+    snapshot.upsert(make_row(5, color="blue"))
+    assert snapshot.query(key(color="blue")) == [4, 5]
+
+
+def test_unknown_sort(snapshot):
+    with pytest.raises(ValueError):
+        snapshot.query(key(), sort="name")
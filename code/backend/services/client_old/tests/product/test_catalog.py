@@ -0,0 +1,158 @@
+from datetime import datetime
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from helper import CatalogCache, CatalogSnapshot, SharedCatalogSnapshot
+from routers.product import catalog
+
+
+def make_row(product_id, **overrides):
+    row = {
+        "id": product_id,
+        "name": "Cobija",
+        "price": 100.0,
+        "product_type": "blanket",
+        "current_quantity": 5,
+        "for_baby": False,
+        "size": "M",
+        "color": "red",
+        "line": "classic",
+        "created_at": datetime(2024, 1, product_id),
+        "updated_at": datetime(2024, 2, 1),
+    }
+    row.update(overrides)
+    return row
+
+
+def quantities(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    db_session = AsyncMock()
+    db_session.execute.return_value = result
+    return db_session
+
+
+@pytest.fixture
+def shared(tmp_path, monkeypatch):
+    shared = SharedCatalogSnapshot(str(tmp_path / "catalog.snapshot"), on_change=catalog._snapshot_changed)
+    monkeypatch.setattr(catalog, "shared_snapshot", shared)
+    monkeypatch.setattr(catalog, "_stock_checked_at", 0.0)
+    monkeypatch.setattr(catalog, "_latest", None)
+    monkeypatch.setattr(catalog, "_indexed", None)
+
+    # Built by another worker; mapping it rebuilds the indexes in a thread
+    publish(SharedCatalogSnapshot(shared.path), make_row(1), make_row(2, current_quantity=1))
+    shared.current()
+    wait_for_rebuild()
+    return shared
+
+
+def publish(shared, *rows):
+    snapshot = CatalogSnapshot()
+    for row in rows:
+        snapshot.upsert(row, catalog.product_payload(row, []))
+    with shared.lock():
+        shared.publish(snapshot)
+
+
+def wait_for_rebuild():
+    rebuild = catalog._rebuild
+    if rebuild is not None:
+        rebuild.join(5)
+
+
+def counts(**filters):
+    return catalog.facet_index.counts(CatalogCache.normalize_filter(filters))
+
+
+@pytest.mark.asyncio
+async def test_refresh_stock_applies_changes_made_elsewhere(shared):
+    db_session = quantities([(1, 5), (2, 0), (3, 9)])
+    await catalog.refresh_stock(db_session)
+
+    snapshot = shared.current()
+    assert snapshot.generation == 2
+    assert json.loads(snapshot.payload(2))["current_quantity"] == 0
+    # Products missing from the snapshot are left to the next build
+    assert snapshot.payload(3) is None
+    assert counts()["facets"]["in_stock"] == {True: 1, False: 1}
+
+
+@pytest.mark.asyncio
+async def test_refresh_stock_runs_once_per_ttl(shared):
+    db_session = quantities([(1, 5), (2, 1)])
+    await catalog.refresh_stock(db_session)
+    await catalog.refresh_stock(db_session)
+
+    assert db_session.execute.await_count == 1
+    # Nothing changed: nothing is republished
+    assert shared.current().generation == 1
+
+
+def test_changes_from_another_worker_update_the_indexes_in_place(shared):
+    other = SharedCatalogSnapshot(shared.path)
+    facet_index = catalog.facet_index
+    other.update(lambda snapshot: snapshot.upsert(make_row(2, color="blue"), catalog.product_payload(make_row(2, color="blue"), [])))
+    other.update(lambda snapshot: snapshot.remove(1))
+
+    # Two generations behind: both are listed in the file's change log
+    assert shared.current().generation == 3
+    assert catalog._rebuild is None
+    assert catalog.facet_index is facet_index
+    assert counts()["facets"]["color"] == {"blue": 1}
+    assert [product_id for product_id, _ in catalog.search_index.search("cobija")] == [2]
+
+
+@pytest.mark.asyncio
+async def test_own_writes_update_the_indexes(shared):
+    await catalog.product_deleted(1)
+    await catalog.product_saved(make_row(3, product_type="towel"))
+
+    assert catalog._rebuild is None
+    assert counts()["facets"]["product_type"] == {"blanket": 1, "towel": 1}
+
+
+def test_full_rebuild_elsewhere_swaps_in_new_indexes(shared):
+    facet_index = catalog.facet_index
+    publish(SharedCatalogSnapshot(shared.path), make_row(3, color="green"), make_row(4, color="green"))
+
+    shared.current()
+    wait_for_rebuild()
+    assert catalog.facet_index is not facet_index
+    assert counts()["facets"]["color"] == {"green": 2}
+    assert catalog._indexed is shared.current()
+
+
+def scan(rows, during=None):
+    """
+    A session whose product scan runs `during` after the first row was read.
+    """
+    async def products():
+        for index, row in enumerate(rows):
+            yield SimpleNamespace(**row, images=[])
+            if index == 0 and during is not None:
+                during()
+
+    db_session = MagicMock()
+    db_session.stream_scalars = AsyncMock(return_value=products())
+    return db_session
+
+
+@pytest.mark.asyncio
+async def test_load_keeps_writes_published_during_the_scan(shared):
+    other = SharedCatalogSnapshot(shared.path)
+
+    def write_elsewhere():
+        # Committed after the scan read these rows, published before the build is
+        other.update(lambda snapshot: snapshot.upsert(make_row(1, color="blue"), catalog.product_payload(make_row(1, color="blue"), [])))
+        other.update(lambda snapshot: snapshot.remove(2))
+
+    await catalog.load_catalog(scan([make_row(1), make_row(2), make_row(3)], during=write_elsewhere), force=True)
+
+    snapshot = shared.current()
+    assert json.loads(snapshot.payload(1))["color"] == "blue"
+    assert snapshot.payload(2) is None
+    assert snapshot.query(CatalogCache.normalize_filter({"color": "blue"})) == [1]
+    assert counts()["total"] == 2
+    assert counts()["facets"]["color"] == {"blue": 1, "red": 1}
@@ -0,0 +1,110 @@
+import io
+import pytest
+from unittest.mock import AsyncMock
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import OperationalError
+from routers.product.importer import read_rows, validate_row, import_products
+
+
+CSV = (
+    "name,price,product_type,for_baby,size,color,line\n"
+    "Cobija,199.90,blanket,false,M,red,classic\n"
+    "Toalla,-5,towel,true,,,\n"
+    "Sabana,350,sheet,1,L,,spa\n"
+)
+
+NDJSON = (
+    '{"name": "Cobija", "price": 199.9, "product_type": "blanket", "for_baby": false}\n'
+    "\n"
+    "not json\n"
+    '{"id": 7, "name": "Toalla", "price": 80, "product_type": "towel", "for_baby": true}\n'
+    "[1, 2]\n"
+)
+
+
+def test_read_csv_rows():
+    rows = list(read_rows(io.StringIO(CSV), "csv"))
+    assert [line for line, _ in rows] == [2, 3, 4]
+    # Empty cells are dropped
+    assert rows[1][1] == {"name": "Toalla", "price": "-5", "product_type": "towel", "for_baby": "true"}
+
+
+def test_read_ndjson_rows():
+    rows = list(read_rows(io.StringIO(NDJSON), "ndjson"))
+    assert [line for line, _ in rows] == [1, 3, 4, 5]
+    assert rows[1][1].startswith("Invalid JSON")
+    assert rows[2][1]["id"] == 7
+    assert rows[3][1] == "Expected a JSON object"
+
+
+def test_validate_row():
+    row = validate_row({"name": "Cobija", "price": "199.90", "product_type": "blanket", "for_baby": "false"})
+    assert row == {"name": "Cobija", "price": 199.9, "product_type": "blanket", "for_baby": False, "size": None, "color": None, "line": None}
+    assert validate_row({"id": "7", "name": "A", "price": 1, "product_type": "x", "for_baby": True})["id"] == 7
+
+    errors = validate_row({"name": "", "price": 10, "product_type": "x", "for_baby": True})
+    assert errors and errors[0].startswith("name")
+    assert validate_row({"id": "abc", "name": "A", "price": 1, "product_type": "x", "for_baby": True}) == ["id: must be a positive integer"]
+
+
+@pytest.mark.parametrize("product_id", [7.5, True, [7], {"id": 7}, "7.5", 0])
+def test_validate_row_rejects_non_integer_ids(product_id):
+    values = {"id": product_id, "name": "A", "price": 1, "product_type": "x", "for_baby": True}
+    assert validate_row(values) == ["id: must be a positive integer"]
+    assert validate_row({**values, "id": 7.0})["id"] == 7
+
+
+@pytest.mark.asyncio
+async def test_import_writes_in_batches():
+    db_session = AsyncMock()
+    result = await import_products(db_session, io.StringIO(CSV), "csv", batch_size=1)
+
+    assert (result.rows, result.created, result.upserted, result.failed) == (3, 2, 0, 1)
+    assert result.errors[0].row == 3
+    assert db_session.execute.await_count == 2
+    assert db_session.commit.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_import_upserts_rows_with_id():
+    db_session = AsyncMock()
+    result = await import_products(db_session, io.StringIO(NDJSON), "ndjson", batch_size=10)
+
+    assert (result.rows, result.created, result.upserted, result.failed) == (4, 1, 1, 2)
+    # One INSERT for the new rows and one INSERT ... ON DUPLICATE KEY UPDATE, one transaction
+    assert db_session.execute.await_count == 2
+    upsert = db_session.execute.await_args_list[1].args[0]
+    assert "ON DUPLICATE KEY UPDATE" in str(upsert.compile(dialect=mysql.dialect()))
+    assert db_session.commit.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_is_retried_row_by_row():
+    db_session = AsyncMock()
+    calls = []
+
+    async def execute(statement):
+        calls.append(statement)
+        # The batch fails, then only the second row fails on its own
+        if len(calls) in (1, 3):
+            raise OperationalError("INSERT", {}, Exception("Data too long for column 'name'"))
+    db_session.execute.side_effect = execute
+
+    result = await import_products(db_session, io.StringIO(CSV), "csv", batch_size=10)
+    assert (result.created, result.failed) == (1, 2)
+    assert [error.row for error in result.errors] == [3, 4]
+    assert result.errors[1].errors == ["Data too long for column 'name'"]
+    assert db_session.rollback.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_import_stops_at_undecodable_bytes():
+    db_session = AsyncMock()
+    # Well past the decoder's chunk size, so the first rows decode before the bad bytes
+    row = b'{"name": "Cobija", "price": 199.9, "product_type": "blanket", "for_baby": false}\n'
+    file = io.TextIOWrapper(io.BytesIO(row * 500 + b'{"name": "\xff"}\n'), encoding="utf-8", newline="")
+
+    result = await import_products(db_session, file, "ndjson", batch_size=10)
+    assert result.truncated
+    assert 0 < result.created < 500
+    assert result.errors[-1].errors[0].startswith("The file must be UTF-8 encoded")
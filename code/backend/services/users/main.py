@@ -1,7 +1,9 @@
 from fastapi import FastAPI
-from routers import addresses_router, clients_router
+from routers import addresses_router, checkout_router, clients_router, returns_router
 from contextlib import asynccontextmanager
 from myOrm.database import sessionmanager
+from myAws import secret_store
+from myHttp import NegotiatedResponse, NegotiationMiddleware, http_client
 import uvicorn
 
 
@@ -11,17 +13,25 @@ async def lifespan(app: FastAPI):
     Function that handles startup and shutdown events.
     To understand more, read https://fastapi.tiangolo.com/advanced/events/
     """
-    yield
+    # Fetch every secret the configuration depends on, concurrently
+    await secret_store.resolve_all()
+    # Close the pooled outbound HTTP connections on shutdown
+    async with http_client.lifespan():
+        yield
     if sessionmanager._engine is not None:
         # Close the DB connection
         await sessionmanager.close()
 
 
-app = FastAPI(lifespan=lifespan)
+# JSON by default, MessagePack for the services that ask for it (Accept: application/msgpack)
+app = FastAPI(lifespan=lifespan, default_response_class=NegotiatedResponse)
+app.add_middleware(NegotiationMiddleware)
 
 # Include routers
 app.include_router(addresses_router)
 app.include_router(clients_router)
+app.include_router(checkout_router)
+app.include_router(returns_router)
 
 # Health check endpoint for aws load balancer
 @app.get("/health")
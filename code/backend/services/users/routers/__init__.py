@@ -1,2 +1,4 @@
 from .addresses import router as addresses_router
-from .clients import router as clients_router
\ No newline at end of file
+from .clients import router as clients_router
+from .checkout import router as checkout_router
+from .returns import router as returns_router
\ No newline at end of file
@@ -3,9 +3,10 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .schema import AddressCreate, AddressRead
-from myOrm.models import Address as AddressModel, Client
+from myOrm.models import Address as AddressModel
 from myOrm.database import get_db_session
-from myDependencies.auth import validate_is_authenticated
+from myOrm.statements import client_by_id, address_by_id_and_client
+from myDependencies import Principal, validate_is_authenticated
 
 router = APIRouter(
     prefix="/api/v1/users/addresses",
@@ -16,11 +17,10 @@ router = APIRouter(
 async def create_address(
     addr_in: AddressCreate,
     db: AsyncSession = Depends(get_db_session),
-    client: Client = Depends(validate_is_authenticated),
+    client: Principal = Depends(validate_is_authenticated),
 ):
     # 1) Verify client exists
-    result = await db.execute(select(Client).where(Client.id == client.id))
-    client = result.scalars().one_or_none()
+    client = await client_by_id.one_or_none(db, client.id)
     if not client:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -38,7 +38,7 @@ async def create_address(
 @router.get("/", response_model=list[AddressRead])
 async def list_addresses(
     db: AsyncSession = Depends(get_db_session),
-    client: Client = Depends(validate_is_authenticated),
+    client: Principal = Depends(validate_is_authenticated),
 ):
     result = await db.execute(
         select(AddressModel).where(AddressModel.client_id == client.id)
@@ -50,15 +50,9 @@ async def list_addresses(
 async def get_address(
     address_id: int,
     db: AsyncSession = Depends(get_db_session),
-    client: Client = Depends(validate_is_authenticated),
+    client: Principal = Depends(validate_is_authenticated),
 ):
-    result = await db.execute(
-        select(AddressModel).where(
-            AddressModel.id == address_id,
-            AddressModel.client_id == client.id
-        )
-    )
-    address = result.scalars().one_or_none()
+    address = await address_by_id_and_client.one_or_none(db, address_id, client.id)
     if not address:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -71,15 +65,9 @@ async def get_address(
 async def delete_address(
     address_id: int,
     db: AsyncSession = Depends(get_db_session),
-    client: Client = Depends(validate_is_authenticated),
+    client: Principal = Depends(validate_is_authenticated),
 ):
-    result = await db.execute(
-        select(AddressModel).where(
-            AddressModel.id == address_id,
-            AddressModel.client_id == client.id
-        )
-    )
-    address = result.scalars().one_or_none()
+    address = await address_by_id_and_client.one_or_none(db, address_id, client.id)
     if not address:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,210 @@
+"""
+Sale creation from a client's cart, in one transaction of a fixed number of
+statements whatever the size of the cart:
+
+  1. the cart lines and their prices, in one query
+  2. the discount, if a code is given
+  3. the sale row
+  4. the stock reservation, through myOrm.ledger: one locking SELECT of the
+     products in id order, one INSERT of their history, one UPDATE
+  5. every sale item, in one multi-row INSERT
+  6. the removal of the cart lines that were sold; if another checkout of
+     the same cart removed them first, the transaction is abandoned
+
+The cart is not locked when it is read: a locking read joined to products
+would lock the product rows in plan order, defeating the id ordering of the
+ledger. The ledger serializes checkouts of the same products instead, and
+step 6 catches a cart checked out twice.
+
+The stock is reserved before the sale items are inserted: their foreign key
+checks take shared locks on the products, and two checkouts holding shared
+locks on a product would deadlock upgrading them for the ledger. Taking the
+exclusive locks first leaves the foreign key checks nothing to wait for.
+Deadlocks and lock wait timeouts that remain (e.g. with other writers of
+products) are reported by is_lock_conflict, and the checkout can be retried.
+"""
+from myExceptions import service as serviceExceptions
+from myOrm.ledger import apply_movements, sale_movements
+from myOrm.models import CartItem, Discount, Product, Sale, SaleItem
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import bindparam, delete, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+CENT = Decimal("0.01")
+# MySQL errors after which the transaction was rolled back and can be run again
+LOCK_CONFLICT_ERRORS = (
+    1205,  # ER_LOCK_WAIT_TIMEOUT
+    1213,  # ER_LOCK_DEADLOCK
+)
+
+# Prebuilt, like myOrm.statements: checkout runs them on every request
+CART_LINES = (
+    select(CartItem.id, CartItem.product_id, CartItem.quantity, Product.price)
+    .join(Product, Product.id == CartItem.product_id)
+    .where(CartItem.client_id == bindparam("client_id"))
+    .order_by(CartItem.product_id)
+)
+ACTIVE_DISCOUNT = select(Discount).where(
+    Discount.code == bindparam("code"),
+    Discount.is_active.is_(True),
+    Discount.start_date <= bindparam("now"),
+    Discount.end_date > bindparam("now"),
+)
+
+
+class CartChangedError(serviceExceptions.BusinessLogicError):
+    """Raised when the cart was checked out or modified by a concurrent request."""
+    pass
+
+
+@dataclass
+class SaleLine:
+    product_id: int
+    quantity: int
+    unit_price: Decimal
+    total_price: Decimal = Decimal(0)
+
+
+@dataclass
+class CreatedSale:
+    id: int
+    client_id: int
+    shipping_address_id: int
+    subtotal: Decimal
+    discount_amount: Decimal
+    total_amount: Decimal
+    payment_method: str
+    payment_status: str = "pending"
+    shipping_status: str = "pending"
+    items: list[SaleLine] = field(default_factory=list)
+
+
+async def price_cart(db_session: AsyncSession, client_id: int) -> tuple[list[int], list[SaleLine]]:
+    """
+    Read the cart of a client, priced at the current product prices.
+
+    Returns:
+        tuple[list[int], list[SaleLine]]: The ids of the cart rows, and one
+            line per product (cart rows of the same product are merged),
+            ordered by product id
+    """
+    result = await db_session.execute(CART_LINES, {"client_id": client_id})
+    cart_item_ids = []
+    lines: dict[int, SaleLine] = {}
+    for cart_item_id, product_id, quantity, price in result.all():
+        cart_item_ids.append(cart_item_id)
+        line = lines.get(product_id)
+        if line is None:
+            lines[product_id] = SaleLine(product_id, quantity, Decimal(price))
+        else:
+            line.quantity += quantity
+    for line in lines.values():
+        line.total_price = (line.unit_price * line.quantity).quantize(CENT)
+    return cart_item_ids, list(lines.values())
+
+
+def discount_amount(discount: Discount, subtotal: Decimal) -> Decimal:
+    """
+    Amount taken off a subtotal by a discount.
+
+    Raises:
+        BusinessLogicError: If the subtotal is below the discount's minimum purchase
+    """
+    if discount.min_purchase_amount is not None and subtotal < discount.min_purchase_amount:
+        raise serviceExceptions.BusinessLogicError(f"Discount requires a minimum purchase of {discount.min_purchase_amount}")
+    if discount.discount_type == "percentage":
+        amount = subtotal * Decimal(discount.discount_value) / 100
+    else:
+        amount = Decimal(discount.discount_value)
+    if discount.max_discount_amount is not None:
+        amount = min(amount, Decimal(discount.max_discount_amount))
+    return min(amount, subtotal).quantize(CENT)
+
+
+def is_lock_conflict(error: OperationalError) -> bool:
+    """
+    Whether a database error is a deadlock or lock wait timeout, after which
+    the checkout can be run again from the start.
+    """
+    args = getattr(error.orig, "args", ())
+    return bool(args) and args[0] in LOCK_CONFLICT_ERRORS
+
+
+async def create_sale(
+    db_session: AsyncSession,
+    client_id: int,
+    shipping_address_id: int,
+    payment_method: str,
+    discount_code: Optional[str] = None
+) -> CreatedSale:
+    """
+    Turn the cart of a client into a sale, and commit it.
+
+    Args:
+        db_session (AsyncSession): Database session
+        client_id (int): The buyer
+        shipping_address_id (int): Address of the buyer to ship to (checked by the caller)
+        payment_method (str): How the sale is paid
+        discount_code (str | None): Code of an active discount
+
+    Returns:
+        CreatedSale: The sale and its lines
+
+    Raises:
+        BusinessLogicError: If the cart is empty or the discount does not apply
+        ResourceNotFoundError: If the discount code is unknown or inactive
+        InsufficientStockError: If a product does not have enough stock
+        CartChangedError: If the cart was checked out concurrently; nothing is committed
+    """
+    cart_item_ids, lines = await price_cart(db_session, client_id)
+    if not lines:
+        raise serviceExceptions.BusinessLogicError("Cart is empty")
+    subtotal = sum((line.total_price for line in lines), Decimal(0))
+
+    discount = Decimal(0)
+    if discount_code:
+        result = await db_session.execute(ACTIVE_DISCOUNT, {"code": discount_code, "now": datetime.now()})
+        found = result.scalars().one_or_none()
+        if found is None:
+            raise serviceExceptions.ResourceNotFoundError(f"Discount {discount_code} not found")
+        discount = discount_amount(found, subtotal)
+
+    total_amount = subtotal - discount
+    result = await db_session.execute(insert(Sale).values(
+        client_id=client_id,
+        shipping_address_id=shipping_address_id,
+        total_amount=total_amount,
+        payment_method=payment_method,
+    ))
+    sale = CreatedSale(
+        id=result.inserted_primary_key[0],
+        client_id=client_id,
+        shipping_address_id=shipping_address_id,
+        subtotal=subtotal,
+        discount_amount=discount,
+        total_amount=total_amount,
+        payment_method=payment_method,
+        items=lines,
+    )
+
+    # Before the items: see the module docstring
+    await apply_movements(db_session, sale_movements(sale.id, [(line.product_id, line.quantity) for line in lines]))
+    await db_session.execute(insert(SaleItem).values([
+        {
+            "sale_id": sale.id,
+            "product_id": line.product_id,
+            "quantity": line.quantity,
+            "unit_price": line.unit_price,
+            "total_price": line.total_price,
+        }
+        for line in lines
+    ]))
+    result = await db_session.execute(delete(CartItem).where(CartItem.id.in_(cart_item_ids)))
+    if result.rowcount != len(cart_item_ids):
+        raise CartChangedError("Cart changed during checkout")
+    await db_session.commit()
+    return sale
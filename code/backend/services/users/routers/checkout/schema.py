@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from decimal import Decimal
+from typing import Optional
+
+class CheckoutRequest(BaseModel):
+    shipping_address_id: int
+    payment_method: str = Field(..., min_length=1, max_length=50)
+    discount_code: Optional[str] = None
+
+class SaleItemRead(BaseModel):
+    product_id: int
+    quantity: int
+    unit_price: Decimal
+    total_price: Decimal
+
+class SaleRead(BaseModel):
+    id: int
+    client_id: int
+    shipping_address_id: int
+    subtotal: Decimal
+    discount_amount: Decimal
+    total_amount: Decimal
+    payment_method: str
+    payment_status: str
+    shipping_status: str
+    items: list[SaleItemRead]
@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .schema import CheckoutRequest, SaleRead
+from .sales import CartChangedError, create_sale, is_lock_conflict
+from myExceptions import service as serviceExceptions
+from myOrm.database import get_db_session
+from myOrm.statements import address_by_id_and_client
+from myDependencies import Principal, validate_is_authenticated
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Runs of a sale transaction that hit a deadlock or lock wait timeout
+CHECKOUT_ATTEMPTS = 3
+
+router = APIRouter(
+    prefix="/api/v1/users/checkout",
+    tags=["checkout"],
+)
+
+@router.post("/", response_model=SaleRead, status_code=status.HTTP_201_CREATED)
+async def checkout(
+    checkout_in: CheckoutRequest,
+    db: AsyncSession = Depends(get_db_session),
+    client: Principal = Depends(validate_is_authenticated),
+):
+    """
+    Turn the client's cart into a sale.
+
+    The sale, its items, the stock movements and the emptied cart are
+    written in one transaction (see sales.create_sale). A transaction
+    rolled back by a deadlock or lock wait timeout is run again, up to
+    CHECKOUT_ATTEMPTS times, then reported as 503.
+    """
+    address = await address_by_id_and_client.one_or_none(db, checkout_in.shipping_address_id, client.id)
+    if not address:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Address not found"
+        )
+
+    for attempt in range(1, CHECKOUT_ATTEMPTS + 1):
+        try:
+            return await create_sale(
+                db,
+                client.id,
+                checkout_in.shipping_address_id,
+                checkout_in.payment_method,
+                checkout_in.discount_code,
+            )
+        except OperationalError as e:
+            await db.rollback()
+            if not is_lock_conflict(e):
+                raise
+            logger.warning(f"Checkout of client {client.id} hit a lock conflict (attempt {attempt}): {e.orig}")
+        except (serviceExceptions.InsufficientStockError, CartChangedError) as e:
+            await db.rollback()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        except serviceExceptions.ResourceNotFoundError as e:
+            await db.rollback()
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except serviceExceptions.BusinessLogicError as e:
+            await db.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Checkout conflicted with concurrent orders, please retry",
+        headers={"Retry-After": "1"},
+    )
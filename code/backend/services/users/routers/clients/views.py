@@ -1,11 +1,11 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from myDependencies import validate_is_admin, validate_is_authenticated
+from myDependencies import Principal, get_current_client, principal_store, revoke_tokens, validate_is_admin
 
 from myOrm.models import Client
 from myOrm.database import get_db_session
+from myOrm.statements import client_by_id
 from .schema import UserCreate, UserUpdate, UserResponse
 from myEncryption import Encryption
 
@@ -20,7 +20,7 @@ async def create_client(
     db: AsyncSession = Depends(get_db_session),
 ):
     # hash the incoming password
-    hashed = Encryption.hash_password(client_in.password)
+    hashed = await Encryption.hash_password_async(client_in.password)
     new = Client(
         email=client_in.email,
         first_name=client_in.first_name,
@@ -34,7 +34,7 @@ async def create_client(
 
 @router.get("/me", response_model=UserResponse)
 async def get_me(
-    user: Client = Depends(validate_is_authenticated)
+    user: Client = Depends(get_current_client)
 ):
     return user
 
@@ -42,32 +42,39 @@ async def get_me(
 async def update_me(
     client_in: UserUpdate,
     db: AsyncSession = Depends(get_db_session),
-    client: Client = Depends(validate_is_authenticated)
+    client: Client = Depends(get_current_client)
 ):
     # apply only the set fields
-    for field, value in client_in.dict(exclude_unset=True).items():
+    changes = client_in.dict(exclude_unset=True)
+    password = changes.pop("password", None)
+    for field, value in changes.items():
         setattr(client, field, value)
-    db.add(client)
-    await db.commit()
+    if password is not None:
+        client.password_hash = await Encryption.hash_password_async(password)
+        # Tokens issued with the old password stop working
+        await revoke_tokens(db, client)
+    else:
+        db.add(client)
+        await db.commit()
     await db.refresh(client)
     return client
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_me(
-    user: Client = Depends(validate_is_authenticated),
+    user: Client = Depends(get_current_client),
     db: AsyncSession = Depends(get_db_session)
     ):
     await db.delete(user)
     await db.commit()
+    principal_store.invalidate(user.id)
 
 @router.get("/{client_id}", response_model=UserResponse)
 async def get_client(
     client_id: int, 
     db: AsyncSession = Depends(get_db_session),
-    user: Client = Depends(validate_is_admin)
+    user: Principal = Depends(validate_is_admin)
     ):
-    result = await db.execute(select(Client).where(Client.id == client_id))
-    client = result.scalar_one_or_none()
+    client = await client_by_id.one_or_none(db, client_id)
     if not client:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found")
     return client
@@ -0,0 +1 @@
+from .views import router
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+Returns of sold items, in one transaction of a fixed number of statements
+whatever the number of items:
+
+  1. the sale, locked, so that returns of the same sale are serialized and
+     an item cannot be returned twice by concurrent requests, with its
+     total and what was already refunded
+  2. the items of the sale, with the quantities already returned
+  3. the return row
+  4. the restock, through myOrm.ledger, before the return items like the
+     stock reservation of a checkout (see routers.checkout.sales)
+  5. every return item, in one multi-row INSERT
+"""
+from myExceptions import service as serviceExceptions
+from myOrm.ledger import apply_movements, return_movements
+from myOrm.models import Return, ReturnItem, Sale, SaleItem
+from dataclasses import dataclass, field
+from decimal import Decimal
+from sqlalchemy import bindparam, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+CENT = Decimal("0.01")
+
+# Prebuilt, like myOrm.statements
+LOCK_SALE = (
+    select(
+        Sale.total_amount,
+        select(func.coalesce(func.sum(Return.refund_amount), 0))
+        .where(Return.sale_id == Sale.id)
+        .scalar_subquery(),
+    )
+    .where(Sale.id == bindparam("sale_id"), Sale.client_id == bindparam("client_id"))
+    .with_for_update()
+)
+SALE_ITEMS = (
+    select(
+        SaleItem.id,
+        SaleItem.product_id,
+        SaleItem.quantity,
+        SaleItem.unit_price,
+        SaleItem.total_price,
+        func.coalesce(func.sum(ReturnItem.quantity), 0),
+    )
+    .outerjoin(ReturnItem, ReturnItem.sale_item_id == SaleItem.id)
+    .where(SaleItem.sale_id == bindparam("sale_id"))
+    .group_by(SaleItem.id)
+)
+
+
+@dataclass
+class ReturnLine:
+    sale_item_id: int
+    product_id: int
+    quantity: int
+    unit_price: Decimal
+    total_price: Decimal = Decimal(0)
+
+
+@dataclass
+class CreatedReturn:
+    id: int
+    sale_id: int
+    client_id: int
+    return_reason: str
+    refund_amount: Decimal
+    return_status: str = "pending"
+    items: list[ReturnLine] = field(default_factory=list)
+
+
+async def create_return(
+    db_session: AsyncSession,
+    client_id: int,
+    sale_id: int,
+    return_reason: str,
+    quantities: dict[int, int]
+) -> CreatedReturn:
+    """
+    Record the return of items of a sale, put them back in stock, and commit.
+
+    Each line is refunded its share of what was actually paid: the items'
+    price scaled by the sale total over the sum of its items, so a discount
+    on the sale is taken off the refund too. All the refunds of a sale
+    together never exceed its total.
+
+    Args:
+        db_session (AsyncSession): Database session
+        client_id (int): The buyer
+        sale_id (int): The sale the items were bought in
+        return_reason (str): Why the items are returned
+        quantities (dict[int, int]): Quantity returned per sale item id
+
+    Returns:
+        CreatedReturn: The return and its lines
+
+    Raises:
+        ResourceNotFoundError: If the sale does not exist or belongs to another client
+        BusinessLogicError: If an item is not part of the sale, or more than
+            what is left of it is returned
+    """
+    result = await db_session.execute(LOCK_SALE, {"sale_id": sale_id, "client_id": client_id})
+    sale = result.one_or_none()
+    if sale is None:
+        raise serviceExceptions.ResourceNotFoundError(f"Sale {sale_id} not found")
+    total_amount, refunded = Decimal(sale[0]), Decimal(sale[1])
+
+    result = await db_session.execute(SALE_ITEMS, {"sale_id": sale_id})
+    sold = {row[0]: row for row in result.all()}
+    subtotal = sum((Decimal(row[4]) for row in sold.values()), Decimal(0))
+    lines = []
+    for sale_item_id, quantity in sorted(quantities.items()):
+        if sale_item_id not in sold:
+            raise serviceExceptions.BusinessLogicError(f"Item {sale_item_id} is not part of sale {sale_id}")
+        _, product_id, sold_quantity, unit_price, total_price, returned = sold[sale_item_id]
+        if quantity > sold_quantity - returned:
+            raise serviceExceptions.BusinessLogicError(
+                f"Item {sale_item_id}: {quantity} returned, {sold_quantity - returned} left to return"
+            )
+        paid = Decimal(total_price) * quantity / sold_quantity
+        if subtotal:
+            paid = paid * total_amount / subtotal
+        lines.append(ReturnLine(sale_item_id, product_id, quantity, Decimal(unit_price), paid.quantize(CENT)))
+
+    refund_amount = sum((line.total_price for line in lines), Decimal(0))
+    excess = refund_amount - max(total_amount - refunded, Decimal(0))
+    if excess > 0:
+        # Rounding (or earlier refunds) would pay back more than the sale
+        # total: take the difference off the last lines
+        refund_amount -= excess
+        for line in reversed(lines):
+            taken = min(excess, line.total_price)
+            line.total_price -= taken
+            excess -= taken
+            if not excess:
+                break
+    result = await db_session.execute(insert(Return).values(
+        sale_id=sale_id,
+        client_id=client_id,
+        return_reason=return_reason,
+        refund_amount=refund_amount,
+    ))
+    created = CreatedReturn(
+        id=result.inserted_primary_key[0],
+        sale_id=sale_id,
+        client_id=client_id,
+        return_reason=return_reason,
+        refund_amount=refund_amount,
+        items=lines,
+    )
+
+    await apply_movements(db_session, return_movements(created.id, [(line.product_id, line.quantity) for line in lines]))
+    await db_session.execute(insert(ReturnItem).values([
+        {
+            "return_id": created.id,
+            "sale_item_id": line.sale_item_id,
+            "quantity": line.quantity,
+            "unit_price": line.unit_price,
+            "total_price": line.total_price,
+        }
+        for line in lines
+    ]))
+    await db_session.commit()
+    return created
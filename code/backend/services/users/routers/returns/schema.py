@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+from decimal import Decimal
+
+class ReturnItemRequest(BaseModel):
+    sale_item_id: int
+    quantity: int = Field(..., gt=0)
+
+class ReturnRequest(BaseModel):
+    sale_id: int
+    return_reason: str = Field(..., min_length=1, max_length=255)
+    items: list[ReturnItemRequest] = Field(..., min_length=1)
+
+class ReturnItemRead(BaseModel):
+    sale_item_id: int
+    product_id: int
+    quantity: int
+    unit_price: Decimal
+    total_price: Decimal
+
+class ReturnRead(BaseModel):
+    id: int
+    sale_id: int
+    client_id: int
+    return_reason: str
+    return_status: str
+    refund_amount: Decimal
+    items: list[ReturnItemRead]
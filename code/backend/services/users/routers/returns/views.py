@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .schema import ReturnRead, ReturnRequest
+from .returns import create_return
+from myExceptions import service as serviceExceptions
+from myOrm.database import get_db_session
+from myDependencies import Principal, validate_is_authenticated
+
+router = APIRouter(
+    prefix="/api/v1/users/returns",
+    tags=["returns"],
+)
+
+@router.post("/", response_model=ReturnRead, status_code=status.HTTP_201_CREATED)
+async def request_return(
+    return_in: ReturnRequest,
+    db: AsyncSession = Depends(get_db_session),
+    client: Principal = Depends(validate_is_authenticated),
+):
+    """
+    Return items of one of the client's sales.
+
+    The return, its items and the restock of the products are written in
+    one transaction (see returns.create_return).
+    """
+    quantities: dict[int, int] = {}
+    for item in return_in.items:
+        quantities[item.sale_item_id] = quantities.get(item.sale_item_id, 0) + item.quantity
+
+    try:
+        return await create_return(db, client.id, return_in.sale_id, return_in.return_reason, quantities)
+    except serviceExceptions.ResourceNotFoundError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except serviceExceptions.BusinessLogicError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -0,0 +1,166 @@
+import pytest
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.exc import OperationalError
+from myExceptions import service as serviceExceptions
+from myOrm.ledger import sale_movements
+from myOrm.models import Address as AddressModel, Discount
+from routers.checkout.sales import discount_amount
+from tests.helpers import TEST_CLIENT_ID, DummyResult
+
+
+PAYLOAD = {"shipping_address_id": 3, "payment_method": "card"}
+DEADLOCK = OperationalError("SELECT", {}, Exception(1213, "Deadlock found when trying to get lock"))
+
+
+def rows(*values):
+    result = MagicMock()
+    result.all.return_value = list(values)
+    return result
+
+
+def deleted(rowcount):
+    result = MagicMock()
+    result.rowcount = rowcount
+    return result
+
+
+def inserted(primary_key):
+    result = MagicMock()
+    result.inserted_primary_key = [primary_key]
+    return result
+
+
+@pytest.fixture
+def address():
+    return AddressModel(id=3, client_id=TEST_CLIENT_ID)
+
+
+@pytest.fixture
+def mock_apply_movements():
+    with patch("routers.checkout.sales.apply_movements", new_callable=AsyncMock) as apply_movements:
+        yield apply_movements
+
+
+def test_checkout_success(test_client, mock_db_session, address, mock_apply_movements):
+    # Cart rows of the same product are merged into one line
+    mock_db_session.execute.side_effect = [
+        DummyResult(address),
+        rows((10, 1, 2, Decimal("9.99")), (11, 1, 1, Decimal("9.99")), (12, 4, 1, Decimal("25.00"))),
+        inserted(42),
+        MagicMock(),
+        deleted(3),
+    ]
+    statements_before_ledger = []
+    mock_apply_movements.side_effect = lambda *args: statements_before_ledger.append(mock_db_session.execute.await_count)
+
+    response = test_client.post("/api/v1/users/checkout/", json=PAYLOAD)
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["id"] == 42
+    assert Decimal(body["total_amount"]) == Decimal("54.97")
+    assert [(item["product_id"], item["quantity"]) for item in body["items"]] == [(1, 3), (4, 1)]
+    mock_apply_movements.assert_awaited_once_with(mock_db_session, sale_movements(42, [(1, 3), (4, 1)]))
+    # The stock is locked right after the sale row, before the sale items' foreign key checks
+    assert statements_before_ledger == [3]
+    # address, cart, sale, sale items, cart removal: the statement count does not grow with the cart
+    assert mock_db_session.execute.await_count == 5
+    mock_db_session.commit.assert_awaited_once()
+
+
+def test_checkout_with_discount(test_client, mock_db_session, address, mock_apply_movements):
+    discount = Discount(code="TEN", discount_type="percentage", discount_value=Decimal("10"), max_discount_amount=Decimal("3"))
+    mock_db_session.execute.side_effect = [
+        DummyResult(address),
+        rows((10, 1, 4, Decimal("10.00"))),
+        DummyResult(discount),
+        inserted(43),
+        MagicMock(),
+        deleted(1),
+    ]
+
+    response = test_client.post("/api/v1/users/checkout/", json={**PAYLOAD, "discount_code": "TEN"})
+
+    assert response.status_code == 201
+    body = response.json()
+    assert Decimal(body["subtotal"]) == Decimal("40.00")
+    assert Decimal(body["discount_amount"]) == Decimal("3")
+    assert Decimal(body["total_amount"]) == Decimal("37.00")
+
+
+def test_checkout_address_not_found(test_client, mock_db_session):
+    mock_db_session.execute.return_value = DummyResult(None)
+
+    response = test_client.post("/api/v1/users/checkout/", json=PAYLOAD)
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Address not found"
+
+
+def test_checkout_empty_cart(test_client, mock_db_session, address):
+    mock_db_session.execute.side_effect = [DummyResult(address), rows()]
+
+    response = test_client.post("/api/v1/users/checkout/", json=PAYLOAD)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cart is empty"
+    mock_db_session.commit.assert_not_awaited()
+
+
+def test_checkout_insufficient_stock(test_client, mock_db_session, address, mock_apply_movements):
+    mock_db_session.execute.side_effect = [DummyResult(address), rows((10, 1, 5, Decimal("9.99"))), inserted(44), MagicMock()]
+    mock_apply_movements.side_effect = serviceExceptions.InsufficientStockError("Insufficient stock for products: [1]")
+
+    response = test_client.post("/api/v1/users/checkout/", json=PAYLOAD)
+
+    assert response.status_code == 409
+    mock_db_session.rollback.assert_awaited()
+    mock_db_session.commit.assert_not_awaited()
+
+
+def test_checkout_cart_checked_out_concurrently(test_client, mock_db_session, address, mock_apply_movements):
+    # Another checkout of the same cart removed its lines first
+    mock_db_session.execute.side_effect = [DummyResult(address), rows((10, 1, 1, Decimal("9.99"))), inserted(45), MagicMock(), deleted(0)]
+
+    response = test_client.post("/api/v1/users/checkout/", json=PAYLOAD)
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Cart changed during checkout"
+    mock_db_session.commit.assert_not_awaited()
+
+
+def test_checkout_retries_deadlocks(test_client, mock_db_session, address, mock_apply_movements):
+    mock_db_session.execute.side_effect = [
+        DummyResult(address),
+        rows((10, 1, 1, Decimal("9.99"))), inserted(46),
+        rows((10, 1, 1, Decimal("9.99"))), inserted(47), MagicMock(), deleted(1),
+    ]
+    mock_apply_movements.side_effect = [DEADLOCK, None]
+
+    response = test_client.post("/api/v1/users/checkout/", json=PAYLOAD)
+
+    assert response.status_code == 201
+    assert response.json()["id"] == 47
+    mock_db_session.rollback.assert_awaited_once()
+    mock_db_session.commit.assert_awaited_once()
+
+
+def test_checkout_gives_up_after_repeated_deadlocks(test_client, mock_db_session, address, mock_apply_movements):
+    mock_db_session.execute.side_effect = [DummyResult(address)] + [rows((10, 1, 1, Decimal("9.99"))), inserted(48)] * 3
+    mock_apply_movements.side_effect = DEADLOCK
+
+    response = test_client.post("/api/v1/users/checkout/", json=PAYLOAD)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert mock_apply_movements.await_count == 3
+    mock_db_session.commit.assert_not_awaited()
+
+
+def test_discount_minimum_purchase():
+    discount = Discount(discount_type="fixed_amount", discount_value=Decimal("5"), min_purchase_amount=Decimal("50"))
+
+    with pytest.raises(serviceExceptions.BusinessLogicError):
+        discount_amount(discount, Decimal("49.99"))
+    assert discount_amount(discount, Decimal("50")) == Decimal("5.00")
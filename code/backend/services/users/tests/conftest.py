@@ -4,13 +4,21 @@ from main import app
 import os
 from unittest.mock import patch, AsyncMock, MagicMock
 from myOrm import get_db_session
-from myDependencies.auth import validate_is_admin, validate_is_authenticated
+from myDependencies.auth import validate_is_admin, validate_is_authenticated, get_current_client
 from tests.helpers import TEST_CLIENT_ID, TEST_EMAIL, TEST_FIRST_NAME, TEST_LAST_NAME, TEST_PASSWORD
 from myOrm.models import Client as ClientModel
 from myEncryption import Encryption
 from datetime import datetime
+from myAws import secret_store
 
 
+@pytest.fixture(scope="session", autouse=True)
+def inject_secrets():
+    """Provide the secrets resolved at startup, so that no test touches AWS"""
+    secret_store.inject({"JWT_SECRET_KEY": "test_secret_key"})
+    yield
+    secret_store.clear()
+
 @pytest.fixture(scope="session")
 def test_client():
     with TestClient(app) as client:
@@ -87,6 +95,7 @@ def override_dependencies(mock_db_session, mock_admin_user):
         get_db_session: override_get_db_session,
         validate_is_admin: override_validate_is_admin,
         validate_is_authenticated: override_validate_is_authenticated,
+        get_current_client: override_validate_is_authenticated,
     }
     yield
     app.dependency_overrides = {}
@@ -0,0 +1,125 @@
+import pytest
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+from myOrm.ledger import return_movements
+from tests.helpers import DummyResult
+
+
+PAYLOAD = {"sale_id": 42, "return_reason": "Wrong size", "items": [{"sale_item_id": 7, "quantity": 1}]}
+
+
+def sale(total_amount, refunded="0"):
+    return DummyResult((Decimal(total_amount), Decimal(refunded)))
+
+
+def rows(*values):
+    result = MagicMock()
+    result.all.return_value = list(values)
+    return result
+
+
+def inserted(primary_key):
+    result = MagicMock()
+    result.inserted_primary_key = [primary_key]
+    return result
+
+
+@pytest.fixture
+def mock_apply_movements():
+    with patch("routers.returns.returns.apply_movements", new_callable=AsyncMock) as apply_movements:
+        yield apply_movements
+
+
+def test_return_restocks_items(test_client, mock_db_session, mock_apply_movements):
+    mock_db_session.execute.side_effect = [
+        sale("54.97"),
+        # sale item, product, sold, unit price, total price, already returned
+        rows((7, 1, 3, Decimal("9.99"), Decimal("29.97"), 1), (8, 4, 1, Decimal("25.00"), Decimal("25.00"), 0)),
+        inserted(5),
+        MagicMock(),
+    ]
+    payload = {**PAYLOAD, "items": [{"sale_item_id": 7, "quantity": 1}, {"sale_item_id": 8, "quantity": 1}, {"sale_item_id": 7, "quantity": 1}]}
+
+    response = test_client.post("/api/v1/users/returns/", json=payload)
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["id"] == 5
+    assert Decimal(body["refund_amount"]) == Decimal("44.98")
+    assert [(item["sale_item_id"], item["quantity"]) for item in body["items"]] == [(7, 2), (8, 1)]
+    mock_apply_movements.assert_awaited_once_with(mock_db_session, return_movements(5, [(1, 2), (4, 1)]))
+    mock_db_session.commit.assert_awaited_once()
+
+
+def test_return_of_unknown_sale(test_client, mock_db_session, mock_apply_movements):
+    mock_db_session.execute.side_effect = [DummyResult(None)]
+
+    response = test_client.post("/api/v1/users/returns/", json=PAYLOAD)
+
+    assert response.status_code == 404
+    mock_apply_movements.assert_not_awaited()
+
+
+def test_return_more_than_left(test_client, mock_db_session, mock_apply_movements):
+    mock_db_session.execute.side_effect = [sale("19.98"), rows((7, 1, 2, Decimal("9.99"), Decimal("19.98"), 2))]
+
+    response = test_client.post("/api/v1/users/returns/", json=PAYLOAD)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Item 7: 1 returned, 0 left to return"
+    mock_apply_movements.assert_not_awaited()
+    mock_db_session.commit.assert_not_awaited()
+
+
+def test_return_of_item_from_another_sale(test_client, mock_db_session, mock_apply_movements):
+    mock_db_session.execute.side_effect = [sale("25.00"), rows((8, 4, 1, Decimal("25.00"), Decimal("25.00"), 0))]
+
+    response = test_client.post("/api/v1/users/returns/", json=PAYLOAD)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Item 7 is not part of sale 42"
+
+
+def test_refund_of_discounted_sale_is_pro_rated(test_client, mock_db_session, mock_apply_movements):
+    mock_db_session.execute.side_effect = [
+        # 10% off a 50.00 subtotal
+        sale("45.00"),
+        rows((7, 1, 2, Decimal("10.00"), Decimal("20.00"), 0), (8, 4, 1, Decimal("30.00"), Decimal("30.00"), 0)),
+        inserted(5),
+        MagicMock(),
+    ]
+
+    response = test_client.post("/api/v1/users/returns/", json=PAYLOAD)
+
+    assert response.status_code == 201
+    body = response.json()
+    assert Decimal(body["refund_amount"]) == Decimal("9.00")
+    assert Decimal(body["items"][0]["total_price"]) == Decimal("9.00")
+
+
+def test_refunds_never_exceed_the_sale_total(test_client, mock_db_session, mock_apply_movements):
+    mock_db_session.execute.side_effect = [
+        # 33.33 of the 3 x 11.11 sale already refunded for the first item
+        sale("33.33", refunded="11.11"),
+        rows((7, 1, 3, Decimal("11.11"), Decimal("33.33"), 1)),
+        inserted(5),
+        MagicMock(),
+    ]
+    payload = {**PAYLOAD, "items": [{"sale_item_id": 7, "quantity": 2}]}
+
+    response = test_client.post("/api/v1/users/returns/", json=payload)
+
+    assert response.status_code == 201
+    assert Decimal(response.json()["refund_amount"]) == Decimal("22.22")
+
+    mock_db_session.execute.side_effect = [
+        sale("33.33", refunded="30.00"),
+        rows((7, 1, 3, Decimal("11.11"), Decimal("33.33"), 1)),
+        inserted(6),
+        MagicMock(),
+    ]
+
+    response = test_client.post("/api/v1/users/returns/", json=payload)
+
+    assert Decimal(response.json()["refund_amount"]) == Decimal("3.33")
+    assert Decimal(response.json()["items"][0]["total_price"]) == Decimal("3.33")
@@ -57,6 +57,7 @@ CREATE TABLE clients (
     last_name VARCHAR(100) NOT NULL,
     date_joined TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     is_afiliado BOOLEAN NOT NULL DEFAULT FALSE,
+    token_version INTEGER NOT NULL DEFAULT 0,
     INDEX idx_email (email)
 );
 
@@ -175,63 +176,8 @@ CREATE TABLE reviews (
     INDEX idx_client_reviews (client_id)
 );
 
-DELIMITER //
-
-CREATE TRIGGER after_inventory_change
-AFTER INSERT ON inventory_history
-FOR EACH ROW
-BEGIN
-    UPDATE products 
-    SET current_quantity = NEW.new_quantity
-    WHERE id = NEW.product_id;
-END//
-
-CREATE TRIGGER after_sale_item_insert
-AFTER INSERT ON sale_items
-FOR EACH ROW
-BEGIN
-    INSERT INTO inventory_history (
-        product_id,
-        previous_quantity,
-        quantity_change,
-        new_quantity,
-        movement_type,
-        sale_id
-    )
-    SELECT 
-        NEW.product_id,
-        p.current_quantity,
-        -NEW.quantity,
-        p.current_quantity - NEW.quantity,
-        'sale',
-        CONCAT('SALE-', NEW.sale_id)
-    FROM products p
-    WHERE p.id = NEW.product_id;
-END//
-
--- Trigger to handle returns
-CREATE TRIGGER after_return_item_insert
-AFTER INSERT ON return_items
-FOR EACH ROW
-BEGIN
-    INSERT INTO inventory_history (
-        product_id,
-        previous_quantity,
-        quantity_change,
-        new_quantity,
-        movement_type,
-        reference_number
-    )
-    SELECT 
-        si.product_id,
-        p.current_quantity,
-        NEW.quantity,
-        p.current_quantity + NEW.quantity,
-        'return',
-        CONCAT('RETURN-', NEW.return_id)
-    FROM sale_items si
-    JOIN products p ON si.product_id = p.id
-    WHERE si.id = NEW.sale_item_id;
-END//
-
-DELIMITER ;
+-- Stock is maintained by the application (myOrm.ledger): each batch of
+-- movements locks its products in id order, inserts its inventory_history
+-- rows and updates products.current_quantity in one transaction. There are
+-- deliberately no triggers on sale_items, return_items or inventory_history.
+-- Databases created with the former triggers: migrations/002_drop_inventory_triggers.sql.
@@ -0,0 +1,7 @@
+-- Brings databases created before token revocation up to db.sql.
+-- Access tokens carry the client's token version ("ver" claim); bumping
+-- the column revokes every token issued before (myDependencies.revoke_tokens).
+-- Run once: MySQL has no ADD COLUMN IF NOT EXISTS.
+USE client_db;
+ALTER TABLE clients
+    ADD COLUMN token_version INTEGER NOT NULL DEFAULT 0 AFTER is_afiliado;
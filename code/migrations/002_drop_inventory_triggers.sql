@@ -0,0 +1,8 @@
+-- Brings databases created before the inventory ledger up to db.sql.
+-- Stock is now maintained by the application (myOrm.ledger), which writes
+-- inventory_history and products.current_quantity itself: with these
+-- triggers still in place every sale and return would be applied twice.
+USE client_db;
+DROP TRIGGER IF EXISTS after_inventory_change;
+DROP TRIGGER IF EXISTS after_sale_item_insert;
+DROP TRIGGER IF EXISTS after_return_item_insert;